@@ -0,0 +1,375 @@
+"""
+FCS client benchmark suite
+
+Drives FCSClient against the local mock server (fcs_mock_server.py) and
+reports:
+
+- throughput: max sustained frames/sec through on_message, per decoder
+              and transport
+- loopback:   frames/sec through the full client stack over the in-memory
+              transport (no network, no server)
+- latency:    end-to-end latency percentiles (server send -> on_message)
+- memory:     bytes per subscription, with and without tick history
+- recovery:   reconnect recovery time (close -> welcome -> first tick per key)
+
+The mock server runs in a separate process for throughput and latency runs,
+so it does not compete with the client for the GIL.
+
+Run:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --json results.json
+    python benchmarks/run_benchmarks.py --compare results.json --tolerance 0.2
+
+With --compare, the exit status is 1 if any result is worse than the
+baseline by more than the tolerance.
+
+Install:
+    pip install websocket-client websockets
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fcs_client_lib import FCSClient  # noqa: E402
+from fcs_mock_server import MockFCSServer  # noqa: E402
+from fcs_transport import LoopbackServer  # noqa: E402
+
+# Direction of "better" for --compare
+HIGHER_IS_BETTER = ('frames_per_sec',)
+
+
+# ============================================
+# Helpers
+# ============================================
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class ServerProcess:
+    """Mock server in a subprocess."""
+
+    def __init__(self, rate, symbols=None):
+        self.port = free_port()
+        args = [
+            sys.executable,
+            os.path.join(ROOT, 'fcs_mock_server.py'),
+            '--port',
+            str(self.port),
+            '--rate',
+            str(rate),
+        ]
+        if symbols:
+            args += ['--symbols', str(symbols)]
+        self.process = subprocess.Popen(args, stdout=subprocess.DEVNULL)
+        self.url = f'ws://127.0.0.1:{self.port}'
+        self._wait_listening()
+
+    def _wait_listening(self, timeout=10):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            try:
+                with socket.create_connection(('127.0.0.1', self.port), timeout=0.2):
+                    return
+            except OSError:
+                time.sleep(0.05)
+        self.stop()
+        raise RuntimeError('Mock server did not start')
+
+    def stop(self):
+        self.process.terminate()
+        self.process.wait(5)
+
+
+def start_client(url, on_message=None, decoder='auto', typed=False, transport=None):
+    client = FCSClient('bench', url, transport)
+    client.set_decoder(decoder, typed)
+    client.reconnect_limit = None
+    if on_message:
+        client.on_message(on_message)
+    client.connect()
+    client.run_forever(blocking=False)
+    deadline = time.time() + 10
+    while not client.is_connected and time.time() < deadline:
+        time.sleep(0.01)
+    if not client.is_connected:
+        raise RuntimeError('Client did not connect to mock server')
+    return client
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+# ============================================
+# Benchmarks
+# ============================================
+
+
+def bench_throughput(seconds, symbols, decoder, typed, transport=None):
+    """Max sustained frames/sec with an on_message that only counts."""
+    server = ServerProcess(rate=0, symbols=symbols)
+    count = [0]
+
+    def on_message(data):
+        count[0] += 1
+
+    client = start_client(server.url, on_message, decoder, typed, transport)
+    try:
+        time.sleep(1)  # warm-up
+        start_count, started = count[0], time.perf_counter()
+        time.sleep(seconds)
+        frames = count[0] - start_count
+        elapsed = time.perf_counter() - started
+    finally:
+        client.disconnect()
+        server.stop()
+    return {'frames_per_sec': frames / elapsed, 'backend': client.decoder.backend}
+
+
+def bench_loopback(frames, decoder, typed):
+    """Frames/sec through decode, listeners and on_message over the loopback transport."""
+    server = LoopbackServer()
+    count = [0]
+
+    def on_message(data):
+        count[0] += 1
+
+    client = start_client('loopback://bench', on_message, decoder, typed, server.transport)
+    try:
+        client.join('BENCH:LOOP', '1')
+        frame = json.dumps(
+            {
+                'type': 'price',
+                'symbol': 'BENCH:LOOP',
+                'timeframe': '1',
+                'prices': {'mode': 'askbid', 't': 1700000000, 'a': 1.10012, 'b': 1.10008},
+            }
+        )
+        deadline = time.time() + 5
+        while not server.connections[0].subscriptions and time.time() < deadline:
+            time.sleep(0.01)
+        deliver = server.connections[0].deliver
+        start_count, started = count[0], time.perf_counter()
+        for _ in range(frames):
+            deliver(frame)
+        while count[0] - start_count < frames and time.perf_counter() - started < 60:
+            time.sleep(0.001)
+        elapsed = time.perf_counter() - started
+    finally:
+        client.disconnect()
+    return {
+        'frames_per_sec': (count[0] - start_count) / elapsed,
+        'backend': client.decoder.backend,
+    }
+
+
+def bench_latency(seconds, symbols, rate):
+    """End-to-end latency from the server's prices.t to on_message."""
+    server = ServerProcess(rate=rate, symbols=symbols)
+    samples = []
+    recording = [False]
+
+    def on_message(data):
+        if recording[0] and data.get('type') == 'price':
+            samples.append(time.time() - data['prices']['t'])
+
+    client = start_client(server.url, on_message)
+    try:
+        time.sleep(1)
+        recording[0] = True
+        time.sleep(seconds)
+        recording[0] = False
+    finally:
+        client.disconnect()
+        server.stop()
+
+    samples.sort()
+    return {
+        'samples': len(samples),
+        'p50_ms': percentile(samples, 0.50) * 1000 if samples else None,
+        'p90_ms': percentile(samples, 0.90) * 1000 if samples else None,
+        'p99_ms': percentile(samples, 0.99) * 1000 if samples else None,
+        'max_ms': samples[-1] * 1000 if samples else None,
+    }
+
+
+def bench_memory(subscriptions, history):
+    """Client-side bytes per subscription after join + first ticks."""
+    server = MockFCSServer(rate=subscriptions).start()
+    client = start_client(server.url)
+    if history:
+        client.enable_history(capacity=256, max_keys=subscriptions)
+    try:
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        for i in range(subscriptions):
+            client.join(f'MOCK:MEM{i:05d}', '1')
+        client.subscriptions.wait(timeout=30)
+        time.sleep(1.5)  # let every key receive ticks
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+    finally:
+        client.disconnect()
+        server.stop()
+
+    grown = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return {'bytes_per_subscription': grown / subscriptions}
+
+
+def bench_recovery(subscriptions, rounds):
+    """Close -> welcome -> first tick on every key, after a server-side drop."""
+    server = MockFCSServer(rate=subscriptions * 20).start()
+    client = start_client(server.url)
+    results = []
+    try:
+        for i in range(subscriptions):
+            client.join(f'MOCK:REC{i:04d}', '1')
+        client.subscriptions.wait(timeout=30)
+        time.sleep(0.5)
+
+        for _ in range(rounds):
+            client.last_recovery = None
+            server.drop_connections()
+            deadline = time.time() + 30
+            while time.time() < deadline:
+                recovery = client.last_recovery
+                if recovery and recovery['time_to_all_ticks'] is not None:
+                    results.append(recovery)
+                    break
+                time.sleep(0.01)
+            time.sleep(0.5)
+    finally:
+        client.disconnect()
+        server.stop()
+
+    if not results:
+        return {'rounds': 0, 'time_to_welcome_ms': None, 'time_to_all_ticks_ms': None}
+    return {
+        'rounds': len(results),
+        'time_to_welcome_ms': sum(r['time_to_welcome'] for r in results) / len(results) * 1000,
+        'time_to_all_ticks_ms': sum(r['time_to_all_ticks'] for r in results) / len(results) * 1000,
+    }
+
+
+# ============================================
+# Runner
+# ============================================
+
+
+def run(args):
+    results = {}
+
+    decoders = [('json', False), ('auto', False), ('auto', True)]
+    for decoder, typed in decoders:
+        name = f'throughput[{decoder}{"+typed" if typed else ""}]'
+        print(f'Running {name}...', flush=True)
+        results[name] = bench_throughput(args.seconds, args.symbols, decoder, typed)
+
+    print('Running throughput[auto+typed+websockets]...', flush=True)
+    results['throughput[auto+typed+websockets]'] = bench_throughput(
+        args.seconds, args.symbols, 'auto', True, 'websockets'
+    )
+
+    for decoder, typed in decoders:
+        name = f'loopback[{decoder}{"+typed" if typed else ""}]'
+        print(f'Running {name}...', flush=True)
+        results[name] = bench_loopback(args.loopback_frames, decoder, typed)
+
+    print('Running latency...', flush=True)
+    results['latency'] = bench_latency(args.seconds, args.symbols, args.rate)
+
+    for history in (False, True):
+        name = f'memory[{"history" if history else "base"}]'
+        print(f'Running {name}...', flush=True)
+        results[name] = bench_memory(args.subscriptions, history)
+
+    print('Running recovery...', flush=True)
+    results['recovery'] = bench_recovery(min(args.subscriptions, 200), args.rounds)
+    return results
+
+
+def print_results(results):
+    print()
+    print(f'{"benchmark":<34} {"metric":<24} {"value":>14}')
+    print('-' * 74)
+    for name, values in results.items():
+        for metric, value in values.items():
+            text = f'{value:,.2f}' if isinstance(value, float) else str(value)
+            print(f'{name:<34} {metric:<24} {text:>14}')
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of regressions worse than tolerance (fraction)."""
+    regressions = []
+    for name, values in results.items():
+        for metric, value in values.items():
+            base = baseline.get(name, {}).get(metric)
+            if (
+                not isinstance(value, (int, float))
+                or not isinstance(base, (int, float))
+                or not base
+            ):
+                continue
+            if metric in ('samples', 'rounds'):
+                continue
+            change = (value - base) / base
+            worse = change < -tolerance if metric in HIGHER_IS_BETTER else change > tolerance
+            if worse:
+                regressions.append(f'{name} {metric}: {base:,.2f} -> {value:,.2f} ({change:+.0%})')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='FCS client benchmarks')
+    parser.add_argument('--seconds', type=float, default=5, help='measurement window per run')
+    parser.add_argument('--symbols', type=int, default=100, help='symbols for throughput/latency')
+    parser.add_argument('--rate', type=float, default=2000, help='frames/sec for the latency run')
+    parser.add_argument('--subscriptions', type=int, default=1000, help='keys for the memory run')
+    parser.add_argument('--rounds', type=int, default=3, help='reconnects for the recovery run')
+    parser.add_argument(
+        '--loopback-frames', type=int, default=200000, help='frames for the loopback run'
+    )
+    parser.add_argument('--json', help='write results to this file')
+    parser.add_argument('--compare', help='baseline JSON file to compare against')
+    parser.add_argument(
+        '--tolerance', type=float, default=0.2, help='allowed regression (0.2 = 20%%)'
+    )
+    args = parser.parse_args()
+
+    results = run(args)
+    print_results(results)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print('\nRegressions:')
+            for line in regressions:
+                print(f'  {line}')
+            sys.exit(1)
+        print('\nNo regressions against baseline.')
+
+
+if __name__ == '__main__':
+    main()
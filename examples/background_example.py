@@ -19,23 +19,17 @@ from fcs_client_lib import FCSClient
 # Create client with demo API key
 client = FCSClient('fcs_socket_demo')
 
-# Store latest prices
-latest_prices = {}
+# Keep the latest quote per symbol (safe to read from the main thread)
+client.enable_quotes()
+
+SYMBOLS = ['BINANCE:BTCUSDT', 'BINANCE:ETHUSDT']
 
 
 @client.on_connected
 def on_connected():
     print('[WebSocket] Connected!')
-    client.join('BINANCE:BTCUSDT', '1D')
-    client.join('BINANCE:ETHUSDT', '1D')
-
-
-@client.on_message
-def on_message(data):
-    if data.get('type') == 'price':
-        symbol = data.get('symbol')
-        price = data['prices'].get('c')
-        latest_prices[symbol] = price
+    for symbol in SYMBOLS:
+        client.join(symbol, '1D')
 
 
 if __name__ == '__main__':
@@ -49,12 +43,16 @@ if __name__ == '__main__':
     print('[Main] WebSocket running in background thread')
     print('[Main] Main thread continues to run...\n')
 
-    # Wait for connection
-    time.sleep(3)
+    # Wait for the first price
+    client.wait_for_update(SYMBOLS[0], timeout=10)
 
     # Main loop - do your work here while prices update in background
     try:
         for i in range(20):
+            latest_prices = {}
+            for symbol in SYMBOLS:
+                quote = client.latest(symbol)
+                latest_prices[symbol] = quote.c if quote else None
             print(f'[Main] Tick {i + 1}/20 - Latest prices: {latest_prices}')
             time.sleep(3)
 
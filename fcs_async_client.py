@@ -0,0 +1,569 @@
+"""
+FCS WebSocket Client Library for asyncio applications
+
+Native asyncio client with the same join/leave/remove_all/reconnect/heartbeat
+behaviour as FCSClient. One event loop can drive many connections without
+extra threads.
+
+Usage:
+    import asyncio
+    from fcs_async_client import AsyncFCSClient
+
+    async def main():
+        client = AsyncFCSClient('YOUR_API_KEY')
+        await client.connect()
+        await client.join('BINANCE:BTCUSDT', '1D')
+
+        async for data in client.stream():
+            print(data)
+
+    asyncio.run(main())
+
+Install:
+    pip install websockets
+"""
+
+import asyncio
+import ssl
+import time
+
+try:
+    import websockets
+except ImportError:
+    raise ImportError("Please install websockets: pip install websockets")
+
+from fcs_decoder import Decoder
+from fcs_scheduler import backoff_delay
+from fcs_wire import (
+    REMOVE_ALL,
+    WireCounter,
+    encode,
+    encode_join,
+    encode_leave,
+    encode_ping,
+    encode_pong,
+)
+
+# Sentinel pushed into stream queues when the client stops for good
+_STREAM_END = object()
+
+
+class AsyncFCSClient:
+    """
+    FCS WebSocket client for asyncio applications.
+
+    Mirrors FCSClient, but every network method is a coroutine and all work
+    (receive, heartbeat, reconnect, callbacks) runs on the calling event loop.
+    Callbacks may be plain functions or coroutine functions.
+    """
+
+    def __init__(self, api_key, url=None, compression=None):
+        """
+        Initialize async FCS WebSocket client.
+
+        Args:
+            api_key (str): Your FCS API key (use 'fcs_socket_demo' for testing)
+            url (str, optional): WebSocket server URL
+            compression (str, optional): 'deflate' to negotiate permessage-deflate
+                (used only if the server accepts it)
+        """
+        self.url = url or 'wss://ws-v4.fcsapi.com/ws'
+        self.api_key = api_key
+        self.socket = None
+        self.active_subscriptions = {}
+        self.reconnect_delay = 3  # seconds
+        self.heartbeat_interval = 25  # seconds
+        self.manual_close = False
+        self.is_connected = False
+        self.show_logs = False
+        self.decoder = Decoder()
+        self.compression = compression
+        self.wire = WireCounter()  # On-wire vs decoded byte counters
+
+        # Event callbacks
+        self._onconnected = None
+        self._onclose = None
+        self._onmessage = None
+        self._onerror = None
+        self._onreconnect = None
+        self.count_reconnects = 0
+        self.reconnect_limit = 5  # None retries forever
+        self.is_reconnect = False
+
+        # Reconnect backoff, same policy as FCSClient: first retry after
+        # reconnect_first_delay, then reconnect_delay * 2^n capped at
+        # reconnect_max_delay, minus up to reconnect_jitter of the delay at random
+        self.reconnect_first_delay = 0
+        self.reconnect_max_delay = 60
+        self.reconnect_jitter = 0.5
+
+        # Background tasks and stream consumers
+        self._run_task = None
+        self._heartbeat_task = None
+        self._streams = []
+        self._connected_event = None
+
+    # ============================================
+    # Event callback decorators
+    # ============================================
+
+    @property
+    def onconnected(self):
+        return self._onconnected
+
+    @onconnected.setter
+    def onconnected(self, func):
+        self._onconnected = func
+
+    def on_connected(self, func):
+        """Decorator for connection callback."""
+        self._onconnected = func
+        return func
+
+    @property
+    def onmessage(self):
+        return self._onmessage
+
+    @onmessage.setter
+    def onmessage(self, func):
+        self._onmessage = func
+
+    def on_message(self, func):
+        """Decorator for message callback."""
+        self._onmessage = func
+        return func
+
+    @property
+    def onclose(self):
+        return self._onclose
+
+    @onclose.setter
+    def onclose(self, func):
+        self._onclose = func
+
+    def on_close(self, func):
+        """Decorator for close callback."""
+        self._onclose = func
+        return func
+
+    @property
+    def onerror(self):
+        return self._onerror
+
+    @onerror.setter
+    def onerror(self, func):
+        self._onerror = func
+
+    def on_error(self, func):
+        """Decorator for error callback."""
+        self._onerror = func
+        return func
+
+    @property
+    def onreconnect(self):
+        return self._onreconnect
+
+    @onreconnect.setter
+    def onreconnect(self, func):
+        self._onreconnect = func
+
+    def on_reconnect(self, func):
+        """Decorator for reconnect callback."""
+        self._onreconnect = func
+        return func
+
+    # ============================================
+    # Connection methods
+    # ============================================
+
+    async def connect(self, wait=True, timeout=None):
+        """
+        Connect to FCS WebSocket server and start receiving in a background task.
+
+        Args:
+            wait (bool): If True, return only after the server's welcome message.
+            timeout (float, optional): Max seconds to wait for welcome.
+
+        Returns self for chaining.
+        """
+        if not self.api_key:
+            raise ValueError('API Key required')
+        if self._run_task and not self._run_task.done():
+            return self
+
+        self.manual_close = False
+        self._connected_event = asyncio.Event()
+        self._run_task = asyncio.ensure_future(self._run())
+
+        if wait:
+            waiter = asyncio.ensure_future(self._connected_event.wait())
+            done, _ = await asyncio.wait(
+                [waiter, self._run_task], timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if waiter not in done:
+                waiter.cancel()
+        return self
+
+    async def run_forever(self):
+        """Wait until the client stops (manual disconnect or reconnect limit reached)."""
+        if self._run_task:
+            await self._run_task
+
+    async def disconnect(self):
+        """Disconnect from WebSocket server."""
+        self.manual_close = True
+        self.is_connected = False
+        self._cancel_heartbeat()
+        if self.socket:
+            await self.socket.close()
+        if self._run_task:
+            try:
+                await self._run_task
+            except asyncio.CancelledError:
+                pass
+
+    async def stream(self, maxsize=0):
+        """
+        Async iterator over incoming messages.
+
+        Each call creates an independent consumer; iteration ends when the
+        client stops for good (disconnect(), reconnect limit, or cancelled),
+        and immediately if it has already stopped.
+
+        Args:
+            maxsize (int): Max buffered messages for this consumer (0 = unbounded).
+                When full, the oldest message is dropped.
+        """
+        if self._run_task is not None and self._run_task.done():
+            return
+        queue = asyncio.Queue(maxsize)
+        self._streams.append(queue)
+        try:
+            while True:
+                data = await queue.get()
+                if data is _STREAM_END:
+                    return
+                yield data
+        finally:
+            if queue in self._streams:
+                self._streams.remove(queue)
+
+    def set_decoder(self, backend='auto', typed=False):
+        """
+        Choose the JSON decoder for incoming frames.
+
+        Args:
+            backend (str): 'auto' (orjson, then msgspec, then json), 'orjson', 'msgspec' or 'json'
+            typed (bool): Deliver 'price' frames as PriceTick objects instead of dicts
+
+        Returns:
+            Decoder: The active decoder
+        """
+        self.decoder = Decoder(backend, typed)
+        return self.decoder
+
+    # ============================================
+    # Subscription methods
+    # ============================================
+
+    async def join(self, symbol, timeframe):
+        """
+        Subscribe to a symbol for real-time updates.
+
+        Args:
+            symbol (str): Symbol with exchange prefix (e.g., 'BINANCE:BTCUSDT', 'FX:EURUSD')
+            timeframe (str): Timeframe (e.g., '1', '5', '15', '1H', '1D')
+
+        Returns:
+            bool: True if the request was sent
+        """
+        if not symbol or not timeframe:
+            if self.show_logs:
+                print('[FCS] Symbol and timeframe are required to join')
+            return False
+
+        if ':' not in symbol:
+            if self.show_logs:
+                print('[FCS] Symbol must include exchange prefix, e.g., "BINANCE:BTCUSDT"')
+            return False
+
+        return await self._send(encode_join(symbol, timeframe))
+
+    async def leave(self, symbol, timeframe):
+        """
+        Unsubscribe from a symbol.
+
+        Args:
+            symbol (str): Symbol to unsubscribe
+            timeframe (str): Timeframe
+        """
+        if not symbol or not timeframe:
+            return False
+
+        key = f"{symbol.upper()}_{timeframe}"
+        self.active_subscriptions.pop(key, None)
+        return await self._send(encode_leave(symbol, timeframe))
+
+    async def remove_all(self):
+        """Unsubscribe from all symbols."""
+        self.active_subscriptions.clear()
+        return await self._send(REMOVE_ALL)
+
+    async def _rejoin_all(self):
+        """Rejoin all subscriptions after reconnect."""
+        for sub in list(self.active_subscriptions.values()):
+            await self._send(encode_join(sub['symbol'], sub['timeframe']))
+
+    # ============================================
+    # Internal methods
+    # ============================================
+
+    def _counting_connection(self):
+        """
+        websockets.connect() keyword that installs a connection class counting
+        bytes read from the socket into self.wire.wire_received.
+        """
+        wire = self.wire
+        try:
+            from websockets.asyncio.client import ClientConnection
+        except ImportError:
+            ClientConnection = None
+
+        if ClientConnection is not None and websockets.connect.__module__.startswith(
+            'websockets.asyncio'
+        ):
+
+            class CountingConnection(ClientConnection):
+                def data_received(self, data):
+                    wire.wire_received += len(data)
+                    super().data_received(data)
+
+            return {'create_connection': CountingConnection}
+
+        from websockets.legacy.client import WebSocketClientProtocol
+
+        class CountingProtocol(WebSocketClientProtocol):
+            def data_received(self, data):
+                wire.wire_received += len(data)
+                super().data_received(data)
+
+        return {'create_protocol': CountingProtocol}
+
+    @property
+    def negotiated_compression(self):
+        """Name of the negotiated compression extension, or None."""
+        socket = self.socket
+        if socket is None:
+            return None
+        protocol = getattr(socket, 'protocol', socket)
+        for extension in getattr(protocol, 'extensions', None) or ():
+            if getattr(extension, 'name', None) == 'permessage-deflate':
+                return 'permessage-deflate'
+        return None
+
+    def wire_stats(self):
+        """On-wire vs decoded byte counters, plus the negotiated compression."""
+        stats = self.wire.stats()
+        stats['compression'] = self.negotiated_compression
+        return stats
+
+    def _ssl_context(self):
+        """SSL context matching FCSClient (certificate verification disabled)."""
+        if not self.url.startswith('wss://'):
+            return None
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        return context
+
+    async def _send(self, data):
+        """Send a message (dict, or a pre-encoded string from fcs_wire) to the server."""
+        if not self.socket or not self.is_connected:
+            return False
+        try:
+            payload = encode(data)
+            await self.socket.send(payload)
+            self.wire.frames_sent += 1
+            self.wire.payload_sent += len(payload)
+            return True
+        except Exception as e:
+            if self.show_logs:
+                print(f'[FCS] Send error: {e}')
+            return False
+
+    async def _call(self, func, *args):
+        """Invoke a user callback that may be sync or async."""
+        result = func(*args)
+        if asyncio.iscoroutine(result):
+            await result
+
+    async def _run(self):
+        """Connection loop: connect, receive, reconnect until stopped."""
+        try:
+            await self._connection_loop()
+        finally:
+            # End every active stream(), also when the task is cancelled
+            for queue in list(self._streams):
+                self._put(queue, _STREAM_END)
+
+    async def _connection_loop(self):
+        ws_url = f"{self.url}?access_key={self.api_key}"
+
+        while True:
+            close_code, close_msg = None, None
+            try:
+                self.socket = await websockets.connect(
+                    ws_url,
+                    ssl=self._ssl_context(),
+                    ping_interval=None,
+                    compression=self.compression,
+                    max_size=None,
+                    **self._counting_connection(),
+                )
+                if self.show_logs and self.compression:
+                    negotiated = self.negotiated_compression or 'not accepted by server'
+                    print(f'[FCS] Compression: {negotiated}')
+                if self.show_logs:
+                    print('[FCS] WebSocket connection opened')
+
+                async for message in self.socket:
+                    await self._handle_message(message)
+
+                close_code, close_msg = self.socket.close_code, self.socket.close_reason
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if self.show_logs:
+                    print(f'[FCS] Error: {e}')
+                if callable(self._onerror):
+                    await self._call(self._onerror, e)
+                if self.socket is not None:
+                    close_code, close_msg = self.socket.close_code, self.socket.close_reason
+
+            await self._handle_close(close_code, close_msg)
+
+            limit = self.reconnect_limit
+            if self.manual_close or (limit is not None and self.count_reconnects >= limit):
+                break
+
+            self.count_reconnects += 1
+            self.is_reconnect = True
+            delay = backoff_delay(
+                self.count_reconnects,
+                self.reconnect_first_delay,
+                self.reconnect_delay,
+                self.reconnect_max_delay,
+                self.reconnect_jitter,
+            )
+            if self.show_logs:
+                limit = limit if limit is not None else 'unlimited'
+                print(
+                    f'[FCS] Reconnecting in {delay:.2f}s... '
+                    f'(attempt {self.count_reconnects}/{limit})'
+                )
+            await asyncio.sleep(delay)
+
+            if self.manual_close:
+                break
+
+    async def _handle_message(self, message):
+        """Handle incoming WebSocket message."""
+        wire = self.wire
+        wire.frames_received += 1
+        wire.payload_received += len(message)
+        decoder = self.decoder
+        try:
+            data = decoder.decode(message)
+        except decoder.errors as e:
+            if self.show_logs:
+                print(f'[FCS] Invalid message from server: {e}')
+            return
+
+        msg_type = data.get('type')
+
+        # Handle ping
+        if msg_type == 'ping':
+            await self._send(encode_pong(int(time.time() * 1000)))
+            return
+
+        # Handle welcome message
+        if msg_type == 'welcome':
+            self.is_connected = True
+            self.count_reconnects = 0
+            await self._rejoin_all()
+            self._start_heartbeat()
+            self._connected_event.set()
+
+            if self.is_reconnect and callable(self._onreconnect):
+                await self._call(self._onreconnect)
+            elif not self.is_reconnect and callable(self._onconnected):
+                await self._call(self._onconnected)
+            return
+
+        # Handle subscription confirmation
+        if msg_type == 'message' and data.get('short') == 'joined_room':
+            symbol = data.get('symbol')
+            timeframe = data.get('timeframe')
+            if symbol and timeframe:
+                key = f"{symbol.upper()}_{timeframe}"
+                self.active_subscriptions[key] = {'symbol': symbol, 'timeframe': timeframe}
+                if self.show_logs:
+                    print(f'[FCS] Subscribed to {symbol} {timeframe}')
+
+        for queue in self._streams:
+            self._put(queue, data)
+
+        # Call user's message handler
+        if callable(self._onmessage):
+            await self._call(self._onmessage, data)
+
+    def _put(self, queue, data):
+        """Push into a stream queue, dropping the oldest entry when full."""
+        if queue.full():
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+        queue.put_nowait(data)
+
+    async def _handle_close(self, close_status_code, close_msg):
+        """Handle WebSocket close."""
+        if self.show_logs:
+            print(f'[FCS] Disconnected. Code: {close_status_code}, Reason: {close_msg}')
+        self.is_connected = False
+        self._cancel_heartbeat()
+
+        if callable(self._onclose):
+            await self._call(self._onclose, close_status_code, close_msg)
+
+    def _start_heartbeat(self):
+        """Start heartbeat task to keep connection alive."""
+        self._cancel_heartbeat()
+
+        async def heartbeat():
+            while self.is_connected:
+                await self._send(encode_ping(int(time.time() * 1000)))
+                await asyncio.sleep(self.heartbeat_interval)
+
+        self._heartbeat_task = asyncio.ensure_future(heartbeat())
+
+    def _cancel_heartbeat(self):
+        """Stop heartbeat task."""
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+
+
+def create_async_client(api_key, url=None, compression=None):
+    """
+    Create async FCS WebSocket client.
+
+    Args:
+        api_key (str): Your FCS API key
+        url (str, optional): WebSocket server URL
+        compression (str, optional): 'deflate' to negotiate permessage-deflate
+
+    Returns:
+        AsyncFCSClient: Client instance
+    """
+    return AsyncFCSClient(api_key, url, compression)
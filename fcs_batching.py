@@ -0,0 +1,247 @@
+"""
+FCS micro-batching stage
+
+Collects price frames and hands them to one callback per batch instead of
+one call per frame. A batch is delivered when it reaches `size` frames,
+when it has been open for `interval` seconds, or when its oldest frame is
+`max_latency` seconds old, whichever comes first.
+
+Usage:
+    from fcs_client_lib import FCSClient
+
+    client = FCSClient('YOUR_API_KEY')
+    client.enable_batching(size=500, interval=0.05)
+
+    @client.on_batch
+    def handle_batch(frames):
+        rows = [(f['symbol'], f['prices'].get('c')) for f in frames]
+        db.executemany('INSERT INTO ticks VALUES (?, ?)', rows)
+
+    # or columns: client.enable_batching(columnar=True)
+    #   batch['symbol'], batch['c'], batch['a'], ... are parallel lists
+"""
+
+import threading
+import time
+from collections import deque
+
+from fcs_decoder import PriceTick
+
+# Columns of a columnar batch
+COLUMNS = ('symbol', 'timeframe', 'mode', 't', 'o', 'h', 'l', 'c', 'v', 'a', 'b')
+
+
+def to_row(frame):
+    """Price frame (dict or PriceTick) as a tuple in COLUMNS order."""
+    if type(frame) is PriceTick:
+        return (
+            frame.symbol,
+            frame.timeframe,
+            frame.mode,
+            frame.t,
+            frame.o,
+            frame.h,
+            frame.l,
+            frame.c,
+            frame.v,
+            frame.a,
+            frame.b,
+        )
+    p = frame.get('prices') or {}
+    return (
+        frame.get('symbol'),
+        frame.get('timeframe'),
+        p.get('mode'),
+        p.get('t'),
+        p.get('o'),
+        p.get('h'),
+        p.get('l'),
+        p.get('c'),
+        p.get('v'),
+        p.get('a'),
+        p.get('b'),
+    )
+
+
+def to_columns(frames):
+    """
+    Turn a list of price frames (dicts or PriceTicks) into parallel lists.
+
+    Returns:
+        dict: Column name -> list, one entry per frame
+    """
+    if not frames:
+        return {name: [] for name in COLUMNS}
+    return dict(zip(COLUMNS, map(list, zip(*map(to_row, frames)))))
+
+
+class Batcher:
+    """
+    Accumulates frames and delivers them in batches.
+
+    Batches are delivered in order and never concurrently: by the thread
+    that fills a batch to `size`, or by the timer thread when a batch's
+    deadline passes. A batch is cut under the condition and queued; the
+    condition is released before delivery, so submit() never waits on a
+    slow deliver while holding it.
+    """
+
+    def __init__(
+        self, deliver, size=500, interval=0.05, max_latency=None, columnar=False, on_error=None
+    ):
+        """
+        Initialize batcher.
+
+        Args:
+            deliver (callable): Called with each batch (list, or dict of columns)
+            size (int): Deliver once a batch holds this many frames
+            interval (float, optional): Deliver a batch this long after its first
+                frame (None = by count only, bounded by max_latency)
+            max_latency (float, optional): Upper bound on how long any frame
+                waits (default: interval, or 0.25 s for count-only batches)
+            columnar (bool): Deliver parallel column lists instead of a list of frames
+            on_error (callable, optional): Called with the exception if deliver raises
+        """
+        if size < 1:
+            raise ValueError('size must be >= 1')
+        if max_latency is None:
+            max_latency = interval if interval else 0.25
+        if max_latency <= 0:
+            raise ValueError('max_latency must be > 0')
+
+        self.deliver = deliver
+        self.size = size
+        self.interval = interval
+        self.max_latency = max_latency
+        self.columnar = columnar
+        self.on_error = on_error
+        self.window = min(interval, max_latency) if interval else max_latency
+
+        # Counters
+        self.received = 0
+        self.batches = 0
+        self.delivered = 0
+        self.largest = 0
+
+        self._frames = []
+        self._opened = None  # monotonic time of the first frame in the open batch
+        self._cond = threading.Condition()
+        self._ready = deque()  # batches cut but not yet delivered, in cut order
+        self._deliver_lock = threading.Lock()
+        self._stopped = False
+        self._thread = None
+
+    @property
+    def pending(self):
+        """Frames in the open batch."""
+        return len(self._frames)
+
+    def start(self):
+        """Start the timer thread. Returns self for chaining."""
+        if self._thread and self._thread.is_alive():
+            return self
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name='fcs-batching')
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self, flush=True, timeout=None):
+        """
+        Stop the timer thread.
+
+        Args:
+            flush (bool): Deliver the open batch
+            timeout (float, optional): Max seconds to wait for the thread
+        """
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+        if flush:
+            self.flush()
+        else:
+            with self._cond:
+                self._frames = []
+                self._opened = None
+
+    def submit(self, data):
+        """Add a frame to the open batch, delivering it if full."""
+        with self._cond:
+            frames = self._frames
+            frames.append(data)
+            self.received += 1
+            if len(frames) == 1:
+                self._opened = time.monotonic()
+                self._cond.notify()
+            if len(frames) < self.size:
+                return
+            self._frames = []
+            self._opened = None
+            self._ready.append(frames)
+        self._deliver_ready()
+
+    def flush(self):
+        """Deliver the open batch now (no-op if empty)."""
+        with self._cond:
+            frames = self._frames
+            if not frames:
+                return
+            self._frames = []
+            self._opened = None
+            self._ready.append(frames)
+        self._deliver_ready()
+
+    def stats(self):
+        """Snapshot of counters as a dict."""
+        return {
+            'pending': self.pending,
+            'received': self.received,
+            'batches': self.batches,
+            'delivered': self.delivered,
+            'avg_batch': self.delivered / self.batches if self.batches else 0.0,
+            'largest': self.largest,
+        }
+
+    def _deliver_ready(self):
+        """
+        Deliver every queued batch. Called after releasing the condition;
+        whichever caller holds _deliver_lock delivers the queue in order,
+        so a batch cut while another is being delivered waits behind it.
+        """
+        ready = self._ready
+        with self._deliver_lock:
+            while ready:
+                self._deliver(ready.popleft())
+
+    def _deliver(self, frames):
+        """Deliver one batch (caller holds _deliver_lock)."""
+        try:
+            self.batches += 1
+            self.delivered += len(frames)
+            if len(frames) > self.largest:
+                self.largest = len(frames)
+            self.deliver(to_columns(frames) if self.columnar else frames)
+        except Exception as e:
+            if callable(self.on_error):
+                self.on_error(e)
+
+    def _run(self):
+        """Timer loop: deliver each batch when its window closes."""
+        cond = self._cond
+        while True:
+            with cond:
+                while not self._stopped and self._opened is None:
+                    cond.wait()
+                if self._stopped:
+                    return
+                remaining = self._opened + self.window - time.monotonic()
+                if remaining > 0:
+                    cond.wait(remaining)
+                    continue
+                self._ready.append(self._frames)
+                self._frames = []
+                self._opened = None
+            self._deliver_ready()
@@ -0,0 +1,367 @@
+"""
+FCS local candle aggregation
+
+Builds OHLCV bars for several timeframes from one fine-grained subscription
+per symbol, instead of one server subscription per timeframe. Bars are
+updated incrementally from 'candle' and 'askbid' frames, and a bar-close
+event fires when a bar ends.
+
+Usage:
+    from fcs_client_lib import FCSClient
+
+    client = FCSClient('YOUR_API_KEY')
+    candles = client.enable_candles(['1', '5', '15', '1H', '1D'], source='1')
+
+    @candles.on_bar_close
+    def on_bar(bar):
+        print(bar.symbol, bar.timeframe, bar.t, bar.o, bar.h, bar.l, bar.c, bar.v)
+
+    client.connect()
+    client.join('FX:EURUSD', '1')   # one subscription serves all five timeframes
+    client.run_forever()
+
+Volume comes from 'candle' frames only ('askbid' frames carry no volume).
+"""
+
+import threading
+import time
+from collections import deque
+
+from fcs_decoder import as_tick
+from fcs_scheduler import Worker, get_scheduler
+
+_UNITS = {'': 60, 'H': 3600, 'D': 86400, 'W': 604800}
+
+# 1970-01-01 was a Thursday; weekly bars start on Monday 00:00 UTC
+_WEEK_OFFSET = 4 * 86400
+
+
+def timeframe_seconds(timeframe):
+    """
+    Length of a timeframe in seconds.
+
+    Args:
+        timeframe (str): '1', '5', '15', '30', '1H', '4H', '1D', '1W', ...
+            (a bare number means minutes)
+
+    Returns:
+        int: Seconds
+    """
+    text = str(timeframe).strip().upper()
+    digits = text.rstrip('HDW')
+    unit = text[len(digits) :]
+    if not digits.isdigit() or unit not in _UNITS or int(digits) <= 0:
+        raise ValueError(f'Unsupported timeframe: {timeframe}')
+    return int(digits) * _UNITS[unit]
+
+
+def bar_start(t, seconds):
+    """Start time of the bar of length `seconds` containing time t (UTC aligned)."""
+    if seconds % 604800 == 0:
+        return (t - _WEEK_OFFSET) // seconds * seconds + _WEEK_OFFSET
+    return t // seconds * seconds
+
+
+def _to_float(value):
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class Bar:
+    """One OHLCV bar. `t` is the bar start (seconds since epoch)."""
+
+    __slots__ = (
+        'symbol',
+        'timeframe',
+        't',
+        'o',
+        'h',
+        'l',
+        'c',
+        'v',
+        'ticks',
+        'closed',
+        '_closed_volume',
+        '_source_t',
+        '_source_v',
+    )
+
+    def __init__(self, symbol, timeframe, t, price):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.t = t
+        self.o = self.h = self.l = self.c = price
+        self.v = 0.0
+        self.ticks = 0
+        self.closed = False
+        self._closed_volume = 0.0  # Volume of finished source bars inside this bar
+        self._source_t = None  # Start of the source bar currently being updated
+        self._source_v = 0.0  # Its latest (cumulative) volume
+
+    def to_dict(self):
+        return {
+            'symbol': self.symbol,
+            'timeframe': self.timeframe,
+            't': self.t,
+            'o': self.o,
+            'h': self.h,
+            'l': self.l,
+            'c': self.c,
+            'v': self.v,
+            'ticks': self.ticks,
+            'closed': self.closed,
+        }
+
+    def __repr__(self):
+        return (
+            f'Bar({self.symbol!r}, {self.timeframe!r}, t={self.t}, o={self.o}, h={self.h}, '
+            f'l={self.l}, c={self.c}, v={self.v})'
+        )
+
+
+class CandleAggregator:
+    """
+    Incremental multi-timeframe bar builder.
+
+    Only frames of the source timeframe are used. A 'candle' frame restates
+    the whole source bar so far (t = source bar start, cumulative h/l/v), so
+    target bars take max/min of its high/low and add its volume once the
+    next source bar begins. An 'askbid' frame is a single trade-less price
+    (mid by default) at time t.
+
+    A bar closes when a frame for a later bar arrives, or, with
+    close_on_time, once the wall clock passes the bar end plus `grace`, so
+    quiet symbols still produce bar-close events on time.
+    """
+
+    def __init__(
+        self,
+        timeframes=('1', '5', '15', '1H', '1D'),
+        source='1',
+        price='mid',
+        keep=500,
+        close_on_time=True,
+        grace=2.0,
+        on_error=None,
+        worker=None,
+    ):
+        """
+        Initialize aggregator.
+
+        Args:
+            timeframes (list): Timeframes to build; each must be a multiple of source
+            source (str): Timeframe of the subscription bars are built from
+            price (str): Price used from 'askbid' frames - 'mid', 'bid' or 'ask'
+            keep (int): Closed bars kept per symbol/timeframe
+            close_on_time (bool): Close bars by wall clock, not only on the next frame
+            grace (float): Seconds after a bar's end before a time-based close
+            on_error (callable, optional): Called with exceptions raised by bar-close handlers
+                (default: re-raised after the remaining bars are emitted)
+            worker (Worker, optional): Thread for time-based closes and the bar-close
+                events they fire (default: a new Worker), never the shared scheduler thread
+        """
+        if price not in ('mid', 'bid', 'ask'):
+            raise ValueError(f'Unknown price: {price}')
+        self.source = str(source)
+        source_seconds = timeframe_seconds(source)
+        self.timeframes = {}
+        for tf in timeframes:
+            seconds = timeframe_seconds(tf)
+            if seconds % source_seconds:
+                raise ValueError(f'Timeframe {tf} is not a multiple of source {source}')
+            self.timeframes[str(tf)] = seconds
+        self.price = price
+        self.keep = keep
+        self.grace = grace
+        self.on_error = on_error
+
+        # Counters
+        self.received = 0
+        self.late = 0
+        self.bars_closed = 0
+
+        self._current = {}  # (SYMBOL, tf) -> Bar
+        self._closed = {}  # (SYMBOL, tf) -> deque of closed Bars
+        self._onbarclose = None
+        self._lock = threading.Lock()
+        self._timer = None
+        if close_on_time:
+            worker = worker or Worker(name='fcs-candles')
+            self._timer = get_scheduler().call_every(1.0, self.close_due, worker=worker)
+
+    def on_bar_close(self, func):
+        """Decorator: func(bar) is called for every closed bar."""
+        self._onbarclose = func
+        return func
+
+    # ============================================
+    # Input
+    # ============================================
+
+    def on_message(self, data):
+        """Listener entry point: update bars from a price frame."""
+        tick = as_tick(data)
+        if tick is None or str(tick.timeframe) != self.source or not tick.symbol:
+            return
+        t = _to_float(tick.t)
+        if t is None:
+            return
+        if t > 1e11:  # milliseconds
+            t /= 1000.0
+
+        if tick.mode == 'askbid':
+            a, b = _to_float(tick.a), _to_float(tick.b)
+            if self.price == 'bid':
+                price = b
+            elif self.price == 'ask':
+                price = a
+            else:
+                price = (a + b) / 2 if a is not None and b is not None else (a if b is None else b)
+            if price is None:
+                return
+            self.update(tick.symbol, t, price, price, price, price)
+        else:
+            c = _to_float(tick.c)
+            if c is None:
+                return
+            o, h, l, v = _to_float(tick.o), _to_float(tick.h), _to_float(tick.l), _to_float(tick.v)
+            self.update(
+                tick.symbol,
+                t,
+                o if o is not None else c,
+                h if h is not None else c,
+                l if l is not None else c,
+                c,
+                v,
+                source_bar=True,
+            )
+
+    def update(self, symbol, t, o, h, l, c, v=None, source_bar=False):
+        """
+        Apply one update to every target timeframe.
+
+        Args:
+            symbol (str): Symbol
+            t (float): Update time; for source_bar, the source bar start
+            o, h, l, c (float): Prices (all equal for a single price)
+            v (float, optional): Cumulative volume of the source bar
+            source_bar (bool): The update restates a whole source bar (candle frame)
+        """
+        symbol = symbol.upper()
+        closed = []
+        with self._lock:
+            self.received += 1
+            for tf, seconds in self.timeframes.items():
+                key = (symbol, tf)
+                start = bar_start(int(t), seconds)
+                bar = self._current.get(key)
+                if bar is None:
+                    history = self._closed.get(key)
+                    if history and start <= history[-1].t:
+                        # Bar already closed by time; don't reopen it
+                        self.late += 1
+                        continue
+                elif start < bar.t:
+                    self.late += 1
+                    continue
+                if bar is None or start > bar.t:
+                    if bar is not None:
+                        self._close(key, bar, closed)
+                    bar = self._current[key] = Bar(symbol, tf, start, o)
+
+                if h > bar.h:
+                    bar.h = h
+                if l < bar.l:
+                    bar.l = l
+                bar.c = c
+                bar.ticks += 1
+                if source_bar and v is not None:
+                    if bar._source_t != t:
+                        bar._closed_volume += bar._source_v
+                        bar._source_t = t
+                    bar._source_v = v
+                    bar.v = bar._closed_volume + v
+        self._emit(closed)
+
+    # ============================================
+    # Closing
+    # ============================================
+
+    def close_due(self, now=None):
+        """Close bars whose end (plus grace) has passed. Runs every second when close_on_time."""
+        now = time.time() if now is None else now
+        closed = []
+        with self._lock:
+            for key, bar in list(self._current.items()):
+                if bar.t + self.timeframes[key[1]] + self.grace <= now:
+                    del self._current[key]
+                    self._close(key, bar, closed)
+        self._emit(closed)
+
+    def _close(self, key, bar, closed):
+        bar.closed = True
+        history = self._closed.get(key)
+        if history is None:
+            history = self._closed[key] = deque(maxlen=self.keep)
+        history.append(bar)
+        self.bars_closed += 1
+        closed.append(bar)
+
+    def _emit(self, closed):
+        func = self._onbarclose
+        if not closed or not callable(func):
+            return
+        error = None
+        for bar in closed:
+            try:
+                func(bar)
+            except Exception as e:
+                if self.on_error is None:
+                    error = error or e
+                else:
+                    self.on_error(e)
+        if error is not None:
+            raise error
+
+    def stop(self):
+        """Stop time-based closing."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    # ============================================
+    # Queries
+    # ============================================
+
+    def current(self, symbol, timeframe):
+        """Bar in progress for a symbol/timeframe, or None."""
+        return self._current.get((symbol.upper(), str(timeframe)))
+
+    def bars(self, symbol, timeframe, n=None):
+        """
+        Closed bars, oldest first.
+
+        Args:
+            symbol (str): Symbol
+            timeframe (str): Target timeframe
+            n (int, optional): Only the last n bars
+
+        Returns:
+            list: Bar objects
+        """
+        with self._lock:
+            history = list(self._closed.get((symbol.upper(), str(timeframe)), ()))
+        return history if n is None else history[-n:]
+
+    def stats(self):
+        return {
+            'received': self.received,
+            'late': self.late,
+            'bars_closed': self.bars_closed,
+            'open_bars': len(self._current),
+            'timeframes': list(self.timeframes),
+        }
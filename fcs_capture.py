@@ -0,0 +1,306 @@
+"""
+FCS tick capture and replay
+
+Records every raw frame the client receives, with its receive timestamp, to
+an append-only segmented log, and replays a capture through the normal
+FCSClient callback path at recorded speed, N times faster, or as fast as
+possible.
+
+File format (little-endian), one directory per capture:
+
+    segment-000001.fcap, segment-000002.fcap, ...
+    header:  8 bytes magic b'FCSCAP1\\n'
+    records: float64 receive time (seconds since epoch)
+             uint32  payload length
+             payload (raw frame bytes as received, UTF-8)
+
+Segments are only ever appended to; a new segment starts when the current
+one reaches segment_size. A record cut short by a crash is ignored on read.
+
+Usage:
+    from fcs_client_lib import FCSClient
+
+    client = FCSClient('YOUR_API_KEY')
+    client.start_capture('captures/2025-12-24')
+    ...
+    client.stop_capture()
+
+    # Later: same handlers, recorded data
+    replay_client = FCSClient('replay')
+    replay_client.on_message(handle_message)
+    replay_client.replay('captures/2025-12-24', speed=10)  # 10x
+"""
+
+import mmap
+import os
+import struct
+import threading
+import time
+
+from fcs_scheduler import Worker, get_scheduler
+
+MAGIC = b'FCSCAP1\n'
+SEGMENT_PREFIX = 'segment-'
+SEGMENT_SUFFIX = '.fcap'
+
+_RECORD = struct.Struct('<dI')
+
+
+def _segment_index(name):
+    """Sequence number of a segment file name, or None if it is not a segment."""
+    if not (name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)):
+        return None
+    try:
+        return int(name[len(SEGMENT_PREFIX) : -len(SEGMENT_SUFFIX)])
+    except ValueError:
+        return None
+
+
+def list_segments(path):
+    """
+    Segment files of a capture, in write order.
+
+    Args:
+        path (str): Capture directory, or a single segment file
+
+    Returns:
+        list: File paths
+    """
+    if os.path.isfile(path):
+        return [path]
+    segments = []
+    for name in os.listdir(path):
+        index = _segment_index(name)
+        if index is not None:
+            segments.append((index, os.path.join(path, name)))
+    return [p for _, p in sorted(segments)]
+
+
+class CaptureWriter:
+    """
+    Append-only segmented frame log.
+
+    write() is called on the receive thread and only appends to a buffered
+    file; the buffer is flushed to disk every flush_interval seconds on a
+    worker thread (never the shared scheduler thread), and on close().
+    """
+
+    def __init__(self, path, segment_size=256 * 1024 * 1024, flush_interval=1.0, worker=None):
+        """
+        Initialize capture writer.
+
+        Args:
+            path (str): Capture directory (created if missing; an existing
+                capture is continued in a new segment)
+            segment_size (int): Bytes per segment before rolling to the next one
+            flush_interval (float, optional): Seconds between flushes (None = only on close)
+            worker (Worker, optional): Thread for periodic flushes (default: a new Worker)
+        """
+        self.path = path
+        self.segment_size = segment_size
+        self.frames = 0
+        self.bytes = 0
+        self.segments = 0
+
+        os.makedirs(path, exist_ok=True)
+        existing = [_segment_index(name) for name in os.listdir(path)]
+        self._next_index = max([i for i in existing if i is not None], default=0) + 1
+        self._file = None
+        self._size = 0
+        self._lock = threading.Lock()
+        self._open_segment()
+
+        self._flush_timer = None
+        if flush_interval:
+            worker = worker or Worker(name='fcs-capture')
+            self._flush_timer = get_scheduler().call_every(
+                flush_interval, self.flush, worker=worker
+            )
+
+    def _open_segment(self):
+        if self._file is not None:
+            self._file.close()
+        name = f'{SEGMENT_PREFIX}{self._next_index:06d}{SEGMENT_SUFFIX}'
+        self._next_index += 1
+        self._file = open(os.path.join(self.path, name), 'wb', buffering=1024 * 1024)
+        self._file.write(MAGIC)
+        self._size = len(MAGIC)
+        self.segments += 1
+
+    def write(self, message, received_at=None):
+        """
+        Append one raw frame.
+
+        Args:
+            message (str | bytes): Frame as received from the socket
+            received_at (float, optional): Receive time (default: now)
+        """
+        if type(message) is str:
+            message = message.encode('utf-8')
+        if received_at is None:
+            received_at = time.time()
+        size = _RECORD.size + len(message)
+        with self._lock:
+            file = self._file
+            if file is None:
+                return
+            if self._size + size > self.segment_size and self._size > len(MAGIC):
+                self._open_segment()
+                file = self._file
+            file.write(_RECORD.pack(received_at, len(message)))
+            file.write(message)
+            self._size += size
+        self.frames += 1
+        self.bytes += size
+
+    def flush(self):
+        """Flush buffered records to the OS."""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+
+    def close(self):
+        """Flush and close the current segment. Further writes are ignored."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        with self._lock:
+            file, self._file = self._file, None
+            if file is not None:
+                file.close()
+
+    def stats(self):
+        return {
+            'path': self.path,
+            'frames': self.frames,
+            'bytes': self.bytes,
+            'segments': self.segments,
+        }
+
+
+class CaptureReader:
+    """
+    Iterates (received_at, payload) records of a capture via mmap.
+
+    Segments are mapped one at a time, so replaying a multi-GB capture does
+    not load it into memory; the OS pages data in as it is read.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize capture reader.
+
+        Args:
+            path (str): Capture directory, or a single segment file
+        """
+        self.path = path
+        self.segments = list_segments(path)
+
+    def __iter__(self):
+        for segment in self.segments:
+            yield from self._read_segment(segment)
+
+    def _read_segment(self, segment):
+        with open(segment, 'rb') as f:
+            if os.fstat(f.fileno()).st_size <= len(MAGIC):
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm[: len(MAGIC)] != MAGIC:
+                    raise ValueError(f'Not an FCS capture segment: {segment}')
+                end = len(mm)
+                offset = len(MAGIC)
+                unpack_from = _RECORD.unpack_from
+                header = _RECORD.size
+                while offset + header <= end:
+                    received_at, length = unpack_from(mm, offset)
+                    offset += header
+                    if offset + length > end:
+                        break  # Truncated final record
+                    yield received_at, mm[offset : offset + length]
+                    offset += length
+
+    def count(self):
+        """Number of complete records (scans the capture)."""
+        return sum(1 for _ in self)
+
+    def time_range(self):
+        """(first, last) receive time, or None for an empty capture."""
+        first = last = None
+        for received_at, _ in self:
+            if first is None:
+                first = received_at
+            last = received_at
+        return None if first is None else (first, last)
+
+
+class Replayer:
+    """
+    Feeds a capture through FCSClient._handle_message, the same path live
+    frames take, so decoders, listeners, conflation, dispatch and on_message
+    all behave as they did when the data was recorded.
+    """
+
+    def __init__(self, client, path, speed=1.0, start=None, end=None):
+        """
+        Initialize replayer.
+
+        Args:
+            client (FCSClient): Client whose handlers receive the frames
+            path (str): Capture directory or segment file
+            speed (float, optional): 1 = recorded pace, N = N times faster,
+                None or 0 = as fast as possible
+            start (float, optional): Skip frames received before this time
+            end (float, optional): Stop at the first frame received after this time
+        """
+        self.client = client
+        self.reader = CaptureReader(path)
+        self.speed = speed
+        self.start = start
+        self.end = end
+        self.frames = 0
+        self.elapsed = None
+        self.thread = None  # Set when run on a background thread
+        self._stop = threading.Event()
+
+    def run(self):
+        """
+        Replay until the capture ends or stop() is called.
+
+        Returns:
+            int: Frames replayed
+        """
+        client = self.client
+        handle = client._handle_message
+        speed = self.speed
+        start, end = self.start, self.end
+        stop = self._stop
+        first = None
+        began = time.perf_counter()
+
+        for received_at, payload in self.reader:
+            if start is not None and received_at < start:
+                continue
+            if end is not None and received_at > end:
+                break
+            if stop.is_set():
+                break
+            if speed:
+                if first is None:
+                    first = received_at
+                delay = (received_at - first) / speed - (time.perf_counter() - began)
+                if delay > 0 and stop.wait(delay):
+                    break
+            handle(None, payload)
+            self.frames += 1
+
+        self.elapsed = time.perf_counter() - began
+        # A replayed welcome starts the heartbeat; there is no socket to keep alive
+        client._stop_heartbeat()
+        client.is_connected = False
+        if client.show_logs:
+            print(f'[FCS] Replayed {self.frames} frames in {self.elapsed:.2f}s')
+        return self.frames
+
+    def stop(self):
+        """Stop a running replay after the current frame."""
+        self._stop.set()
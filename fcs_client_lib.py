@@ -21,15 +21,28 @@ Install:
     pip install websocket-client
 """
 
-import json
 import threading
 import time
-import ssl
 
-try:
-    import websocket
-except ImportError:
-    raise ImportError("Please install websocket-client: pip install websocket-client")
+from fcs_batching import Batcher, to_columns
+from fcs_candles import CandleAggregator
+from fcs_capture import CaptureWriter, Replayer
+from fcs_conflation import Conflator
+from fcs_decoder import Decoder, PriceTick
+from fcs_dispatch import Dispatcher
+from fcs_history import TickHistory
+from fcs_indicators import IndicatorEngine
+from fcs_metrics import ClientMetrics, frame_size
+from fcs_profiling import Profiler
+from fcs_quotes import QuoteStore
+from fcs_routing import Router
+from fcs_scheduler import Worker, backoff_delay, get_scheduler
+from fcs_shm import ShmPublisher
+from fcs_state import WarmStart
+from fcs_subscriptions import SubscriptionManager
+from fcs_transport import get_transport
+from fcs_watchdog import Watchdog
+from fcs_wire import REMOVE_ALL, encode, encode_ping, encode_pong
 
 
 class FCSClient:
@@ -42,19 +55,28 @@ class FCSClient:
     - Stocks (NASDAQ:AAPL, NYSE:TSLA, etc.)
     """
 
-    def __init__(self, api_key, url=None):
+    def __init__(self, api_key, url=None, transport=None):
         """
         Initialize FCS WebSocket client.
 
         Args:
             api_key (str): Your FCS API key (use 'fcs_socket_demo' for testing)
             url (str, optional): WebSocket server URL
+            transport (str or callable, optional): 'websocket-client' (default),
+                'websockets', or a transport factory (see fcs_transport)
         """
         self.url = url or 'wss://ws-v4.fcsapi.com/ws'
         self.api_key = api_key
-        self.socket = None
+        self.transport = get_transport(transport)
+        self.socket = None  # Transport of the current connection
         self.active_subscriptions = {}  # Map() equivalent
-        self.heartbeat = None
+        self.heartbeat = None  # TimerHandle on the shared scheduler
+        # Timer work that blocks (sends, capture flushes, state saves) runs here,
+        # not on the shared scheduler thread, so a stalled connection only
+        # delays this client
+        self.io_worker = Worker(name='fcs-client-io')
+        self.io_worker.on_error = self._handle_callback_error
+        self.heartbeat_interval = 25  # seconds (25000ms in JS)
         self.reconnect_delay = 3  # seconds (3000ms in JS)
         self.manual_close = False
         self.is_connected = False
@@ -64,15 +86,72 @@ class FCSClient:
         self._onconnected = None
         self._onclose = None
         self._onmessage = None
+        self._onbatch = None
         self._onerror = None
         self._onreconnect = None
+        self.router = Router()  # Per type/symbol/timeframe handlers (on_price, on_type)
         self.count_reconnects = 0
-        self.reconnect_limit = 5
+        self.reconnect_limit = 5  # None for unlimited
         self.is_reconnect = False
 
-        # Heartbeat thread
-        self._heartbeat_thread = None
-        self._stop_heartbeat = False
+        # Reconnect backoff: first retry after reconnect_first_delay, then
+        # reconnect_delay * 2^n capped at reconnect_max_delay, minus up to
+        # reconnect_jitter of the delay at random
+        self.reconnect_first_delay = 0
+        self.reconnect_max_delay = 60
+        self.reconnect_jitter = 0.5
+        self._wake = threading.Event()
+
+        # Recovery timing for the most recent reconnect
+        self.last_recovery = None
+        self._closed_at = None
+        self._awaiting_first_tick = None
+
+        # Round-trip time from heartbeat ping/pong (seconds)
+        self.rtt = None       # Smoothed (EWMA)
+        self.rtt_last = None  # Most recent sample
+        self.rtt_samples = 0
+        self.server_clock_offset = None  # Local minus server clock, from server pings (ms)
+        self._pings_in_flight = {}  # ping timestamp (ms) -> time.monotonic() when sent
+
+        # Join/leave intents, paced sending and per-key state
+        self.subscriptions = SubscriptionManager(self)
+
+        # Frame decoder and control-frame dispatch table
+        self.decoder = Decoder()
+        self._control_handlers = {
+            'ping': self._handle_ping,
+            'pong': self._handle_pong,
+            'welcome': self._handle_welcome,
+            'message': self._handle_control_message,
+        }
+
+        # Optional dispatch stage between socket thread and on_message
+        self.dispatcher = None
+        self.conflator = None
+        self.batcher = None
+        self._batch_columnar = False
+        self.watchdog = None
+
+        # Internal per-message observers (history, stores, ...)
+        self._listeners = []
+        self._raw_listeners = []  # Called with the undecoded frame (relay, ...)
+        self.history = None
+        self.candles = None
+        self.indicators = None
+        self.quotes = None
+        self.shm_publisher = None
+        self.sinks = []
+
+        # Optional metrics registry and hot-path profiler
+        self.metrics = None
+        self.profiler = None
+
+        # Optional raw frame recorder
+        self.capture = None
+
+        # Optional warm-start state file
+        self.warm_start = None
 
     # ============================================
     # Event callback decorators (like JS callbacks)
@@ -104,6 +183,19 @@ class FCSClient:
         self._onmessage = func
         return func
 
+    @property
+    def onbatch(self):
+        return self._onbatch
+
+    @onbatch.setter
+    def onbatch(self, func):
+        self._onbatch = func
+
+    def on_batch(self, func):
+        """Decorator for batched price frames (see enable_batching())."""
+        self._onbatch = func
+        return func
+
     @property
     def onclose(self):
         return self._onclose
@@ -143,6 +235,45 @@ class FCSClient:
         self._onreconnect = func
         return func
 
+    # ============================================
+    # Routed handlers
+    # ============================================
+
+    def on_price(self, symbol='*', timeframe=None):
+        """
+        Decorator for price frames of one symbol, exchange or all symbols.
+
+        Routed handlers run after on_message, on the same thread. Several
+        handlers may be registered for the same route.
+
+        Args:
+            symbol (str): 'EXCHANGE:SYMBOL', 'EXCHANGE:*' or '*' (all)
+            timeframe (str, optional): Only this timeframe (default: any)
+
+        Example:
+            @client.on_price('BINANCE:BTCUSDT', '1D')
+            def btc(data): ...
+        """
+        def register(func):
+            return self.router.add_price(func, symbol, timeframe)
+        return register
+
+    def on_type(self, msg_type):
+        """
+        Decorator for every message of a type ('price', 'message', 'pong', ...).
+
+        Example:
+            @client.on_type('message')
+            def server_message(data): ...
+        """
+        def register(func):
+            return self.router.add_type(func, msg_type)
+        return register
+
+    def off(self, func):
+        """Remove a handler registered with on_price() or on_type()."""
+        self.router.remove(func)
+
     # ============================================
     # Connection methods
     # ============================================
@@ -157,7 +288,7 @@ class FCSClient:
 
         ws_url = f"{self.url}?access_key={self.api_key}"
 
-        self.socket = websocket.WebSocketApp(
+        self.socket = self.transport(
             ws_url,
             on_open=self._handle_open,
             on_message=self._handle_message,
@@ -171,27 +302,602 @@ class FCSClient:
         """
         Start the WebSocket connection.
 
+        Runs a supervisor loop that owns the connection lifecycle: when the
+        socket closes unexpectedly it waits for the backoff delay and
+        reconnects on the same thread, until disconnect() is called or
+        reconnect_limit is reached.
+
         Args:
             blocking (bool): If True, blocks the main thread. If False, runs in background.
         """
+        self.manual_close = False
         if blocking:
-            self.socket.run_forever(sslopt={"cert_reqs": ssl.CERT_NONE})
+            self._supervise()
         else:
-            thread = threading.Thread(
-                target=lambda: self.socket.run_forever(sslopt={"cert_reqs": ssl.CERT_NONE})
-            )
+            thread = threading.Thread(target=self._supervise, name='fcs-supervisor')
             thread.daemon = True
             thread.start()
             return thread
 
+    def reconnect(self):
+        """
+        Drop the current connection and let the supervisor reconnect.
+
+        All subscriptions are rejoined after the new welcome.
+        """
+        if self.socket and not self.manual_close:
+            if self.show_logs:
+                print('[FCS] Reconnecting on request')
+            self.socket.close()
+
     def disconnect(self):
         """Disconnect from WebSocket server."""
         self.manual_close = True
         self.is_connected = False
-        self._stop_heartbeat = True
+        self._stop_heartbeat()
+        self._wake.set()
+        self.subscriptions.on_disconnect()
+        if self.batcher is not None:
+            self.batcher.flush()
+        if self.warm_start is not None:
+            self.warm_start.save()
         if self.socket:
             self.socket.close()
 
+    # ============================================
+    # Decoding
+    # ============================================
+
+    def set_decoder(self, backend='auto', typed=False):
+        """
+        Choose the JSON decoder for incoming frames.
+
+        Args:
+            backend (str): 'auto' (orjson, then msgspec, then json), 'orjson', 'msgspec' or 'json'
+            typed (bool): Deliver 'price' frames as PriceTick objects instead of dicts
+
+        Returns:
+            Decoder: The active decoder
+        """
+        self.decoder = Decoder(backend, typed)
+        return self.decoder
+
+    # ============================================
+    # Listeners
+    # ============================================
+
+    def add_listener(self, func):
+        """
+        Register an observer that sees every decoded message.
+
+        Listeners run on the receive thread before conflation, dispatch and
+        on_message, so they must be fast. Exceptions are reported via on_error.
+
+        Args:
+            func (callable): Called with each decoded message
+        """
+        if func not in self._listeners:
+            self._listeners = self._listeners + [func]
+        return func
+
+    def remove_listener(self, func):
+        """Unregister an observer added with add_listener()."""
+        self._listeners = [f for f in self._listeners if f != func]
+
+    def add_raw_listener(self, func):
+        """
+        Register an observer that sees every raw frame before it is decoded.
+
+        Runs on the receive thread, before capture and decoding; keep it cheap.
+
+        Args:
+            func (callable): Called with the frame as received (str)
+        """
+        if func not in self._raw_listeners:
+            self._raw_listeners = self._raw_listeners + [func]
+        return func
+
+    def remove_raw_listener(self, func):
+        """Unregister an observer added with add_raw_listener()."""
+        self._raw_listeners = [f for f in self._raw_listeners if f != func]
+
+    def enable_history(self, capacity=256, max_keys=1000):
+        """
+        Keep a bounded columnar tick history per symbol/timeframe.
+
+        Args:
+            capacity (int): Ticks kept per key
+            max_keys (int): Max keys tracked; the least recently updated key is evicted
+
+        Returns:
+            TickHistory: History store (also available as client.history)
+        """
+        self.disable_history()
+        self.history = TickHistory(capacity=capacity, max_keys=max_keys)
+        self.add_listener(self.history.on_message)
+        return self.history
+
+    def disable_history(self):
+        """Stop recording tick history."""
+        history, self.history = self.history, None
+        if history:
+            self.remove_listener(history.on_message)
+
+    def add_sink(self, sink):
+        """
+        Persist price frames with a sink from fcs_sinks (SQLiteSink, CSVSink, ParquetSink).
+
+        The sink buffers rows and writes them on its own thread.
+
+        Args:
+            sink (Sink): Sink to start and attach
+
+        Returns:
+            Sink: The sink (also listed in client.sinks)
+        """
+        if sink.on_error is None:
+            sink.on_error = self._handle_callback_error
+        sink.start()
+        self.sinks.append(sink)
+        self.add_listener(sink.on_message)
+        return sink
+
+    def remove_sink(self, sink, flush=True, timeout=None):
+        """
+        Detach and stop a sink.
+
+        Args:
+            sink (Sink): Sink added with add_sink()
+            flush (bool): Write rows still buffered before closing
+            timeout (float, optional): Max seconds to wait for its writer thread
+        """
+        if sink in self.sinks:
+            self.sinks.remove(sink)
+            self.remove_listener(sink.on_message)
+        sink.stop(flush=flush, timeout=timeout)
+
+    def enable_quotes(self):
+        """
+        Keep the latest merged quote (OHLCV + ask/bid) per symbol/timeframe.
+
+        Returns:
+            QuoteStore: Store (also available as client.quotes)
+        """
+        if self.quotes is None:
+            self.quotes = QuoteStore()
+            self.add_listener(self.quotes.on_message)
+        return self.quotes
+
+    def disable_quotes(self):
+        """Stop updating the quote store."""
+        quotes, self.quotes = self.quotes, None
+        if quotes:
+            self.remove_listener(quotes.on_message)
+
+    def latest(self, symbol, timeframe=None):
+        """
+        Latest quote for a symbol (requires enable_quotes()).
+
+        Args:
+            symbol (str): Symbol, e.g. 'BINANCE:BTCUSDT'
+            timeframe (str, optional): Only this timeframe
+
+        Returns:
+            Quote: Immutable snapshot, or None
+        """
+        quotes = self.quotes
+        return quotes.latest(symbol, timeframe) if quotes is not None else None
+
+    def wait_for_update(self, symbol, timeout=None):
+        """
+        Block until the next quote update for a symbol (enables the quote store).
+
+        Returns:
+            Quote: The new quote, or None on timeout
+        """
+        return self.enable_quotes().wait_for_update(symbol, timeout)
+
+    def enable_state(self, path, interval=5.0, max_age=None, restore=True):
+        """
+        Persist subscriptions and latest quotes to a file, and restore them now.
+
+        Restored quotes are served by latest() right away with quote.stale
+        set; restored subscriptions are joined after the next welcome.
+        Snapshots are written every `interval` seconds (when something
+        changed) and on disconnect().
+
+        Args:
+            path (str): State file (JSON, replaced atomically)
+            interval (float): Seconds between snapshots
+            max_age (float, optional): Don't restore a file older than this (seconds)
+            restore (bool): Load the file now
+
+        Returns:
+            WarmStart: Exposes save(), restore() and stats() (also client.warm_start)
+        """
+        self.disable_state(save=False)
+        self.enable_quotes()
+        self.warm_start = WarmStart(self, path, interval=interval, max_age=max_age)
+        if restore:
+            self.warm_start.restore()
+        return self.warm_start.start()
+
+    def disable_state(self, save=True):
+        """Stop saving state (writes a final snapshot unless save=False)."""
+        warm_start, self.warm_start = self.warm_start, None
+        if warm_start:
+            warm_start.stop(save=save)
+
+    def enable_candles(self, timeframes=('1', '5', '15', '1H', '1D'), source='1', price='mid',
+                       keep=500, close_on_time=True):
+        """
+        Build bars for several timeframes locally from one subscription per symbol.
+
+        Join each symbol once with the source timeframe; bars for every
+        timeframe in `timeframes` are built from that stream.
+
+        Args:
+            timeframes (list): Timeframes to build (multiples of source)
+            source (str): Timeframe of the subscriptions bars are built from
+            price (str): Price used from 'askbid' frames - 'mid', 'bid' or 'ask'
+            keep (int): Closed bars kept per symbol/timeframe
+            close_on_time (bool): Also close bars by wall clock for quiet symbols
+
+        Returns:
+            CandleAggregator: Use on_bar_close, current() and bars() (also client.candles)
+        """
+        self.disable_candles()
+        self.candles = CandleAggregator(timeframes, source=source, price=price, keep=keep,
+                                        close_on_time=close_on_time,
+                                        on_error=self._handle_callback_error,
+                                        worker=self.io_worker)
+        self.add_listener(self.candles.on_message)
+        return self.candles
+
+    def disable_candles(self):
+        """Stop building local bars."""
+        candles, self.candles = self.candles, None
+        if candles:
+            self.remove_listener(candles.on_message)
+            candles.stop()
+
+    def enable_indicators(self, ema_periods=(20,), vwap_window=100, batch_size=256, interval=0.05,
+                          pip_size=None):
+        """
+        Compute spread, EMA, VWAP and returns for every symbol in vectorized micro-batches.
+
+        Args:
+            ema_periods (tuple): EMA periods in ticks
+            vwap_window (int): Candle updates in the rolling VWAP
+            batch_size (int): Apply queued ticks once this many are waiting
+            interval (float): Also apply them at least this often (seconds)
+            pip_size (callable, optional): func(symbol) -> pip size for spread_pips
+
+        Returns:
+            IndicatorEngine: Use view(), get() and on_update (also client.indicators)
+        """
+        self.disable_indicators()
+        self.indicators = IndicatorEngine(ema_periods=ema_periods, vwap_window=vwap_window,
+                                          batch_size=batch_size, interval=interval,
+                                          pip_size=pip_size, on_error=self._handle_callback_error,
+                                          worker=self.io_worker)
+        self.add_listener(self.indicators.on_message)
+        return self.indicators
+
+    def disable_indicators(self):
+        """Stop updating indicators."""
+        indicators, self.indicators = self.indicators, None
+        if indicators:
+            self.remove_listener(indicators.on_message)
+            indicators.stop()
+
+    def enable_shm_publisher(self, name=None, capacity=65536, max_keys=4096):
+        """
+        Publish every price frame into a shared-memory ring for other local processes.
+
+        Worker processes attach with fcs_shm.ShmReader(publisher.name) and
+        consume the ticks of this one connection.
+
+        Args:
+            name (str, optional): Shared memory name (default: generated)
+            capacity (int): Ticks held in the ring
+            max_keys (int): Max distinct symbol/timeframe keys
+
+        Returns:
+            ShmPublisher: Publisher (also available as client.shm_publisher)
+        """
+        self.disable_shm_publisher()
+        self.shm_publisher = ShmPublisher(name=name, capacity=capacity, max_keys=max_keys)
+        self.add_listener(self.shm_publisher.on_message)
+        if self.show_logs:
+            print(f'[FCS] Publishing ticks to shared memory {self.shm_publisher.name}')
+        return self.shm_publisher
+
+    def disable_shm_publisher(self, unlink=True):
+        """Stop publishing and close (by default remove) the shared-memory ring."""
+        publisher, self.shm_publisher = self.shm_publisher, None
+        if publisher:
+            self.remove_listener(publisher.on_message)
+            publisher.close(unlink=unlink)
+
+    # ============================================
+    # Metrics
+    # ============================================
+
+    def enable_metrics(self, http_port=None, http_host='127.0.0.1'):
+        """
+        Collect client metrics: frames/bytes by type, decode and callback time,
+        reconnects, send failures, per-subscription tick rate and feed latency.
+
+        Args:
+            http_port (int, optional): Also serve Prometheus text at
+                http://http_host:http_port/metrics
+            http_host (str): Interface for the HTTP endpoint (default: localhost only)
+
+        Returns:
+            ClientMetrics: Registry with snapshot() and to_prometheus()
+        """
+        if self.metrics is None:
+            metrics = ClientMetrics()
+            metrics.add_collector(self._collect_metrics)
+            self.metrics = metrics
+        if http_port is not None:
+            self.metrics.start_http_server(http_port, http_host)
+        return self.metrics
+
+    def disable_metrics(self):
+        """Stop collecting metrics and shut down the HTTP endpoint."""
+        metrics, self.metrics = self.metrics, None
+        if metrics is not None:
+            metrics.close()
+
+    def _collect_metrics(self):
+        """Refresh connection gauges before a snapshot/export."""
+        metrics = self.metrics
+        if metrics is None:
+            return
+        metrics.connected.set(1 if self.is_connected else 0)
+        if self.rtt is not None:
+            metrics.rtt.set(self.rtt)
+
+    # ============================================
+    # Profiling
+    # ============================================
+
+    def enable_profiling(self, sample_every=1, slow_threshold=None):
+        """
+        Time the receive path and detect slow handlers. Safe to call on a running client.
+
+        Stage hooks ('receive', 'decode', 'dispatch', 'callback') see 1 in
+        sample_every frames. Handlers (on_message and listeners) are timed on
+        every call while slow_threshold is set.
+
+        Args:
+            sample_every (int): Time 1 in N frames
+            slow_threshold (float, optional): Report handler calls slower than this many seconds
+
+        Returns:
+            Profiler: Use add_hook(), on_slow, slow_calls and stats()
+        """
+        self.profiler = Profiler(sample_every=sample_every, slow_threshold=slow_threshold)
+        return self.profiler
+
+    def disable_profiling(self):
+        """Stop profiling. Safe to call on a running client."""
+        self.profiler = None
+
+    # ============================================
+    # Capture and replay
+    # ============================================
+
+    def start_capture(self, path, segment_size=256 * 1024 * 1024, flush_interval=1.0):
+        """
+        Record every raw frame received, with its receive time, to an append-only log.
+
+        Args:
+            path (str): Capture directory (an existing capture is continued in a new segment)
+            segment_size (int): Bytes per segment file
+            flush_interval (float, optional): Seconds between flushes to disk
+
+        Returns:
+            CaptureWriter: Recorder (also available as client.capture)
+        """
+        self.stop_capture()
+        self.capture = CaptureWriter(path, segment_size=segment_size,
+                                     flush_interval=flush_interval, worker=self.io_worker)
+        if self.show_logs:
+            print(f'[FCS] Capturing frames to {path}')
+        return self.capture
+
+    def stop_capture(self):
+        """Stop recording and close the capture."""
+        capture, self.capture = self.capture, None
+        if capture is not None:
+            capture.close()
+
+    def replay(self, path, speed=1.0, start=None, end=None, blocking=True):
+        """
+        Feed a capture through this client's handlers instead of a live socket.
+
+        Frames take the same path as live ones (decoder, listeners,
+        conflation, dispatch, on_message). Use a client that is not connected.
+
+        Args:
+            path (str): Capture directory or segment file
+            speed (float, optional): 1 = recorded pace, N = N times faster, None = max speed
+            start (float, optional): Skip frames received before this Unix time
+            end (float, optional): Stop after this Unix time
+            blocking (bool): If False, replay on a background thread
+
+        Returns:
+            Replayer: Use .frames, .elapsed and stop()
+        """
+        replayer = Replayer(self, path, speed=speed, start=start, end=end)
+        if blocking:
+            replayer.run()
+        else:
+            thread = threading.Thread(target=replayer.run, name='fcs-replay')
+            thread.daemon = True
+            thread.start()
+            replayer.thread = thread
+        return replayer
+
+    # ============================================
+    # Dispatch stage
+    # ============================================
+
+    def enable_watchdog(self, check_interval=1.0, multiplier=5.0, min_timeout=10.0,
+                        max_timeout=600.0, escalate_ratio=0.5, dedup=True):
+        """
+        Restart subscriptions whose stream stops, and drop repeated price frames.
+
+        A key silent for `multiplier` times its learned tick interval
+        (clamped to min_timeout..max_timeout) is resubscribed on its own;
+        when `escalate_ratio` of all keys are stale the connection is
+        restarted instead.
+
+        Args:
+            check_interval (float): Seconds between checks
+            multiplier (float): Expected intervals of silence before a key is stale
+            min_timeout (float): Min seconds of silence before a key is stale
+            max_timeout (float): Max stale timeout, including backoff after resubscribes
+            escalate_ratio (float): Fraction of stale keys that triggers a reconnect
+            dedup (bool): Drop price frames byte-identical to the key's previous frame
+
+        Returns:
+            Watchdog: Exposes on_stale, stale() and stats() (also client.watchdog)
+        """
+        self.disable_watchdog()
+        self.watchdog = Watchdog(self, check_interval=check_interval, multiplier=multiplier,
+                                 min_timeout=min_timeout, max_timeout=max_timeout,
+                                 escalate_ratio=escalate_ratio, dedup=dedup)
+        return self.watchdog
+
+    def disable_watchdog(self):
+        """Stop watching subscriptions and filtering duplicates."""
+        watchdog, self.watchdog = self.watchdog, None
+        if watchdog:
+            watchdog.stop()
+
+    def enable_dispatch(self, workers=1, maxsize=10000, policy='block'):
+        """
+        Run on_message on a worker pool behind a bounded queue.
+
+        The socket thread only decodes and enqueues, so a slow handler no
+        longer delays reads or ping/pong replies.
+
+        Args:
+            workers (int): Number of worker threads (1 keeps message order)
+            maxsize (int): Max queued messages
+            policy (str): Overflow policy - 'block', 'drop_oldest' or 'drop_newest'
+
+        With batching enabled, each batch is queued as one item and
+        on_batch runs on the workers too.
+
+        Returns:
+            Dispatcher: Exposes depth, dropped and stats()
+        """
+        self.disable_dispatch()
+        self.dispatcher = Dispatcher(
+            self._call_dispatched,
+            workers=workers,
+            maxsize=maxsize,
+            policy=policy,
+            on_error=self._handle_callback_error,
+        ).start()
+        return self.dispatcher
+
+    def disable_dispatch(self, drain=True, timeout=None):
+        """
+        Stop the dispatch stage and go back to calling on_message inline.
+
+        Args:
+            drain (bool): Deliver messages still in the queue before stopping
+            timeout (float, optional): Max seconds to wait for each worker
+        """
+        dispatcher, self.dispatcher = self.dispatcher, None
+        if dispatcher:
+            dispatcher.stop(drain=drain, timeout=timeout)
+
+    def enable_conflation(self, rate=10):
+        """
+        Deliver only the latest price per symbol/timeframe, at most `rate` times per second.
+
+        Price frames are held in a per-key slot that is overwritten in place
+        and flushed on a timer; other message types pass through immediately.
+
+        Args:
+            rate (float): Max deliveries per second per key (e.g. 10 for 10 Hz)
+
+        Returns:
+            Conflator: Exposes pending, conflated and stats()
+        """
+        self.disable_conflation(flush=False)
+        self.conflator = Conflator(
+            self._dispatch,
+            rate=rate,
+            on_error=self._handle_callback_error,
+        ).start()
+        return self.conflator
+
+    def disable_conflation(self, flush=True, timeout=None):
+        """
+        Stop conflating and deliver every price frame again.
+
+        Args:
+            flush (bool): Deliver slots that are still pending
+            timeout (float, optional): Max seconds to wait for the flusher thread
+        """
+        conflator, self.conflator = self.conflator, None
+        if conflator:
+            conflator.stop(flush=flush, timeout=timeout)
+
+    def enable_batching(self, size=500, interval=0.05, max_latency=None, columnar=False):
+        """
+        Deliver price frames to on_batch in batches instead of one on_message call each.
+
+        A batch is delivered when it holds `size` frames or `interval`
+        seconds after its first frame, and when the connection closes.
+        Other message types still go to on_message immediately. With
+        dispatch enabled, batches are queued to the dispatch workers (one
+        queue item per batch) instead of being handled on the cutting thread.
+
+        Args:
+            size (int): Max frames per batch
+            interval (float, optional): Time window per batch (None = by count only)
+            max_latency (float, optional): Max seconds any frame waits (default: interval)
+            columnar (bool): Deliver a dict of parallel lists ('symbol', 'c', 'a', ...)
+                to on_batch (frames still go to on_message one by one if no
+                on_batch handler is set)
+
+        Returns:
+            Batcher: Exposes pending and stats()
+        """
+        self.disable_batching(flush=True)
+        # Columns are built per delivery, so the frames stay available for
+        # the on_message fallback
+        self._batch_columnar = columnar
+        self.batcher = Batcher(
+            self._deliver_batch,
+            size=size,
+            interval=interval,
+            max_latency=max_latency,
+            on_error=self._handle_callback_error,
+        ).start()
+        return self.batcher
+
+    def disable_batching(self, flush=True, timeout=None):
+        """
+        Stop batching and deliver price frames to on_message again.
+
+        Args:
+            flush (bool): Deliver the open batch
+            timeout (float, optional): Max seconds to wait for the timer thread
+        """
+        batcher, self.batcher = self.batcher, None
+        if batcher:
+            batcher.stop(flush=flush, timeout=timeout)
+
     # ============================================
     # Subscription methods
     # ============================================
@@ -200,9 +906,16 @@ class FCSClient:
         """
         Subscribe to a symbol for real-time updates.
 
+        Joins made before the connection is ready are queued and sent after
+        the server's welcome message. Requests are sent in paced batches
+        (see client.subscriptions).
+
         Args:
             symbol (str): Symbol with exchange prefix (e.g., 'BINANCE:BTCUSDT', 'FX:EURUSD')
             timeframe (str): Timeframe (e.g., '1', '5', '15', '1H', '1D')
+
+        Returns:
+            Subscription: State record (pending/confirmed/failed/timed_out), or None if invalid
         """
         if not symbol or not timeframe:
             if self.show_logs:
@@ -214,7 +927,7 @@ class FCSClient:
                 print('[FCS] Symbol must include exchange prefix, e.g., "BINANCE:BTCUSDT"')
             return
 
-        self._send({'type': 'join_symbol', 'symbol': symbol, 'timeframe': timeframe})
+        return self.subscriptions.join(symbol, timeframe)
 
     def leave(self, symbol, timeframe):
         """
@@ -229,30 +942,47 @@ class FCSClient:
 
         key = f"{symbol.upper()}_{timeframe}"
         self.active_subscriptions.pop(key, None)
-        self._send({'type': 'leave_symbol', 'symbol': symbol, 'timeframe': timeframe})
+        self.subscriptions.leave(symbol, timeframe)
+        if self.metrics is not None:
+            self.metrics.remove_key(key)
 
     def remove_all(self):
         """Unsubscribe from all symbols."""
         self.active_subscriptions.clear()
-        self._send({'type': 'remove_all'})
+        self.subscriptions.remove_all()
+        if self.metrics is not None:
+            self.metrics.remove_key()
+        self._send(REMOVE_ALL)
+
+    def resubscribe(self, symbol, timeframe):
+        """
+        Send leave + join for one subscription to restart its stream.
+
+        Returns:
+            bool: False if not connected
+        """
+        return self.subscriptions.resubscribe(symbol, timeframe)
 
     def _rejoin_all(self):
-        """Rejoin all subscriptions after reconnect."""
-        for sub in self.active_subscriptions.values():
-            self._send({'type': 'join_symbol', 'symbol': sub['symbol'], 'timeframe': sub['timeframe']})
+        """Rejoin all subscriptions after (re)connect, in paced batches."""
+        self.subscriptions.on_welcome()
 
     # ============================================
     # Internal methods
     # ============================================
 
     def _send(self, data):
-        """Send data to WebSocket server."""
+        """Send a message (dict, or a pre-encoded string from fcs_wire) to the server."""
         if not self.socket or not self.is_connected:
+            if self.metrics is not None:
+                self.metrics.send_failures.inc(1, 'not_connected')
             return False
         try:
-            self.socket.send(json.dumps(data))
+            self.socket.send(encode(data))
             return True
         except Exception as e:
+            if self.metrics is not None:
+                self.metrics.send_failures.inc(1, 'error')
             if self.show_logs:
                 print(f'[FCS] Send error: {e}')
             return False
@@ -265,44 +995,230 @@ class FCSClient:
 
     def _handle_message(self, ws, message):
         """Handle incoming WebSocket message."""
+        for raw_listener in self._raw_listeners:
+            try:
+                raw_listener(message)
+            except Exception as e:
+                self._handle_callback_error(e)
+        capture = self.capture
+        if capture is not None:
+            capture.write(message)
+        decoder = self.decoder
+        metrics = self.metrics
+        profiler = self.profiler
+        sampled = profiler is not None and profiler.sample()
+        timed = sampled or metrics is not None
+        if timed:
+            started = time.perf_counter()
         try:
-            data = json.loads(message)
-        except json.JSONDecodeError as e:
+            data = decoder.decode(message)
+        except decoder.errors as e:
+            if metrics is not None:
+                metrics.decode_errors.inc()
             if self.show_logs:
                 print(f'[FCS] Invalid message from server: {e}')
             return
+        if timed:
+            decoded = time.perf_counter()
+            if metrics is not None:
+                metrics.observe_frame(data, frame_size(message), decoded - started)
+            if sampled:
+                profiler.record('decode', decoded - started, data)
+                decoded = time.perf_counter()
+
+        # Typed price frames skip the control-frame lookup entirely
+        if type(data) is not PriceTick:
+            handler = self._control_handlers.get(data.get('type'))
+            if handler is not None and handler(data):
+                if sampled:
+                    profiler.record('dispatch', time.perf_counter() - decoded, data)
+                    profiler.record('receive', time.perf_counter() - started, data)
+                return
+
+        if self._awaiting_first_tick:
+            self._track_recovery_tick(data)
+
+        watchdog = self.watchdog
+        if watchdog is not None and watchdog.on_frame(data, message):
+            return  # Byte-identical repeat of the key's previous price frame
+
+        if profiler is None:
+            for listener in self._listeners:
+                try:
+                    listener(data)
+                except Exception as e:
+                    self._handle_callback_error(e)
+        else:
+            self._run_listeners_profiled(data, profiler)
+
+        if sampled:
+            profiler.record('dispatch', time.perf_counter() - decoded, data)
+
+        self._deliver(data)
+
+        if sampled:
+            profiler.record('receive', time.perf_counter() - started, data)
+
+    def _run_listeners_profiled(self, data, profiler):
+        """Run listeners, timing each one for slow-handler detection."""
+        for listener in self._listeners:
+            started = time.perf_counter()
+            try:
+                listener(data)
+            except Exception as e:
+                self._handle_callback_error(e)
+            profiler.check_slow(listener, time.perf_counter() - started, data)
+
+    def _handle_ping(self, data):
+        """Answer server ping. Returns True (not passed to on_message)."""
+        now_ms = int(time.time() * 1000)
+        server_ts = data.get('timestamp')
+        if isinstance(server_ts, (int, float)):
+            self.server_clock_offset = now_ms - server_ts
+        self._send(encode_pong(now_ms))
+        return True
+
+    def _handle_pong(self, data):
+        """
+        Match a pong to our heartbeat ping and update RTT.
 
-        # Handle ping
-        if data.get('type') == 'ping':
-            self._send({'type': 'pong', 'timestamp': int(time.time() * 1000)})
-            return
+        Returns False, so the pong is still passed to on_message.
+        """
+        sent = self._pings_in_flight.pop(data.get('timestamp'), None)
+        if sent is not None:
+            sample = time.monotonic() - sent
+            self.rtt_last = sample
+            self.rtt = sample if self.rtt is None else self.rtt + 0.2 * (sample - self.rtt)
+            self.rtt_samples += 1
+        return False
+
+    def _handle_welcome(self, data):
+        """Handle welcome message. Returns True (not passed to on_message)."""
+        self.is_connected = True
+        self._track_recovery_welcome()
+        self.count_reconnects = 0
+        self._rejoin_all()
+        self._start_heartbeat()
 
-        # Handle welcome message
-        if data.get('type') == 'welcome':
-            self.is_connected = True
-            self.count_reconnects = 0
-            self._rejoin_all()
-            self._start_heartbeat()
-
-            if self.is_reconnect and callable(self._onreconnect):
-                self._onreconnect()
-            elif not self.is_reconnect and callable(self._onconnected):
-                self._onconnected()
+        if self.is_reconnect and callable(self._onreconnect):
+            self._onreconnect()
+        elif not self.is_reconnect and callable(self._onconnected):
+            self._onconnected()
+        return True
+
+    def _handle_control_message(self, data):
+        """
+        Handle subscription confirmation/rejection.
+
+        Returns False, so the message is still passed to on_message.
+        """
+        short = data.get('short')
+        symbol = data.get('symbol')
+        timeframe = data.get('timeframe')
+        if not short or not symbol or not timeframe:
+            return False
+
+        if short == 'joined_room':
+            key = f"{symbol.upper()}_{timeframe}"
+            self.active_subscriptions[key] = {'symbol': symbol, 'timeframe': timeframe}
+            self.subscriptions.on_confirmed(symbol, timeframe)
+            if self.show_logs:
+                print(f'[FCS] Subscribed to {symbol} {timeframe}')
+        elif any(word in short.lower() for word in ('error', 'fail', 'invalid', 'denied')):
+            self.subscriptions.on_failed(symbol, timeframe, data.get('message') or short)
+        return False
+
+    def _deliver(self, data):
+        """Hand a decoded message to the user, via conflation if enabled."""
+        conflator = self.conflator
+        if conflator is not None:
+            if type(data) is PriceTick:
+                conflator.submit(data.key, data)
+                return
+            if data.get('type') == 'price':
+                symbol = data.get('symbol')
+                timeframe = data.get('timeframe')
+                if symbol and timeframe:
+                    conflator.submit(f"{symbol.upper()}_{timeframe}", data)
+                    return
+        self._dispatch(data)
+
+    def _dispatch(self, data):
+        """Call on_message, via the batcher or dispatch queue if enabled."""
+        batcher = self.batcher
+        if batcher is not None and (type(data) is PriceTick or data.get('type') == 'price'):
+            batcher.submit(data)
             return
+        dispatcher = self.dispatcher
+        if dispatcher is not None:
+            dispatcher.submit(data)
+        else:
+            self._call_onmessage(data)
 
-        # Handle subscription confirmation
-        if data.get('type') == 'message' and data.get('short') == 'joined_room':
-            symbol = data.get('symbol')
-            timeframe = data.get('timeframe')
-            if symbol and timeframe:
-                key = f"{symbol.upper()}_{timeframe}"
-                self.active_subscriptions[key] = {'symbol': symbol, 'timeframe': timeframe}
-                if self.show_logs:
-                    print(f'[FCS] Subscribed to {symbol} {timeframe}')
+    def _deliver_batch(self, batch):
+        """Batcher callback: hand a batch to the dispatch queue if enabled."""
+        dispatcher = self.dispatcher
+        if dispatcher is not None:
+            dispatcher.submit(batch)
+        else:
+            self._call_onbatch(batch)
 
-        # Call user's message handler
-        if callable(self._onmessage):
-            self._onmessage(data)
+    def _call_dispatched(self, item):
+        """Dispatcher handler: a batch (list) from the batcher, else one message."""
+        if type(item) is list:
+            self._call_onbatch(item)
+        else:
+            self._call_onmessage(item)
+
+    def _call_onmessage(self, data):
+        """Call user's message handler, then routed handlers for the message."""
+        func = self._onmessage
+        if callable(func):
+            self._call_handler(func, data)
+
+        router = self.router
+        if router.routes:
+            for handler in router.handlers(data):
+                try:
+                    self._call_handler(handler, data)
+                except Exception as e:
+                    self._handle_callback_error(e)
+
+    def _call_onbatch(self, batch):
+        """Call the batch handler; without one, fall back to per-frame on_message."""
+        func = self._onbatch
+        if callable(func):
+            self._call_handler(func, to_columns(batch) if self._batch_columnar else batch)
+            return
+        for data in batch:
+            self._call_onmessage(data)
+
+    def _call_handler(self, func, data):
+        """Call one message handler, timed when metrics or profiling are enabled."""
+        metrics = self.metrics
+        profiler = self.profiler
+        if metrics is None and profiler is None:
+            func(data)
+            return
+
+        started = time.perf_counter()
+        try:
+            func(data)
+        finally:
+            elapsed = time.perf_counter() - started
+            if metrics is not None:
+                metrics.callback_time.observe(elapsed)
+            if profiler is not None:
+                profiler.check_slow(func, elapsed, data)
+                if profiler.sample_callback():
+                    profiler.record('callback', elapsed, data)
+
+    def _handle_callback_error(self, error):
+        """Report an exception raised by a handler or timer outside the socket callbacks."""
+        if self.show_logs:
+            print(f'[FCS] Callback error: {error}')
+        if callable(self._onerror):
+            self._onerror(error)
 
     def _handle_error(self, ws, error):
         """Handle WebSocket error."""
@@ -312,59 +1228,139 @@ class FCSClient:
             self._onerror(error)
 
     def _handle_close(self, ws, close_status_code, close_msg):
-        """Handle WebSocket close."""
+        """Handle WebSocket close. Reconnecting is left to the supervisor loop."""
         if self.show_logs:
             print(f'[FCS] Disconnected. Code: {close_status_code}, Reason: {close_msg}')
         self.is_connected = False
-        self._stop_heartbeat = True
+        self._stop_heartbeat()
+        self.subscriptions.on_disconnect()
+        if self.batcher is not None:
+            self.batcher.flush()
+        if not self.manual_close and self._closed_at is None:
+            self._closed_at = time.time()
 
         if callable(self._onclose):
             self._onclose(close_status_code, close_msg)
 
-        # Auto-reconnect (like JS version)
-        if not self.manual_close and self.count_reconnects < self.reconnect_limit:
+    # ============================================
+    # Supervisor and recovery tracking
+    # ============================================
+
+    def _supervise(self):
+        """Run the socket, and reconnect with backoff until stopped."""
+        self._wake.clear()
+        while True:
+            self.socket.run()
+
+            if self.manual_close:
+                break
+            if self.reconnect_limit is not None and self.count_reconnects >= self.reconnect_limit:
+                if self.show_logs:
+                    print(f'[FCS] Reconnect limit reached ({self.reconnect_limit}), giving up')
+                break
+
             self.count_reconnects += 1
+            if self.metrics is not None:
+                self.metrics.reconnects.inc()
             self.is_reconnect = True
+            delay = self._backoff_delay(self.count_reconnects)
             if self.show_logs:
-                print(f'[FCS] Reconnecting in {self.reconnect_delay}s... (attempt {self.count_reconnects}/{self.reconnect_limit})')
-            time.sleep(self.reconnect_delay)
+                limit = self.reconnect_limit if self.reconnect_limit is not None else 'unlimited'
+                print(f'[FCS] Reconnecting in {delay:.2f}s... '
+                      f'(attempt {self.count_reconnects}/{limit})')
+
+            if self._wake.wait(delay) or self.manual_close:
+                break
             self.connect()
-            self.run_forever()
 
-    def _start_heartbeat(self):
-        """Start heartbeat to keep connection alive."""
-        self._stop_heartbeat = False
+    def _backoff_delay(self, attempt):
+        """Delay before reconnect attempt number `attempt` (1-based)."""
+        return backoff_delay(attempt, self.reconnect_first_delay, self.reconnect_delay,
+                             self.reconnect_max_delay, self.reconnect_jitter)
+
+    def _track_recovery_welcome(self):
+        """Start timing first ticks once a reconnect has been welcomed."""
+        if self._closed_at is None:
+            return
+        now = time.time()
+        self.last_recovery = {
+            'closed_at': self._closed_at,
+            'welcome_at': now,
+            'time_to_welcome': now - self._closed_at,
+            'attempts': self.count_reconnects,
+            'first_tick': {},  # key -> seconds from close to first price
+            'time_to_all_ticks': None,
+        }
+        self._closed_at = None
+        self._awaiting_first_tick = set(self.active_subscriptions) or None
+
+    def _track_recovery_tick(self, data):
+        """Record the first price per key after a reconnect."""
+        if type(data) is PriceTick:
+            key = data.key
+        elif data.get('type') == 'price' and data.get('symbol'):
+            key = f"{data['symbol'].upper()}_{data.get('timeframe')}"
+        else:
+            return
 
-        def heartbeat():
-            while not self._stop_heartbeat and self.is_connected:
-                self._send({'type': 'ping', 'timestamp': int(time.time() * 1000)})
-                time.sleep(25)  # 25000ms in JS
+        awaiting = self._awaiting_first_tick
+        recovery = self.last_recovery
+        if key not in awaiting or recovery is None:
+            return
+        awaiting.discard(key)
+        elapsed = time.time() - recovery['closed_at']
+        recovery['first_tick'][key] = elapsed
+        if not awaiting:
+            recovery['time_to_all_ticks'] = elapsed
+            self._awaiting_first_tick = None
+            if self.show_logs:
+                count = len(recovery['first_tick'])
+                print(f'[FCS] Recovered {count} subscriptions in {elapsed:.2f}s')
 
-        self._heartbeat_thread = threading.Thread(target=heartbeat)
-        self._heartbeat_thread.daemon = True
-        self._heartbeat_thread.start()
+    def _start_heartbeat(self):
+        """Start heartbeat on the shared scheduler to keep connection alive."""
+        self._stop_heartbeat()
+        self._pings_in_flight.clear()
+        self.heartbeat = get_scheduler().call_every(
+            self.heartbeat_interval, self._send_heartbeat, delay=0, worker=self.io_worker
+        )
+
+    def _send_heartbeat(self):
+        """Send one heartbeat ping (runs on the client's io_worker thread)."""
+        if not self.is_connected:
+            self._stop_heartbeat()
+            return
+        timestamp = int(time.time() * 1000)
+        # Only the last few pings can still be answered; drop older ones
+        if len(self._pings_in_flight) >= 4:
+            self._pings_in_flight.clear()
+        self._pings_in_flight[timestamp] = time.monotonic()
+        self._send(encode_ping(timestamp))
 
-    def _stop_heartbeat_thread(self):
-        """Stop heartbeat thread."""
-        self._stop_heartbeat = True
+    def _stop_heartbeat(self):
+        """Stop heartbeat."""
+        heartbeat, self.heartbeat = self.heartbeat, None
+        if heartbeat is not None:
+            heartbeat.cancel()
 
 
 # ============================================
 # Module exports (like JS module.exports)
 # ============================================
 
-def create_client(api_key, url=None):
+def create_client(api_key, url=None, transport=None):
     """
     Create FCS WebSocket client.
 
     Args:
         api_key (str): Your FCS API key
         url (str, optional): WebSocket server URL
+        transport (str or callable, optional): Transport name or factory (see fcs_transport)
 
     Returns:
         FCSClient: Client instance
     """
-    return FCSClient(api_key, url)
+    return FCSClient(api_key, url, transport)
 
 
 # For direct execution test
@@ -0,0 +1,160 @@
+"""
+FCS conflation stage
+
+Keeps one latest-value slot per subscription key and flushes the slots to a
+callback at a fixed maximum rate, so downstream work is bounded by the number
+of symbols instead of the feed volume.
+
+Usage:
+    from fcs_client_lib import FCSClient
+
+    client = FCSClient('YOUR_API_KEY')
+    client.enable_conflation(rate=10)  # at most 10 updates/sec per symbol+timeframe
+"""
+
+import threading
+
+from fcs_decoder import PriceTick
+
+
+def _copy(data):
+    """
+    Copy a frame before it goes into a slot, so merging later frames into the
+    slot never changes the object other listeners and handlers already got.
+    """
+    if type(data) is PriceTick:
+        return data.copy()
+    data = dict(data)
+    prices = data.get('prices')
+    if isinstance(prices, dict):
+        data['prices'] = dict(prices)
+    return data
+
+
+class Conflator:
+    """
+    Per-key latest-value slots flushed on a timer.
+
+    Successive price frames for the same key are merged field by field into
+    the pending slot, so an 'askbid' update does not erase OHLCV from an
+    earlier 'candle' update within the same interval. Slots hold copies; the
+    submitted frames themselves are never modified.
+    """
+
+    def __init__(self, deliver, rate=10, on_error=None):
+        """
+        Initialize conflator.
+
+        Args:
+            deliver (callable): Called with each flushed message on the flusher thread
+            rate (float): Max deliveries per second per key
+            on_error (callable, optional): Called with the exception if deliver raises
+        """
+        if rate <= 0:
+            raise ValueError('rate must be > 0')
+
+        self.deliver = deliver
+        self.rate = rate
+        self.interval = 1.0 / rate
+        self.on_error = on_error
+
+        # Counters
+        self.received = 0
+        self.conflated = 0
+        self.flushed = 0
+
+        self._slots = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def pending(self):
+        """Number of keys waiting for the next flush."""
+        return len(self._slots)
+
+    def start(self):
+        """Start the flusher thread. Returns self for chaining."""
+        if self._thread and self._thread.is_alive():
+            return self
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='fcs-conflation')
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self, flush=True, timeout=None):
+        """
+        Stop the flusher thread.
+
+        Args:
+            flush (bool): Deliver slots that are still pending
+            timeout (float, optional): Max seconds to wait for the thread
+        """
+        self._stop_event.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+        if flush:
+            self.flush()
+        else:
+            with self._lock:
+                self._slots = {}
+
+    def submit(self, key, data):
+        """
+        Store a price message in its key's slot, merging with a pending one.
+
+        Args:
+            key (str): Subscription key, e.g. 'BINANCE:BTCUSDT_1D'
+            data (dict or PriceTick): Decoded price message
+        """
+        with self._lock:
+            self.received += 1
+            slot = self._slots.get(key)
+            if slot is None:
+                self._slots[key] = _copy(data)
+                return
+            self.conflated += 1
+            if type(slot) is PriceTick and type(data) is PriceTick:
+                slot.merge(data)
+                return
+            prices = data.get('prices')
+            if (
+                isinstance(prices, dict)
+                and type(slot) is dict
+                and isinstance(slot.get('prices'), dict)
+            ):
+                slot['prices'].update(prices)
+            else:
+                self._slots[key] = _copy(data)
+
+    def flush(self):
+        """Deliver all pending slots now."""
+        with self._lock:
+            if not self._slots:
+                return
+            slots, self._slots = self._slots, {}
+
+        for data in slots.values():
+            try:
+                self.deliver(data)
+            except Exception as e:
+                if callable(self.on_error):
+                    self.on_error(e)
+        self.flushed += len(slots)
+
+    def stats(self):
+        """Snapshot of counters as a dict."""
+        return {
+            'rate': self.rate,
+            'pending': self.pending,
+            'received': self.received,
+            'conflated': self.conflated,
+            'flushed': self.flushed,
+        }
+
+    def _run(self):
+        """Flusher loop."""
+        while not self._stop_event.wait(self.interval):
+            self.flush()
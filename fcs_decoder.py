@@ -0,0 +1,306 @@
+"""
+FCS message decoders
+
+Pluggable JSON decoding for incoming frames. Uses orjson or msgspec when
+installed and falls back to the stdlib json module. In typed mode, 'price'
+frames are decoded into compact PriceTick objects instead of nested dicts.
+
+Usage:
+    from fcs_client_lib import FCSClient
+
+    client = FCSClient('YOUR_API_KEY')
+    client.set_decoder('auto', typed=True)
+
+    @client.on_message
+    def handle(tick):
+        if tick.type == 'price':
+            print(tick.symbol, tick.c)
+
+Install (optional):
+    pip install orjson   # or: pip install msgspec
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+# Fields of a price frame's "prices" object, in PriceTick order
+PRICE_FIELDS = ('mode', 't', 'o', 'h', 'l', 'c', 'v', 'a', 'b')
+
+
+class PriceTick:
+    """
+    Compact price update.
+
+    Attribute access (tick.c, tick.symbol) is the fast path. For handlers
+    written against the dict format, tick.get('type'), tick['symbol'] and
+    tick['prices'] also work. Ticks compare equal field by field and, being
+    mutable, are not hashable: key dicts and sets by tick.key instead.
+    """
+
+    __slots__ = ('symbol', 'timeframe', 'mode', 't', 'o', 'h', 'l', 'c', 'v', 'a', 'b')
+
+    type = 'price'
+
+    def __init__(
+        self,
+        symbol,
+        timeframe,
+        mode=None,
+        t=None,
+        o=None,
+        h=None,
+        l=None,
+        c=None,
+        v=None,
+        a=None,
+        b=None,
+    ):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.mode = mode
+        self.t = t
+        self.o = o
+        self.h = h
+        self.l = l
+        self.c = c
+        self.v = v
+        self.a = a
+        self.b = b
+
+    @classmethod
+    def from_message(cls, data):
+        """
+        Build a PriceTick from a decoded 'price' message dict.
+
+        Args:
+            data (dict): {'type': 'price', 'symbol': ..., 'timeframe': ..., 'prices': {...}}
+        """
+        p = data.get('prices') or {}
+        return cls(
+            data.get('symbol'),
+            data.get('timeframe'),
+            p.get('mode'),
+            p.get('t'),
+            p.get('o'),
+            p.get('h'),
+            p.get('l'),
+            p.get('c'),
+            p.get('v'),
+            p.get('a'),
+            p.get('b'),
+        )
+
+    @property
+    def key(self):
+        """Subscription key, same format as FCSClient.active_subscriptions."""
+        return f"{self.symbol.upper()}_{self.timeframe}"
+
+    @property
+    def prices(self):
+        """Price fields as a dict (omits fields the frame did not carry)."""
+        prices = {}
+        for name in PRICE_FIELDS:
+            value = getattr(self, name)
+            if value is not None:
+                prices[name] = value
+        return prices
+
+    def merge(self, other):
+        """Overwrite fields with the ones `other` carries (None means not present)."""
+        for name in PRICE_FIELDS:
+            value = getattr(other, name)
+            if value is not None:
+                setattr(self, name, value)
+
+    def copy(self):
+        """Independent PriceTick with the same fields."""
+        return PriceTick(
+            self.symbol,
+            self.timeframe,
+            self.mode,
+            self.t,
+            self.o,
+            self.h,
+            self.l,
+            self.c,
+            self.v,
+            self.a,
+            self.b,
+        )
+
+    def to_dict(self):
+        """Convert back to the dict message format."""
+        return {
+            'type': 'price',
+            'symbol': self.symbol,
+            'timeframe': self.timeframe,
+            'prices': self.prices,
+        }
+
+    def get(self, name, default=None):
+        """Dict-style access for 'type', 'symbol', 'timeframe' and 'prices'."""
+        if name == 'type':
+            return 'price'
+        if name in ('symbol', 'timeframe'):
+            return getattr(self, name)
+        if name == 'prices':
+            return self.prices
+        return default
+
+    def __getitem__(self, name):
+        if name not in ('type', 'symbol', 'timeframe', 'prices'):
+            raise KeyError(name)
+        return self.get(name)
+
+    # Ticks are mutable (merge()), so they compare by value and are unhashable
+    __hash__ = None
+
+    def __eq__(self, other):
+        if not isinstance(other, PriceTick):
+            return NotImplemented
+        return all(getattr(self, n) == getattr(other, n) for n in self.__slots__)
+
+    def __repr__(self):
+        return (
+            f'PriceTick({self.symbol!r}, {self.timeframe!r}, mode={self.mode!r}, '
+            f't={self.t!r}, c={self.c!r}, a={self.a!r}, b={self.b!r})'
+        )
+
+
+def as_tick(data):
+    """
+    Return a PriceTick for a price message (dict or PriceTick), else None.
+
+    Lets components accept messages from both plain and typed decoders.
+    """
+    if type(data) is PriceTick:
+        return data
+    if isinstance(data, dict) and data.get('type') == 'price':
+        return PriceTick.from_message(data)
+    return None
+
+
+if msgspec is not None:
+    from typing import Literal, Union
+
+    # int listed before float so integer t/v stay ints, as with json and orjson
+    _Number = Union[int, float, str, None]
+
+    class _Prices(msgspec.Struct):
+        mode: Union[str, None] = None
+        t: _Number = None
+        o: _Number = None
+        h: _Number = None
+        l: _Number = None  # noqa: E741
+        c: _Number = None
+        v: _Number = None
+        a: _Number = None
+        b: _Number = None
+
+    class _PriceFrame(msgspec.Struct):
+        type: Literal['price']
+        symbol: str
+        timeframe: str
+        prices: _Prices
+
+
+class Decoder:
+    """
+    JSON decoder for FCS frames.
+
+    Attributes:
+        backend (str): 'orjson', 'msgspec' or 'json'
+        typed (bool): Decode 'price' frames into PriceTick objects
+        errors (tuple): Exception types raised for malformed frames
+    """
+
+    def __init__(self, backend='auto', typed=False):
+        """
+        Initialize decoder.
+
+        Args:
+            backend (str): 'auto' (fastest installed), 'orjson', 'msgspec' or 'json'
+            typed (bool): Decode 'price' frames into PriceTick objects. Costs more
+                CPU per frame than plain dicts; least with msgspec, which 'auto'
+                then prefers
+        """
+        if backend == 'auto':
+            if typed:
+                # msgspec decodes price frames straight into a struct; the other
+                # backends build a dict first and convert it
+                backend = 'msgspec' if msgspec else 'orjson' if orjson else 'json'
+            else:
+                backend = 'orjson' if orjson else 'msgspec' if msgspec else 'json'
+
+        self.backend = backend
+        self.typed = typed
+        self._price_decoder = None
+
+        if backend == 'orjson':
+            if orjson is None:
+                raise ImportError("Please install orjson: pip install orjson")
+            self._loads = orjson.loads
+            self.errors = (ValueError,)
+        elif backend == 'msgspec':
+            if msgspec is None:
+                raise ImportError("Please install msgspec: pip install msgspec")
+            self._loads = msgspec.json.Decoder().decode
+            self.errors = (ValueError, msgspec.DecodeError)
+            if typed:
+                self._price_decoder = msgspec.json.Decoder(_PriceFrame).decode
+        elif backend == 'json':
+            self._loads = json.loads
+            self.errors = (ValueError,)
+        else:
+            raise ValueError(f'Unknown decoder backend: {backend}')
+
+        self.decode = self._decode_typed if typed else self._loads
+
+    def _decode_typed(self, message):
+        """Decode a frame, turning 'price' frames into PriceTick."""
+        if self._price_decoder is not None and _has_price_type(message):
+            try:
+                frame = self._price_decoder(message)
+            except self.errors:
+                pass
+            else:
+                p = frame.prices
+                return PriceTick(
+                    frame.symbol, frame.timeframe, p.mode, p.t, p.o, p.h, p.l, p.c, p.v, p.a, p.b
+                )
+
+        data = self._loads(message)
+        if type(data) is dict and data.get('type') == 'price':
+            return PriceTick.from_message(data)
+        return data
+
+
+def _has_price_type(message):
+    """Cheap pre-check before attempting a strict price-frame decode."""
+    if isinstance(message, str):
+        return '"price"' in message
+    return b'"price"' in message
+
+
+def get_decoder(backend='auto', typed=False):
+    """
+    Create a decoder.
+
+    Args:
+        backend (str): 'auto', 'orjson', 'msgspec' or 'json'
+        typed (bool): Decode 'price' frames into PriceTick objects
+
+    Returns:
+        Decoder: Decoder instance
+    """
+    return Decoder(backend, typed)
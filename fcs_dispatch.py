@@ -0,0 +1,175 @@
+"""
+FCS dispatch stage
+
+Bounded queue plus a pool of worker threads that sits between the socket
+receive thread and the user's message handler, so a slow handler never
+stalls reading the socket.
+
+Usage:
+    from fcs_client_lib import FCSClient
+
+    client = FCSClient('YOUR_API_KEY')
+    client.enable_dispatch(workers=4, maxsize=10000, policy='drop_oldest')
+
+    print(client.dispatcher.depth, client.dispatcher.dropped)
+"""
+
+import threading
+from collections import deque
+
+# Overflow policies
+BLOCK = 'block'
+DROP_OLDEST = 'drop_oldest'
+DROP_NEWEST = 'drop_newest'
+
+POLICIES = (BLOCK, DROP_OLDEST, DROP_NEWEST)
+
+
+class Dispatcher:
+    """
+    Bounded FIFO queue drained by a pool of worker threads.
+
+    With more than one worker, messages are handled concurrently and may
+    complete out of order. Use workers=1 when per-symbol ordering matters.
+    """
+
+    def __init__(self, handler, workers=1, maxsize=10000, policy=BLOCK, on_error=None):
+        """
+        Initialize dispatcher.
+
+        Args:
+            handler (callable): Called with each queued item on a worker thread
+            workers (int): Number of worker threads
+            maxsize (int): Max queued items before the overflow policy applies
+            policy (str): 'block', 'drop_oldest' or 'drop_newest'
+            on_error (callable, optional): Called with the exception if handler raises
+        """
+        if policy not in POLICIES:
+            raise ValueError(f'Unknown overflow policy: {policy}')
+        if workers < 1 or maxsize < 1:
+            raise ValueError('workers and maxsize must be >= 1')
+
+        self.handler = handler
+        self.workers = workers
+        self.maxsize = maxsize
+        self.policy = policy
+        self.on_error = on_error
+
+        # Counters (read without locking; values are ints)
+        self.submitted = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.high_watermark = 0
+
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._threads = []
+        self._running = False
+
+    @property
+    def depth(self):
+        """Number of items currently waiting in the queue."""
+        return len(self._queue)
+
+    def start(self):
+        """Start worker threads. Returns self for chaining."""
+        with self._lock:
+            if self._running:
+                return self
+            self._running = True
+
+        self._threads = []
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f'fcs-dispatch-{i}')
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, drain=True, timeout=None):
+        """
+        Stop worker threads.
+
+        Args:
+            drain (bool): If True, workers finish queued items first; otherwise they are discarded.
+            timeout (float, optional): Max seconds to wait for each worker to exit.
+        """
+        with self._lock:
+            self._running = False
+            if not drain:
+                self.dropped += len(self._queue)
+                self._queue.clear()
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout)
+        self._threads = []
+
+    def submit(self, item):
+        """
+        Queue an item for the workers.
+
+        Returns:
+            bool: False if the item was dropped (queue full under 'drop_newest', or stopped)
+        """
+        with self._lock:
+            if not self._running:
+                return False
+
+            if len(self._queue) >= self.maxsize:
+                if self.policy == DROP_NEWEST:
+                    self.dropped += 1
+                    return False
+                if self.policy == DROP_OLDEST:
+                    self._queue.popleft()
+                    self.dropped += 1
+                else:
+                    while len(self._queue) >= self.maxsize and self._running:
+                        self._not_full.wait()
+                    if not self._running:
+                        return False
+
+            self._queue.append(item)
+            self.submitted += 1
+            depth = len(self._queue)
+            if depth > self.high_watermark:
+                self.high_watermark = depth
+            self._not_empty.notify()
+            return True
+
+    def stats(self):
+        """Snapshot of queue counters as a dict."""
+        return {
+            'depth': self.depth,
+            'maxsize': self.maxsize,
+            'policy': self.policy,
+            'workers': self.workers,
+            'submitted': self.submitted,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'high_watermark': self.high_watermark,
+        }
+
+    def _worker(self):
+        """Worker loop: pop items and run the handler until stopped and drained."""
+        while True:
+            with self._lock:
+                while not self._queue and self._running:
+                    self._not_empty.wait()
+                if not self._queue:
+                    return
+                item = self._queue.popleft()
+                self._not_full.notify()
+
+            try:
+                self.handler(item)
+            except Exception as e:
+                if callable(self.on_error):
+                    self.on_error(e)
+            finally:
+                with self._lock:
+                    self.delivered += 1
@@ -0,0 +1,243 @@
+"""
+FCS tick history
+
+Fixed-capacity columnar ring buffers, one per subscription key, with
+least-recently-updated eviction so memory stays predictable when tracking
+thousands of instruments.
+
+Usage:
+    from fcs_client_lib import FCSClient
+
+    client = FCSClient('YOUR_API_KEY')
+    history = client.enable_history(capacity=256, max_keys=2000)
+
+    closes = history.last('BINANCE:BTCUSDT', '1D', 100, 'c')  # NumPy view if installed
+
+Install (optional, for NumPy views):
+    pip install numpy
+"""
+
+import threading
+import time
+from array import array
+from collections import OrderedDict
+
+from fcs_decoder import as_tick
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# Columns stored per tick
+COLUMNS = ('t', 'o', 'h', 'l', 'c', 'v', 'a', 'b')
+
+_NAN = float('nan')
+
+
+def _to_float(value):
+    """Convert a price field to float; returns None for missing or invalid values."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class TickRing:
+    """
+    Preallocated columnar ring buffer of float64 ticks.
+
+    Every value is written twice, at slot i and slot i + capacity, so the
+    last N ticks are always one contiguous slice. That is what makes
+    last() zero-copy, at the price of 2x storage.
+
+    Fields missing from an update (e.g. OHLC in an 'askbid' frame) carry
+    forward the previous value.
+    """
+
+    __slots__ = ('capacity', 'count', 'head', 'updated', 'columns', '_last')
+
+    def __init__(self, capacity):
+        """
+        Initialize ring buffer.
+
+        Args:
+            capacity (int): Max ticks kept
+        """
+        if capacity < 1:
+            raise ValueError('capacity must be >= 1')
+        self.capacity = capacity
+        self.count = 0
+        self.head = 0  # Next write slot in [0, capacity)
+        self.updated = 0.0
+        self.columns = {name: array('d', [_NAN]) * (2 * capacity) for name in COLUMNS}
+        self._last = dict.fromkeys(COLUMNS, _NAN)
+
+    def append(self, tick):
+        """
+        Append one tick.
+
+        Args:
+            tick (PriceTick): Price update
+        """
+        head = self.head
+        mirror = head + self.capacity
+        last = self._last
+        columns = self.columns
+        for name in COLUMNS:
+            value = _to_float(getattr(tick, name))
+            if value is None:
+                value = last[name]
+            else:
+                last[name] = value
+            column = columns[name]
+            column[head] = value
+            column[mirror] = value
+
+        self.head = head + 1 if head + 1 < self.capacity else 0
+        if self.count < self.capacity:
+            self.count += 1
+        self.updated = time.time()
+
+    def last(self, n=None, column='c'):
+        """
+        Last n values of a column, oldest first, without copying.
+
+        The result shares memory with the buffer, so it reflects later writes
+        once the ring wraps over those slots. Copy it if you need to keep it.
+
+        Args:
+            n (int, optional): Number of ticks (default: all stored)
+            column (str): One of 't', 'o', 'h', 'l', 'c', 'v', 'a', 'b'
+
+        Returns:
+            numpy.ndarray (read-only) if NumPy is installed, else memoryview
+        """
+        if column not in self.columns:
+            raise KeyError(column)
+        if n is None or n > self.count:
+            n = self.count
+        end = self.head + self.capacity
+        start = end - n
+
+        if numpy is not None:
+            view = numpy.frombuffer(self.columns[column], dtype=numpy.float64)[start:end]
+            view.flags.writeable = False
+            return view
+        return memoryview(self.columns[column]).toreadonly()[start:end]
+
+    def nbytes(self):
+        """Bytes used by the column storage."""
+        return sum(col.itemsize * len(col) for col in self.columns.values())
+
+
+class TickHistory:
+    """
+    Per-key tick history with bounded memory.
+
+    Holds at most max_keys ring buffers. When a new key arrives and the store
+    is full, the key that has gone longest without an update is evicted.
+    Writes come from the client's receive thread; reads may happen on any thread.
+    """
+
+    def __init__(self, capacity=256, max_keys=1000):
+        """
+        Initialize history store.
+
+        Args:
+            capacity (int): Ticks kept per key
+            max_keys (int): Max keys tracked before least-recently-updated eviction
+        """
+        if max_keys < 1:
+            raise ValueError('max_keys must be >= 1')
+        self.capacity = capacity
+        self.max_keys = max_keys
+        self.evicted = 0
+        self._rings = OrderedDict()
+        self._lock = threading.Lock()
+
+    def on_message(self, data):
+        """Client listener: record price messages, ignore everything else."""
+        tick = as_tick(data)
+        if tick is not None and tick.symbol and tick.timeframe:
+            self.append(tick)
+
+    def append(self, tick):
+        """
+        Append a tick to its key's ring buffer.
+
+        Args:
+            tick (PriceTick): Price update
+        """
+        key = tick.key
+        with self._lock:
+            ring = self._rings.get(key)
+            if ring is None:
+                ring = TickRing(self.capacity)
+                self._rings[key] = ring
+                if len(self._rings) > self.max_keys:
+                    self._rings.popitem(last=False)
+                    self.evicted += 1
+            else:
+                self._rings.move_to_end(key)
+        ring.append(tick)
+
+    def ring(self, symbol, timeframe):
+        """Ring buffer for a symbol/timeframe, or None if not tracked."""
+        return self._rings.get(f"{symbol.upper()}_{timeframe}")
+
+    def last(self, symbol, timeframe, n=None, column='c'):
+        """
+        Last n values of a column for a symbol/timeframe (see TickRing.last).
+
+        Returns None if the key is not tracked.
+        """
+        ring = self.ring(symbol, timeframe)
+        if ring is None:
+            return None
+        return ring.last(n, column)
+
+    def keys(self):
+        """Tracked keys, least recently updated first."""
+        with self._lock:
+            return list(self._rings)
+
+    def evict_idle(self, max_age):
+        """
+        Drop keys with no update in the last max_age seconds.
+
+        Returns:
+            int: Number of keys evicted
+        """
+        cutoff = time.time() - max_age
+        removed = 0
+        with self._lock:
+            # Oldest updates sit at the front of the OrderedDict
+            while self._rings:
+                key, ring = next(iter(self._rings.items()))
+                if ring.updated >= cutoff:
+                    break
+                del self._rings[key]
+                removed += 1
+        self.evicted += removed
+        return removed
+
+    def clear(self):
+        """Drop all history."""
+        with self._lock:
+            self._rings.clear()
+
+    def nbytes(self):
+        """Total bytes used by column storage."""
+        with self._lock:
+            rings = list(self._rings.values())
+        return sum(ring.nbytes() for ring in rings)
+
+    def __len__(self):
+        return len(self._rings)
+
+    def __contains__(self, key):
+        return key in self._rings
@@ -0,0 +1,445 @@
+"""
+FCS indicator engine
+
+Spread, mid, EMA, rolling VWAP and last-tick return for many symbols at
+once, kept in NumPy arrays indexed by slot (one slot per symbol/timeframe).
+
+Ticks are only queued when they arrive. Every `batch_size` ticks, or every
+`interval` seconds, the queue is converted to one array and all indicators
+are updated with a handful of vectorized operations, so the per-tick cost
+on the receive thread is a dict lookup and a deque append.
+
+Usage:
+    from fcs_client_lib import FCSClient
+
+    client = FCSClient('YOUR_API_KEY')
+    engine = client.enable_indicators(ema_periods=(20, 50), vwap_window=200)
+
+    @engine.on_update
+    def updated(engine, slots):
+        spreads = engine.view('spread_pips')   # read-only, indexed by slot
+        ema20 = engine.view('ema', 20)
+
+    engine.get('FX:EURUSD', '1')               # dict of current values
+
+Indicator definitions:
+    price        mid ((ask + bid) / 2) when the frame has ask/bid, else close
+    spread       ask - bid;  spread_pips = spread / pip size
+    ema          per-tick EMA of price, alpha = 2 / (period + 1)
+    vwap         sum(close * traded) / sum(traded) over the last `vwap_window`
+                 candle updates; traded volume is the increase of the
+                 candle's cumulative volume (the full volume on a new candle)
+    ret          price / previous price - 1 for the latest tick
+
+Install:
+    pip install numpy
+"""
+
+import threading
+import time
+from collections import deque
+
+from fcs_decoder import PriceTick
+from fcs_scheduler import Worker, get_scheduler
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# Per-slot float arrays exposed through view()
+FIELDS = (
+    'price',
+    'bid',
+    'ask',
+    'spread',
+    'spread_pips',
+    'vwap',
+    'ret',
+    'volume',
+    'count',
+    'updated',
+    'pip',
+)
+
+# Columns of a queued tick row
+_SLOT, _T, _C, _V, _A, _B = range(6)
+
+
+def default_pip_size(symbol):
+    """Pip size guess from the symbol: 0.01 for JPY pairs, else 0.0001."""
+    return 0.01 if 'JPY' in symbol.upper() else 0.0001
+
+
+def _groups(slots):
+    """
+    Sort rows by slot (stable) and describe the runs of equal slots.
+
+    Returns:
+        tuple: (order, first, last, rank, length) - sort order, masks of the
+            first and last row of each run, position inside the run and run
+            length per row, all in sorted order
+    """
+    order = numpy.argsort(slots, kind='stable')
+    s = slots[order]
+    n = len(s)
+    first = numpy.empty(n, dtype=bool)
+    first[0] = True
+    numpy.not_equal(s[1:], s[:-1], out=first[1:])
+    last = numpy.empty(n, dtype=bool)
+    last[-1] = True
+    last[:-1] = first[1:]
+    index = numpy.arange(n)
+    start = numpy.maximum.accumulate(numpy.where(first, index, 0))
+    end = numpy.minimum.accumulate(numpy.where(last, index, n - 1)[::-1])[::-1]
+    return order, first, last, index - start, end - start + 1
+
+
+class IndicatorEngine:
+    """
+    Micro-batched, vectorized indicators for every subscribed symbol.
+
+    Arrays grow (doubling) as new keys appear; re-fetch views after that,
+    old views keep pointing at the previous arrays.
+
+    Attributes:
+        ticks (int): Ticks applied
+        batches (int): Batches applied
+        last_batch_ms (float): Time spent applying the last batch
+    """
+
+    def __init__(
+        self,
+        ema_periods=(20,),
+        vwap_window=100,
+        batch_size=256,
+        interval=0.05,
+        capacity=256,
+        pip_size=None,
+        on_error=None,
+        worker=None,
+    ):
+        """
+        Initialize engine.
+
+        Args:
+            ema_periods (tuple): EMA periods in ticks
+            vwap_window (int): Candle updates in the rolling VWAP
+            batch_size (int): Apply the queue once it holds this many ticks
+            interval (float): Also apply it at least this often (seconds); 0 = only by count
+            capacity (int): Initial number of slots
+            pip_size (callable, optional): func(symbol) -> pip size (default: default_pip_size)
+            on_error (callable, optional): Called with exceptions raised by update handlers
+                (default: re-raised)
+            worker (Worker, optional): Thread for time-based flushes and the update calls
+                they make (default: a new Worker), never the shared scheduler thread
+        """
+        if numpy is None:
+            raise ImportError("Please install numpy: pip install numpy")
+        if vwap_window < 1:
+            raise ValueError('vwap_window must be >= 1')
+        self.ema_periods = tuple(int(p) for p in ema_periods)
+        self.vwap_window = vwap_window
+        self.batch_size = batch_size
+        self.interval = interval
+        self.pip_size = pip_size or default_pip_size
+        self.on_error = on_error
+
+        # Counters
+        self.ticks = 0
+        self.batches = 0
+        self.last_batch_ms = 0.0
+
+        self._keys = []  # slot -> key
+        self._slots = {}  # key -> slot
+        self._lookup = {}  # (symbol, timeframe) as received -> slot
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._onupdate = None
+        self._alphas = numpy.array([2.0 / (p + 1) for p in self.ema_periods])
+        self._allocate(max(1, capacity))
+
+        self._timer = None
+        if interval:
+            worker = worker or Worker(name='fcs-indicators')
+            self._timer = get_scheduler().call_every(interval, self.flush, worker=worker)
+
+    def _allocate(self, capacity):
+        """Create (or grow) the per-slot arrays."""
+        nan = numpy.nan
+        old = getattr(self, '_arrays', None)
+        arrays = {name: numpy.full(capacity, nan) for name in FIELDS}
+        arrays['volume'][:] = 0.0
+        arrays['count'][:] = 0.0
+        ema = numpy.full((len(self.ema_periods), capacity), nan)
+        ring_pv = numpy.zeros((capacity, self.vwap_window))
+        ring_v = numpy.zeros((capacity, self.vwap_window))
+        head = numpy.zeros(capacity, dtype=numpy.intp)
+        last_t = numpy.full(capacity, nan)
+        last_v = numpy.zeros(capacity)
+        if old is not None:
+            n = self.capacity
+            for name in FIELDS:
+                arrays[name][:n] = old[name]
+            ema[:, :n] = self._ema
+            ring_pv[:n] = self._ring_pv
+            ring_v[:n] = self._ring_v
+            head[:n] = self._head
+            last_t[:n] = self._last_t
+            last_v[:n] = self._last_v
+        self.capacity = capacity
+        self._arrays = arrays
+        self._ema = ema
+        self._ring_pv = ring_pv
+        self._ring_v = ring_v
+        self._head = head
+        self._last_t = last_t
+        self._last_v = last_v
+
+    def on_update(self, func):
+        """Decorator: func(engine, slots) is called after each batch with the updated slots."""
+        self._onupdate = func
+        return func
+
+    # ============================================
+    # Input
+    # ============================================
+
+    def on_message(self, data):
+        """Listener entry point: queue a price frame."""
+        if type(data) is PriceTick:
+            symbol, timeframe = data.symbol, data.timeframe
+            t, c, v, a, b = data.t, data.c, data.v, data.a, data.b
+        elif isinstance(data, dict) and data.get('type') == 'price':
+            symbol, timeframe = data.get('symbol'), data.get('timeframe')
+            p = data.get('prices') or {}
+            t, c, v, a, b = p.get('t'), p.get('c'), p.get('v'), p.get('a'), p.get('b')
+        else:
+            return
+        slot = self._lookup.get((symbol, timeframe))
+        if slot is None:
+            if not symbol:
+                return
+            slot = self._add_key(symbol, timeframe)
+        queue = self._queue
+        queue.append((slot, t, c, v, a, b))
+        if len(queue) >= self.batch_size:
+            self.flush()
+
+    def _add_key(self, symbol, timeframe):
+        with self._lock:
+            key = f"{symbol.upper()}_{timeframe}"
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = len(self._keys)
+                if slot >= self.capacity:
+                    self._allocate(self.capacity * 2)
+                self._keys.append(key)
+                self._slots[key] = slot
+                self._arrays['pip'][slot] = self.pip_size(symbol)
+            self._lookup[(symbol, timeframe)] = slot
+            return slot
+
+    def flush(self):
+        """Apply every queued tick now."""
+        queue = self._queue
+        if not queue:
+            return
+        with self._lock:
+            popleft = queue.popleft
+            rows = [popleft() for _ in range(len(queue))]
+            if not rows:
+                return
+            started = time.perf_counter()
+            slots = self._apply(rows)
+            self.last_batch_ms = (time.perf_counter() - started) * 1000
+            self.ticks += len(rows)
+            self.batches += 1
+        if self._onupdate is not None:
+            try:
+                self._onupdate(self, slots)
+            except Exception as e:
+                if self.on_error is None:
+                    raise
+                self.on_error(e)
+
+    # ============================================
+    # Vectorized update
+    # ============================================
+
+    def _apply(self, rows):
+        """Update all indicators from a batch of queued rows; returns the updated slots."""
+        try:
+            batch = numpy.array(rows, dtype=float)
+        except (TypeError, ValueError):
+            batch = numpy.array([[_to_float(x) for x in row] for row in rows], dtype=float)
+        slots = batch[:, _SLOT].astype(numpy.intp)
+        a, b = batch[:, _A], batch[:, _B]
+        has_quote = ~(numpy.isnan(a) | numpy.isnan(b))
+        price = numpy.where(has_quote, (a + b) / 2, batch[:, _C])
+        arrays = self._arrays
+
+        # Price, EMA and return from every row with a price
+        priced = ~numpy.isnan(price)
+        if priced.any():
+            self._update_price(slots[priced], price[priced])
+
+        # Ask/bid/spread from the last quote row per slot
+        if has_quote.any():
+            order, _, last, _, _ = _groups(slots[has_quote])
+            qs = slots[has_quote][order][last]
+            qa, qb = a[has_quote][order][last], b[has_quote][order][last]
+            arrays['ask'][qs] = qa
+            arrays['bid'][qs] = qb
+            arrays['spread'][qs] = qa - qb
+            arrays['spread_pips'][qs] = (qa - qb) / arrays['pip'][qs]
+
+        # VWAP from candle rows (close + cumulative volume)
+        candle = ~(numpy.isnan(batch[:, _C]) | numpy.isnan(batch[:, _V]))
+        if candle.any():
+            self._update_vwap(
+                slots[candle], batch[candle, _T], batch[candle, _C], batch[candle, _V]
+            )
+
+        touched = numpy.unique(slots)
+        arrays['count'][touched] += numpy.bincount(slots, minlength=len(self._keys))[touched]
+        arrays['updated'][touched] = time.time()
+        return touched
+
+    def _update_price(self, slots, price):
+        arrays = self._arrays
+        order, first, last, rank, length = _groups(slots)
+        s, p = slots[order], price[order]
+        gs = s[last]
+
+        # Previous price per row: the row before it in its run, else the stored price
+        previous = numpy.empty_like(p)
+        previous[1:] = p[:-1]
+        previous[first] = arrays['price'][s[first]]
+        arrays['ret'][gs] = p[last] / previous[last] - 1
+        arrays['price'][gs] = p[last]
+
+        # EMA over a run of k ticks: ema * (1-a)^k + sum(a * (1-a)^(k-1-j) * x_j)
+        starts = numpy.flatnonzero(first)
+        age = length - 1 - rank
+        for i, alpha in enumerate(self._alphas):
+            ema = self._ema[i]
+            fresh = numpy.isnan(ema[gs])
+            ema[gs[fresh]] = p[first][fresh]
+            decay = 1.0 - alpha
+            contrib = numpy.add.reduceat(alpha * decay**age * p, starts)
+            ema[gs] = ema[gs] * decay ** length[last] + contrib
+
+    def _update_vwap(self, slots, t, close, volume):
+        arrays = self._arrays
+        window = self.vwap_window
+        order, first, last, rank, length = _groups(slots)
+        s, t, c, v = slots[order], t[order], close[order], volume[order]
+
+        # Traded volume: increase of the cumulative candle volume, full volume on a new candle
+        prev_t = numpy.empty_like(t)
+        prev_v = numpy.empty_like(v)
+        prev_t[1:], prev_v[1:] = t[:-1], v[:-1]
+        prev_t[first] = self._last_t[s[first]]
+        prev_v[first] = self._last_v[s[first]]
+        traded = numpy.where(t == prev_t, numpy.maximum(v - prev_v, 0.0), v)
+        gs = s[last]
+        self._last_t[gs] = t[last]
+        self._last_v[gs] = v[last]
+        arrays['volume'][gs] += numpy.add.reduceat(traded, numpy.flatnonzero(first))
+
+        # Write into each slot's ring (only the newest `window` rows of a run matter)
+        keep = rank >= length - window
+        ks, kr = s[keep], rank[keep]
+        pos = (self._head[ks] + kr) % window
+        self._ring_pv[ks, pos] = (c * traded)[keep]
+        self._ring_v[ks, pos] = traded[keep]
+        self._head[gs] = (self._head[gs] + length[last]) % window
+
+        total = self._ring_v[gs].sum(axis=1)
+        with numpy.errstate(invalid='ignore', divide='ignore'):
+            vwap = self._ring_pv[gs].sum(axis=1) / total
+        arrays['vwap'][gs] = numpy.where(total > 0, vwap, arrays['vwap'][gs])
+
+    # ============================================
+    # Reads
+    # ============================================
+
+    def slot(self, symbol, timeframe):
+        """Array index for a symbol/timeframe, or None if not seen yet."""
+        return self._slots.get(f"{symbol.upper()}_{timeframe}")
+
+    def keys(self):
+        """Keys in slot order."""
+        return list(self._keys)
+
+    def view(self, name, period=None):
+        """
+        Read-only view of an indicator array, indexed by slot.
+
+        Args:
+            name (str): One of FIELDS, or 'ema'
+            period (int, optional): EMA period (default: 2D array of all periods)
+
+        Returns:
+            numpy.ndarray: View over the slots in use
+        """
+        n = len(self._keys)
+        if name == 'ema':
+            array = (
+                self._ema[:, :n]
+                if period is None
+                else self._ema[self.ema_periods.index(int(period)), :n]
+            )
+        else:
+            array = self._arrays[name][:n]
+        view = array.view()
+        view.flags.writeable = False
+        return view
+
+    def snapshot(self):
+        """Consistent copies of every array (taken between batches)."""
+        with self._lock:
+            n = len(self._keys)
+            result = {name: self._arrays[name][:n].copy() for name in FIELDS}
+            for i, period in enumerate(self.ema_periods):
+                result[f'ema{period}'] = self._ema[i, :n].copy()
+            result['keys'] = list(self._keys)
+        return result
+
+    def get(self, symbol, timeframe):
+        """Current indicator values for one key as a dict, or None."""
+        slot = self.slot(symbol, timeframe)
+        if slot is None:
+            return None
+        with self._lock:
+            result = {name: float(self._arrays[name][slot]) for name in FIELDS}
+            for i, period in enumerate(self.ema_periods):
+                result[f'ema{period}'] = float(self._ema[i, slot])
+        return result
+
+    def stats(self):
+        return {
+            'keys': len(self._keys),
+            'capacity': self.capacity,
+            'ticks': self.ticks,
+            'batches': self.batches,
+            'avg_batch': self.ticks / self.batches if self.batches else 0.0,
+            'last_batch_ms': self.last_batch_ms,
+            'queued': len(self._queue),
+        }
+
+    def stop(self):
+        """Stop time-based flushing and apply what is queued."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self.flush()
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return numpy.nan
@@ -0,0 +1,405 @@
+"""
+FCS client metrics
+
+Lightweight counters, gauges and histograms with a snapshot dict and a
+Prometheus text exporter (optionally served over a local HTTP endpoint).
+
+Usage:
+    from fcs_client_lib import FCSClient
+
+    client = FCSClient('YOUR_API_KEY')
+    metrics = client.enable_metrics()
+    metrics.start_http_server(9108)  # http://127.0.0.1:9108/metrics
+
+    print(metrics.snapshot())
+
+Updates are plain attribute/dict writes without locks. Under concurrent
+writers a rare increment may be lost; that is the trade-off for keeping the
+per-message cost low enough for production.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+from fcs_decoder import PriceTick
+from fcs_scheduler import get_scheduler
+
+# Buckets in seconds, from 10 microseconds to 10 seconds
+TIME_BUCKETS = (
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _label_text(labelnames, labelvalues):
+    if not labelnames:
+        return ''
+    pairs = []
+    for name, value in zip(labelnames, labelvalues):
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+def frame_size(message):
+    """Frame size in bytes; str frames are UTF-8 encoded only if not ASCII."""
+    if isinstance(message, str) and not message.isascii():
+        return len(message.encode('utf-8'))
+    return len(message)
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter, optionally split by label values."""
+
+    kind = 'counter'
+
+    def __init__(self, name, help='', labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.values = {}  # label tuple -> value
+
+    def inc(self, amount=1, *labelvalues):
+        values = self.values
+        values[labelvalues] = values.get(labelvalues, 0) + amount
+
+    def get(self, *labelvalues):
+        return self.values.get(labelvalues, 0)
+
+    def remove(self, *labelvalues):
+        """Drop the series for these label values."""
+        self.values.pop(labelvalues, None)
+
+    def snapshot(self):
+        if not self.labelnames:
+            return self.values.get((), 0)
+        return {'|'.join(map(str, k)): v for k, v in self.values.items()}
+
+    def samples(self):
+        if not self.labelnames and not self.values:
+            yield self.name, (), 0
+        for labels, value in list(self.values.items()):
+            yield self.name, labels, value
+
+
+class Gauge(Counter):
+    """Value that can go up and down, optionally split by label values."""
+
+    kind = 'gauge'
+
+    def set(self, value, *labelvalues):
+        self.values[labelvalues] = value
+
+
+class Histogram:
+    """Cumulative-bucket histogram, optionally split by label values."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help='', labelnames=(), buckets=TIME_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label tuple -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, value, *labelvalues):
+        series = self._series.get(labelvalues)
+        if series is None:
+            series = self._series[labelvalues] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def snapshot(self):
+        result = {}
+        for labels, series in list(self._series.items()):
+            count = sum(series[:-1])
+            key = '|'.join(map(str, labels)) if self.labelnames else ''
+            result[key] = {
+                'count': count,
+                'sum': series[-1],
+                'avg': series[-1] / count if count else None,
+                'p50': self._quantile(series, count, 0.5),
+                'p99': self._quantile(series, count, 0.99),
+            }
+        if not self.labelnames:
+            return result.get('', {'count': 0, 'sum': 0.0, 'avg': None, 'p50': None, 'p99': None})
+        return result
+
+    def _quantile(self, series, count, q):
+        """Upper bucket bound containing quantile q (coarse, bucket resolution)."""
+        if not count:
+            return None
+        target = q * count
+        running = 0
+        for bound, n in zip(self.buckets + (float('inf'),), series[:-1]):
+            running += n
+            if running >= target:
+                return bound
+        return float('inf')
+
+    def samples(self):
+        for labels, series in list(self._series.items()):
+            running = 0
+            for bound, n in zip(self.buckets + (float('inf'),), series[:-1]):
+                running += n
+                yield self.name + '_bucket', labels + (_format_value(float(bound)),), running
+            yield self.name + '_count', labels, running
+            yield self.name + '_sum', labels, series[-1]
+
+
+class MetricsRegistry:
+    """Named collection of metrics with snapshot and Prometheus export."""
+
+    def __init__(self, prefix='fcs_'):
+        self.prefix = prefix
+        self._metrics = {}
+        self._collectors = []  # Called before export to refresh computed gauges
+        self._server = None
+
+    def counter(self, name, help='', labelnames=()):
+        return self._register(Counter(self.prefix + name, help, labelnames))
+
+    def gauge(self, name, help='', labelnames=()):
+        return self._register(Gauge(self.prefix + name, help, labelnames))
+
+    def histogram(self, name, help='', labelnames=(), buckets=TIME_BUCKETS):
+        return self._register(Histogram(self.prefix + name, help, labelnames, buckets))
+
+    def add_collector(self, func):
+        """Register a function run before every snapshot/export."""
+        self._collectors.append(func)
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f'Metric already registered: {metric.name}')
+        self._metrics[metric.name] = metric
+        return metric
+
+    def _collect(self):
+        for func in self._collectors:
+            func()
+
+    def snapshot(self):
+        """All metrics as a plain dict (names without prefix)."""
+        self._collect()
+        strip = len(self.prefix)
+        return {name[strip:]: metric.snapshot() for name, metric in self._metrics.items()}
+
+    def to_prometheus(self):
+        """All metrics in Prometheus text exposition format."""
+        self._collect()
+        lines = []
+        for metric in self._metrics.values():
+            if metric.help:
+                lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            labelnames = metric.labelnames
+            for name, labels, value in metric.samples():
+                names = labelnames + ('le',) if name.endswith('_bucket') else labelnames
+                lines.append(f'{name}{_label_text(names, labels)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+    # ============================================
+    # HTTP endpoint
+    # ============================================
+
+    def start_http_server(self, port=9108, host='127.0.0.1'):
+        """
+        Serve to_prometheus() at http://host:port/metrics on a daemon thread.
+
+        Returns:
+            HTTPServer: The running server (server.server_address has the bound port)
+        """
+        if self._server is not None:
+            return self._server
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = registry.to_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        class Server(ThreadingMixIn, HTTPServer):
+            daemon_threads = True
+
+        self._server = Server((host, port), Handler)
+        thread = threading.Thread(target=self._server.serve_forever, name='fcs-metrics-http')
+        thread.daemon = True
+        thread.start()
+        return self._server
+
+    def stop_http_server(self):
+        """Stop the HTTP endpoint if running."""
+        server, self._server = self._server, None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+
+class ClientMetrics(MetricsRegistry):
+    """
+    Metrics collected by FCSClient (see FCSClient.enable_metrics).
+
+    subscription_tick_rate is the average over the last `rate_window`
+    seconds, sampled on the shared scheduler, so it does not depend on how
+    often or by how many scrapers it is read. For Prometheus, prefer
+    rate(fcs_subscription_ticks_total[...]) over the monotonic counter.
+    feed_latency_seconds is recorded for 'askbid' frames only: their
+    prices.t is the quote time, while a candle's t is its open time.
+    bytes_received_total counts UTF-8 bytes for every transport, and the
+    per-subscription series are dropped when the key is left.
+    """
+
+    def __init__(self, prefix='fcs_', rate_window=10.0):
+        """
+        Initialize client metrics.
+
+        Args:
+            prefix (str): Metric name prefix
+            rate_window (float): Seconds averaged by subscription_tick_rate
+        """
+        super().__init__(prefix)
+        self.frames = self.counter('frames_received_total', 'Frames received', ('type',))
+        self.bytes = self.counter('bytes_received_total', 'Frame bytes received', ('type',))
+        self.decode_errors = self.counter('decode_errors_total', 'Frames that failed to decode')
+        self.decode_time = self.histogram('decode_seconds', 'Time spent decoding a frame')
+        self.callback_time = self.histogram('callback_seconds', 'Time spent in message handlers')
+        self.reconnects = self.counter('reconnects_total', 'Reconnect attempts')
+        self.send_failures = self.counter('send_failures_total', 'Messages not sent', ('reason',))
+        self.ticks = self.counter(
+            'subscription_ticks_total', 'Price frames per subscription', ('key',)
+        )
+        self.tick_rate = self.gauge(
+            'subscription_tick_rate',
+            f'Price frames/sec per subscription, averaged over {rate_window:g}s',
+            ('key',),
+        )
+        self.feed_latency = self.histogram(
+            'feed_latency_seconds',
+            'Wall clock minus prices.t for askbid frames',
+            buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+        )
+        self.rtt = self.gauge('rtt_seconds', 'Smoothed heartbeat round-trip time')
+        self.connected = self.gauge('connected', '1 if the client is connected')
+
+        self.rate_window = rate_window
+        sample_every = min(1.0, rate_window)
+        # (monotonic time, tick counts) samples covering the last rate_window seconds
+        self._rate_samples = deque(maxlen=int(rate_window / sample_every) + 1)
+        self._sample_rates()
+        self._rate_timer = get_scheduler().call_every(sample_every, self._sample_rates)
+        self.add_collector(self._update_rates)
+
+    def observe_frame(self, data, size, decode_seconds):
+        """Record one decoded frame (called on the receive thread)."""
+        if type(data) is PriceTick:
+            msg_type = 'price'
+            key = data.key
+            mode = data.mode
+            t = data.t
+        else:
+            msg_type = data.get('type') if type(data) is dict else None
+            key = mode = t = None
+            if msg_type == 'price':
+                symbol = data.get('symbol')
+                if symbol:
+                    key = f"{symbol.upper()}_{data.get('timeframe')}"
+                prices = data.get('prices')
+                if type(prices) is dict:
+                    mode = prices.get('mode')
+                    t = prices.get('t')
+
+        self.frames.inc(1, msg_type)
+        self.bytes.inc(size, msg_type)
+        self.decode_time.observe(decode_seconds)
+
+        if key is not None:
+            self.ticks.inc(1, key)
+            if mode == 'askbid' and t:
+                try:
+                    t = float(t)
+                except (TypeError, ValueError):
+                    return
+                if t > 1e11:  # milliseconds
+                    t /= 1000.0
+                self.feed_latency.observe(max(0.0, time.time() - t))
+
+    def remove_key(self, key=None):
+        """
+        Drop the per-subscription series of one key (or of all keys).
+
+        Args:
+            key (str, optional): Subscription key such as 'FX:EURUSD_1' (None = all)
+        """
+        if key is None:
+            self.ticks.values.clear()
+            self.tick_rate.values.clear()
+        else:
+            self.ticks.remove(key)
+            self.tick_rate.remove(key)
+
+    def _sample_rates(self):
+        """Record the tick counters (scheduler thread)."""
+        self._rate_samples.append((time.monotonic(), dict(self.ticks.values)))
+
+    def _update_rates(self):
+        """Set tick_rate from the current counters and the oldest sample in the window."""
+        samples = self._rate_samples
+        if not samples:
+            return
+        since, previous = samples[0]
+        elapsed = time.monotonic() - since
+        if elapsed <= 0:
+            return
+        for labels, count in list(self.ticks.values.items()):
+            ticks = count - previous.get(labels, 0)
+            if ticks < 0:  # Key was removed and joined again since the sample
+                ticks = count
+            self.tick_rate.set(ticks / elapsed, *labels)
+
+    def close(self):
+        """Stop rate sampling and the HTTP endpoint."""
+        timer, self._rate_timer = self._rate_timer, None
+        if timer is not None:
+            timer.cancel()
+        self.stop_http_server()
@@ -0,0 +1,352 @@
+"""
+FCS mock WebSocket server
+
+Local server that speaks the protocol FCSClient expects, for tests and
+benchmarks without network access or an API key:
+
+- 'welcome' on connect
+- 'ping' every ping_interval seconds, 'pong' for client pings
+- 'joined_room' confirmation and an 'initial' price frame on join_symbol
+- 'candle' / 'askbid' price frames for every subscribed key at a fixed total rate
+
+Price frames carry prices.t as a float wall-clock timestamp (seconds), so
+clients can measure end-to-end latency.
+
+Usage:
+    from fcs_mock_server import MockFCSServer
+
+    server = MockFCSServer(rate=5000).start()  # background thread
+    client = FCSClient('test', server.url)
+    ...
+    server.drop_connections()  # force a reconnect
+    server.stop()
+
+Command line:
+    python fcs_mock_server.py --port 8765 --rate 5000
+
+Install:
+    pip install websockets
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+
+try:
+    import websockets
+except ImportError:
+    raise ImportError("Please install websockets: pip install websockets")
+
+
+class _Session:
+    """One connected client."""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.subscriptions = {}  # key -> (symbol, timeframe)
+        self.keys = []  # round-robin order
+        self.cursor = 0
+        self.received = 0
+        self.tasks = []
+
+    def cancel(self):
+        for task in self.tasks:
+            task.cancel()
+
+
+class MockFCSServer:
+    """
+    Mock FCS WebSocket server.
+
+    Attributes:
+        frames_sent (int): Price frames sent across all sessions
+        connections (int): Connections accepted since start
+    """
+
+    def __init__(
+        self,
+        host='127.0.0.1',
+        port=0,
+        rate=1000,
+        modes=('candle', 'askbid'),
+        ping_interval=None,
+        symbols=None,
+        compression=None,
+    ):
+        """
+        Initialize mock server.
+
+        Args:
+            host (str): Interface to bind
+            port (int): Port to bind (0 = pick a free port)
+            rate (float): Price frames per second per connection, spread over its
+                subscriptions (0 = as fast as possible)
+            modes (tuple): Price modes to cycle through after 'initial'
+            ping_interval (float, optional): Seconds between server pings (None = never)
+            symbols (int, optional): If set, every connection is auto-subscribed to
+                this many generated symbols ('MOCK:SYM0000'...) on connect
+            compression (str, optional): 'deflate' to accept permessage-deflate
+        """
+        self.host = host
+        self.port = port
+        self.rate = rate
+        self.modes = tuple(modes)
+        self.ping_interval = ping_interval
+        self.symbols = symbols
+        self.compression = compression
+
+        self.frames_sent = 0
+        self.connections = 0
+
+        self._sessions = set()
+        self._server = None
+        self._loop = None
+        self._thread = None
+        self._prices = {}
+
+    @property
+    def url(self):
+        """WebSocket URL of the running server."""
+        return f'ws://{self.host}:{self.port}'
+
+    # ============================================
+    # Lifecycle
+    # ============================================
+
+    async def serve(self):
+        """Start serving on the current event loop. Returns self."""
+        self._server = await websockets.serve(
+            self._handler,
+            self.host,
+            self.port,
+            compression=self.compression,
+            max_size=None,
+            close_timeout=1,
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        """Stop serving on the current event loop."""
+        if self._server is not None:
+            for session in list(self._sessions):
+                session.cancel()
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def start(self):
+        """Run the server on a background thread. Returns self once listening."""
+        ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+
+        def run():
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.serve())
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name='fcs-mock-server')
+        self._thread.daemon = True
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self, timeout=5):
+        """Stop a server started with start()."""
+        if self._loop is None:
+            return
+        future = asyncio.run_coroutine_threadsafe(self.close(), self._loop)
+        try:
+            future.result(timeout)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout)
+            self._loop = None
+            self._thread = None
+
+    def drop_connections(self, code=1012, reason='mock restart'):
+        """Close every client connection (the server keeps listening)."""
+
+        async def drop():
+            sessions = list(self._sessions)
+            for session in sessions:
+                # Stop streaming so the close handshake is not queued behind prices
+                session.cancel()
+            for session in sessions:
+                # Don't wait for the closing handshake; clients may take seconds to finish it
+                asyncio.ensure_future(session.ws.close(code, reason))
+
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(drop(), self._loop).result(5)
+        else:
+            return drop()
+
+    # ============================================
+    # Protocol
+    # ============================================
+
+    async def _handler(self, ws, path=None):
+        session = _Session(ws)
+        self._sessions.add(session)
+        self.connections += 1
+        tasks = session.tasks
+        try:
+            await ws.send(json.dumps({'type': 'welcome', 'message': 'Welcome to mock FCS'}))
+            if self.symbols:
+                for i in range(self.symbols):
+                    await self._join(session, f'MOCK:SYM{i:04d}', '1')
+            tasks.append(asyncio.ensure_future(self._stream(session)))
+            if self.ping_interval:
+                tasks.append(asyncio.ensure_future(self._pinger(session)))
+
+            async for raw in ws:
+                session.received += 1
+                try:
+                    data = json.loads(raw)
+                except ValueError:
+                    continue
+                await self._handle(session, data)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            session.cancel()
+            self._sessions.discard(session)
+
+    async def _handle(self, session, data):
+        msg_type = data.get('type')
+        if msg_type == 'ping':
+            await session.ws.send(json.dumps({'type': 'pong', 'timestamp': data.get('timestamp')}))
+        elif msg_type == 'join_symbol':
+            await self._join(session, data.get('symbol'), data.get('timeframe'))
+        elif msg_type == 'leave_symbol':
+            key = f"{str(data.get('symbol')).upper()}_{data.get('timeframe')}"
+            if session.subscriptions.pop(key, None):
+                session.keys.remove(key)
+        elif msg_type == 'remove_all':
+            session.subscriptions.clear()
+            session.keys = []
+
+    async def _join(self, session, symbol, timeframe):
+        if not symbol or not timeframe:
+            return
+        key = f"{symbol.upper()}_{timeframe}"
+        if key not in session.subscriptions:
+            session.subscriptions[key] = (symbol, timeframe)
+            session.keys.append(key)
+        await session.ws.send(
+            json.dumps(
+                {
+                    'type': 'message',
+                    'short': 'joined_room',
+                    'symbol': symbol,
+                    'timeframe': timeframe,
+                    'message': f'Joined {symbol} {timeframe}',
+                }
+            )
+        )
+        await session.ws.send(self._price_frame(symbol, timeframe, 'initial'))
+
+    def _price_frame(self, symbol, timeframe, mode):
+        """Encode one price frame with a random-walk price."""
+        key = (symbol, timeframe)
+        price = self._prices.get(key) or random.uniform(10, 1000)
+        price *= 1 + random.uniform(-0.0005, 0.0005)
+        self._prices[key] = price
+        prices = {'mode': mode, 't': time.time()}
+        if mode != 'askbid':
+            prices.update(
+                o=round(price * 0.999, 5),
+                h=round(price * 1.001, 5),
+                l=round(price * 0.998, 5),
+                c=round(price, 5),
+                v=round(random.uniform(1, 100), 3),
+            )
+        prices.update(a=round(price * 1.0001, 5), b=round(price * 0.9999, 5))
+        self.frames_sent += 1
+        return json.dumps(
+            {'type': 'price', 'symbol': symbol, 'timeframe': timeframe, 'prices': prices}
+        )
+
+    async def _stream(self, session):
+        """Send price frames round-robin over the session's keys at the configured rate."""
+        started = time.monotonic()
+        sent = 0
+        mode_index = 0
+        while True:
+            if not session.keys:
+                await asyncio.sleep(0.01)
+                started, sent = time.monotonic(), 0
+                continue
+
+            if self.rate:
+                due = int((time.monotonic() - started) * self.rate) - sent
+                if due <= 0:
+                    await asyncio.sleep(0.001)
+                    continue
+            else:
+                due = 100
+
+            for _ in range(due):
+                keys = session.keys
+                if not keys:
+                    break
+                session.cursor = (session.cursor + 1) % len(keys)
+                symbol, timeframe = session.subscriptions[keys[session.cursor]]
+                mode = self.modes[mode_index % len(self.modes)]
+                mode_index += 1
+                await session.ws.send(self._price_frame(symbol, timeframe, mode))
+            sent += due
+            if not self.rate:
+                await asyncio.sleep(0)
+
+    async def _pinger(self, session):
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            await session.ws.send(
+                json.dumps({'type': 'ping', 'timestamp': int(time.time() * 1000)})
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mock FCS WebSocket server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument(
+        '--rate', type=float, default=1000, help='price frames/sec per connection (0 = unlimited)'
+    )
+    parser.add_argument(
+        '--symbols',
+        type=int,
+        default=None,
+        help='auto-subscribe each connection to N generated symbols',
+    )
+    parser.add_argument('--ping-interval', type=float, default=None)
+    parser.add_argument('--deflate', action='store_true', help='accept permessage-deflate')
+    args = parser.parse_args()
+
+    server = MockFCSServer(
+        args.host,
+        args.port,
+        rate=args.rate,
+        symbols=args.symbols,
+        ping_interval=args.ping_interval,
+        compression='deflate' if args.deflate else None,
+    )
+
+    async def run():
+        await server.serve()
+        print(f'Mock FCS server listening on {server.url}')
+        await asyncio.Future()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
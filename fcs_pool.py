@@ -0,0 +1,355 @@
+"""
+FCS connection pool
+
+Spreads subscriptions across several WebSocket connections, all driven by a
+single event-loop thread, and merges their messages into one on_message
+stream. Symbols are placed with rendezvous hashing, so each symbol has a
+stable home connection and only the symbols of a lost connection move.
+
+Usage:
+    from fcs_pool import FCSPool
+
+    pool = FCSPool('YOUR_API_KEY', connections=4)
+
+    @pool.on_message
+    def handle_message(data):
+        print(data)
+
+    pool.start()
+    for symbol in symbols:
+        pool.join(symbol, '1D')
+
+Install:
+    pip install websockets
+"""
+
+import asyncio
+import threading
+import zlib
+
+from fcs_async_client import AsyncFCSClient
+
+
+class FCSPool:
+    """
+    Pool of AsyncFCSClient connections sharing one background event loop.
+
+    join/leave/remove_all are thread-safe and return immediately. Callbacks
+    run on the pool's event-loop thread.
+    """
+
+    def __init__(self, api_key, url=None, connections=4, compression=None):
+        """
+        Initialize connection pool.
+
+        Args:
+            api_key (str): Your FCS API key
+            url (str, optional): WebSocket server URL
+            connections (int): Number of WebSocket connections
+            compression (str, optional): 'deflate' to negotiate permessage-deflate
+        """
+        if connections < 1:
+            raise ValueError('connections must be >= 1')
+
+        self.api_key = api_key
+        self.url = url
+        self.size = connections
+        self.compression = compression
+        self.clients = []
+        self.reconnect_delay = 3
+        self.reconnect_limit = 5
+        self.show_logs = False
+
+        # Event callbacks
+        self._onmessage = None
+        self._onerror = None
+
+        # Desired subscriptions and where they currently live
+        self._subscriptions = {}  # key -> (symbol, timeframe)
+        self._assignment = {}  # key -> client index
+        self._alive = set()
+        self._stopping = False
+
+        self._loop = None
+        self._thread = None
+
+    # ============================================
+    # Event callback decorators
+    # ============================================
+
+    @property
+    def onmessage(self):
+        return self._onmessage
+
+    @onmessage.setter
+    def onmessage(self, func):
+        self._onmessage = func
+
+    def on_message(self, func):
+        """Decorator for the merged message callback."""
+        self._onmessage = func
+        return func
+
+    @property
+    def onerror(self):
+        return self._onerror
+
+    @onerror.setter
+    def onerror(self, func):
+        self._onerror = func
+
+    def on_error(self, func):
+        """Decorator for error callback (called with the error and the client index)."""
+        self._onerror = func
+        return func
+
+    # ============================================
+    # Lifecycle
+    # ============================================
+
+    def start(self, timeout=None):
+        """
+        Start the event-loop thread and open all connections.
+
+        Args:
+            timeout (float, optional): Max seconds to wait for the connections' welcome
+
+        Returns self for chaining.
+        """
+        if self._thread and self._thread.is_alive():
+            return self
+
+        self._stopping = False
+        self._loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(self._loop)
+            self._loop.call_soon(ready.set)
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name='fcs-pool')
+        self._thread.daemon = True
+        self._thread.start()
+        ready.wait()
+
+        future = asyncio.run_coroutine_threadsafe(self._connect_all(timeout), self._loop)
+        future.result()
+        return self
+
+    def stop(self, timeout=None):
+        """Disconnect all connections and stop the event-loop thread."""
+        if not self._loop:
+            return
+        future = asyncio.run_coroutine_threadsafe(self._disconnect_all(), self._loop)
+        try:
+            future.result(timeout)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout)
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+
+    # ============================================
+    # Subscription methods
+    # ============================================
+
+    def join(self, symbol, timeframe):
+        """
+        Subscribe to a symbol on its home connection.
+
+        Args:
+            symbol (str): Symbol with exchange prefix (e.g., 'BINANCE:BTCUSDT')
+            timeframe (str): Timeframe (e.g., '1', '5', '15', '1H', '1D')
+
+        Returns:
+            concurrent.futures.Future: Resolves once the join has been sent
+        """
+        if not symbol or not timeframe or ':' not in symbol:
+            if self.show_logs:
+                print('[FCS] Symbol with exchange prefix and timeframe are required to join')
+            return None
+        return self._submit(self._join(symbol, timeframe))
+
+    def leave(self, symbol, timeframe):
+        """
+        Unsubscribe from a symbol.
+
+        Returns:
+            concurrent.futures.Future: Resolves once the leave has been sent
+        """
+        if not symbol or not timeframe:
+            return None
+        return self._submit(self._leave(symbol, timeframe))
+
+    def remove_all(self):
+        """Unsubscribe from all symbols on all connections."""
+        return self._submit(self._remove_all())
+
+    def connection_for(self, symbol):
+        """Index of the connection currently serving a symbol, or None."""
+        return self._on_loop(self._pick, symbol)
+
+    def stats(self):
+        """Per-connection state and subscription counts."""
+        return self._on_loop(self._stats)
+
+    @property
+    def active_subscriptions(self):
+        """Confirmed subscriptions across all connections."""
+        return self._on_loop(self._active_subscriptions)
+
+    # ============================================
+    # Internal methods (run on the pool loop)
+    # ============================================
+
+    def _submit(self, coro):
+        """Schedule a coroutine on the pool loop from any thread."""
+        if not self._loop:
+            coro.close()
+            raise RuntimeError('Pool is not started; call start() first')
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def _on_loop(self, func, *args):
+        """
+        Run func(*args) on the pool loop and return its result.
+
+        Pool state is only mutated on the loop thread, so reads from other
+        threads go through here instead of iterating it concurrently.
+        """
+        loop = self._loop
+        if loop is None or not loop.is_running() or threading.current_thread() is self._thread:
+            return func(*args)
+
+        async def call():
+            return func(*args)
+
+        return asyncio.run_coroutine_threadsafe(call(), loop).result()
+
+    def _stats(self):
+        counts = [0] * self.size
+        for index in self._assignment.values():
+            if index is not None:
+                counts[index] += 1
+        return [
+            {
+                'index': i,
+                'alive': i in self._alive,
+                'subscriptions': counts[i],
+                'reconnects': client.count_reconnects,
+            }
+            for i, client in enumerate(self.clients)
+        ]
+
+    def _active_subscriptions(self):
+        merged = {}
+        for client in self.clients:
+            merged.update(client.active_subscriptions)
+        return merged
+
+    def _pick(self, symbol):
+        """Rendezvous hash: the alive connection with the highest score for this symbol."""
+        if not self._alive:
+            return None
+        name = symbol.upper()
+        return max(self._alive, key=lambda i: zlib.crc32(f'{i}:{name}'.encode()))
+
+    async def _connect_all(self, timeout):
+        """Create and connect every client concurrently."""
+        self.clients = []
+        for index in range(self.size):
+            client = AsyncFCSClient(self.api_key, self.url, self.compression)
+            client.reconnect_delay = self.reconnect_delay
+            client.reconnect_limit = self.reconnect_limit
+            client.show_logs = self.show_logs
+            client.on_message(self._handle_message)
+            client.on_connected(self._make_up_handler(index))
+            client.on_reconnect(self._make_up_handler(index))
+            client.on_close(self._make_down_handler(index))
+            client.on_error(self._make_error_handler(index))
+            self.clients.append(client)
+
+        await asyncio.gather(*(c.connect(wait=True, timeout=timeout) for c in self.clients))
+
+    async def _disconnect_all(self):
+        """Disconnect every client."""
+        self._stopping = True
+        await asyncio.gather(*(c.disconnect() for c in self.clients), return_exceptions=True)
+        self._alive.clear()
+
+    def _make_up_handler(self, index):
+        async def handler():
+            self._alive.add(index)
+            await self._rebalance()
+
+        return handler
+
+    def _make_down_handler(self, index):
+        async def handler(code, msg):
+            self._alive.discard(index)
+            await self._rebalance()
+
+        return handler
+
+    def _make_error_handler(self, index):
+        def handler(error):
+            if callable(self._onerror):
+                self._onerror(error, index)
+
+        return handler
+
+    async def _handle_message(self, data):
+        """Merged message stream from all connections."""
+        if callable(self._onmessage):
+            result = self._onmessage(data)
+            if asyncio.iscoroutine(result):
+                await result
+
+    async def _join(self, symbol, timeframe):
+        key = f"{symbol.upper()}_{timeframe}"
+        self._subscriptions[key] = (symbol, timeframe)
+        index = self._pick(symbol)
+        self._assignment[key] = index
+        if index is None:
+            return False
+        return await self.clients[index].join(symbol, timeframe)
+
+    async def _leave(self, symbol, timeframe):
+        key = f"{symbol.upper()}_{timeframe}"
+        self._subscriptions.pop(key, None)
+        index = self._assignment.pop(key, None)
+        if index is None:
+            return False
+        return await self.clients[index].leave(symbol, timeframe)
+
+    async def _remove_all(self):
+        self._subscriptions.clear()
+        self._assignment.clear()
+        await asyncio.gather(*(c.remove_all() for c in self.clients))
+
+    async def _rebalance(self):
+        """Move every subscription whose home connection changed."""
+        if self._stopping:
+            return
+        moved = 0
+        for key, (symbol, timeframe) in list(self._subscriptions.items()):
+            target = self._pick(symbol)
+            current = self._assignment.get(key)
+            if target == current:
+                continue
+
+            if current is not None:
+                # Leave on the old connection; if it is down this only drops it
+                # from that client's rejoin list
+                await self.clients[current].leave(symbol, timeframe)
+
+            self._assignment[key] = target
+            if target is not None:
+                await self.clients[target].join(symbol, timeframe)
+                moved += 1
+
+        if moved and self.show_logs:
+            print(
+                f'[FCS] Pool rebalanced {moved} subscriptions across {len(self._alive)} connections'
+            )
@@ -0,0 +1,186 @@
+"""
+FCS hot-path profiling
+
+Timing hooks around the client's receive path and a slow-callback detector.
+Can be switched on and off on a running client.
+
+Stages (in the order a frame passes through them):
+    decode    - JSON decoding of the raw frame
+    dispatch  - control-frame handling (ping, welcome, joined_room bookkeeping)
+                and internal listeners (history, stores, ...)
+    callback  - a user handler (on_message), on whatever thread runs it
+    receive   - total time the receive thread spent on the frame
+
+Usage:
+    from fcs_client_lib import FCSClient
+
+    client = FCSClient('YOUR_API_KEY')
+    profiler = client.enable_profiling(sample_every=100, slow_threshold=0.005)
+
+    @profiler.on_slow
+    def report(event):
+        print(f'{event.handler} took {event.seconds * 1000:.1f} ms on {event.symbol}')
+
+    profiler.add_hook('decode', lambda stage, seconds, data: ...)
+    print(profiler.stats())
+
+    client.disable_profiling()
+"""
+
+import time
+from collections import deque
+
+STAGES = ('receive', 'decode', 'dispatch', 'callback')
+
+
+class SlowCallback:
+    """A handler call that exceeded the slow threshold."""
+
+    __slots__ = ('handler', 'symbol', 'timeframe', 'seconds', 'at')
+
+    def __init__(self, handler, symbol, timeframe, seconds):
+        self.handler = handler
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.seconds = seconds
+        self.at = time.time()
+
+    def to_dict(self):
+        return {
+            'handler': self.handler,
+            'symbol': self.symbol,
+            'timeframe': self.timeframe,
+            'seconds': self.seconds,
+            'at': self.at,
+        }
+
+    def __repr__(self):
+        return f'SlowCallback({self.handler!r}, {self.symbol!r}, {self.seconds * 1000:.2f} ms)'
+
+
+def handler_name(func):
+    """Readable name for a callable (module.qualname when available)."""
+    name = getattr(func, '__qualname__', None) or getattr(func, '__name__', None)
+    if name is None:
+        return repr(func)
+    module = getattr(func, '__module__', None)
+    return f'{module}.{name}' if module and module != '__main__' else name
+
+
+class Profiler:
+    """
+    Stage timing hooks with 1-in-N sampling, plus slow-callback detection.
+
+    Sampled frames have every stage timed and passed to the stage's hooks as
+    hook(stage, seconds, data). Handler calls are always timed while a
+    slow_threshold is set, so no slow call is missed by sampling.
+    """
+
+    def __init__(self, sample_every=1, slow_threshold=None, keep_slow=100):
+        """
+        Initialize profiler.
+
+        Args:
+            sample_every (int): Time 1 in N frames (1 = every frame)
+            slow_threshold (float, optional): Seconds above which a handler call is reported
+            keep_slow (int): Number of recent slow calls kept in `slow_calls`
+        """
+        if sample_every < 1:
+            raise ValueError('sample_every must be >= 1')
+        self.sample_every = sample_every
+        self.slow_threshold = slow_threshold
+        self.slow_calls = deque(maxlen=keep_slow)
+
+        self._hooks = {stage: [] for stage in STAGES}
+        self._onslow = None
+        self._frames = 0
+        self._callbacks = 0
+        self._stats = {stage: [0, 0.0, 0.0] for stage in STAGES}  # count, total, max
+
+    # ============================================
+    # Registration
+    # ============================================
+
+    def add_hook(self, stage, func):
+        """
+        Call func(stage, seconds, data) for every sampled measurement of a stage.
+
+        Args:
+            stage (str): 'receive', 'decode', 'dispatch' or 'callback'
+            func (callable): Hook; runs inline, so keep it cheap
+        """
+        if stage not in self._hooks:
+            raise ValueError(f'Unknown stage: {stage} (expected one of {STAGES})')
+        self._hooks[stage] = self._hooks[stage] + [func]
+        return func
+
+    def remove_hook(self, stage, func):
+        """Remove a hook added with add_hook()."""
+        self._hooks[stage] = [f for f in self._hooks[stage] if f != func]
+
+    def on_slow(self, func):
+        """Decorator: func(SlowCallback) is called for each slow handler call."""
+        self._onslow = func
+        return func
+
+    # ============================================
+    # Called by the client
+    # ============================================
+
+    def sample(self):
+        """Return True if the next frame should be timed."""
+        self._frames += 1
+        return self._frames % self.sample_every == 0
+
+    def sample_callback(self):
+        """Return True if the next handler call should be reported to 'callback' hooks."""
+        self._callbacks += 1
+        return self._callbacks % self.sample_every == 0
+
+    def record(self, stage, seconds, data=None):
+        """Record one measurement of a stage and run its hooks."""
+        stats = self._stats[stage]
+        stats[0] += 1
+        stats[1] += seconds
+        if seconds > stats[2]:
+            stats[2] = seconds
+        for hook in self._hooks[stage]:
+            hook(stage, seconds, data)
+
+    def check_slow(self, func, seconds, data=None):
+        """Report a handler call if it exceeded slow_threshold."""
+        threshold = self.slow_threshold
+        if threshold is None or seconds < threshold:
+            return
+        symbol = timeframe = None
+        if data is not None:
+            try:
+                symbol = data.get('symbol')
+                timeframe = data.get('timeframe')
+            except AttributeError:
+                pass
+        event = SlowCallback(handler_name(func), symbol, timeframe, seconds)
+        self.slow_calls.append(event)
+        if callable(self._onslow):
+            self._onslow(event)
+
+    # ============================================
+    # Inspection
+    # ============================================
+
+    def stats(self):
+        """Per-stage count, average and max seconds over sampled measurements."""
+        result = {}
+        for stage, (count, total, worst) in self._stats.items():
+            result[stage] = {
+                'count': count,
+                'avg': total / count if count else None,
+                'max': worst if count else None,
+            }
+        result['slow_calls'] = len(self.slow_calls)
+        return result
+
+    def reset(self):
+        """Clear collected stats and slow-call history."""
+        self._stats = {stage: [0, 0.0, 0.0] for stage in STAGES}
+        self.slow_calls.clear()
@@ -0,0 +1,373 @@
+"""
+FCS quote store
+
+Latest merged quote per subscription key: OHLCV from 'initial'/'candle'
+frames and ask/bid from 'askbid' frames, readable from any thread.
+
+Usage:
+    from fcs_client_lib import FCSClient
+
+    client = FCSClient('YOUR_API_KEY')
+    client.enable_quotes()
+    client.connect()
+    client.join('BINANCE:BTCUSDT', '1D')
+    client.run_forever(blocking=False)
+
+    quote = client.wait_for_update('BINANCE:BTCUSDT', timeout=10)
+    print(quote.c, quote.a, quote.b, quote.spread)
+    print(client.latest('BINANCE:BTCUSDT'))
+
+Quotes are immutable snapshots. Every update builds a new Quote and swaps
+it into the store with a single assignment, so readers never see a
+half-updated quote and never take a lock.
+"""
+
+import asyncio
+import threading
+import time
+
+from fcs_decoder import as_tick
+
+
+class Quote:
+    """
+    Immutable merged quote for one symbol/timeframe.
+
+    Attributes:
+        version (int): Store-wide update sequence number of this snapshot
+        updated_at (float): Local time of the update (time.time())
+        stale (bool): Restored from a saved state file, not yet updated live
+    """
+
+    __slots__ = (
+        'symbol',
+        'timeframe',
+        'mode',
+        't',
+        'o',
+        'h',
+        'l',
+        'c',
+        'v',
+        'a',
+        'b',
+        'version',
+        'updated_at',
+        'stale',
+    )
+
+    def __init__(
+        self,
+        symbol,
+        timeframe,
+        mode=None,
+        t=None,
+        o=None,
+        h=None,
+        l=None,
+        c=None,
+        v=None,
+        a=None,
+        b=None,
+        version=0,
+        updated_at=None,
+        stale=False,
+    ):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.mode = mode
+        self.t = t
+        self.o = o
+        self.h = h
+        self.l = l
+        self.c = c
+        self.v = v
+        self.a = a
+        self.b = b
+        self.version = version
+        self.updated_at = updated_at
+        self.stale = stale
+
+    @property
+    def key(self):
+        return f"{self.symbol.upper()}_{self.timeframe}"
+
+    @property
+    def mid(self):
+        """(ask + bid) / 2, or None without both sides."""
+        try:
+            return (float(self.a) + float(self.b)) / 2
+        except (TypeError, ValueError):
+            return None
+
+    @property
+    def spread(self):
+        """ask - bid, or None without both sides."""
+        try:
+            return float(self.a) - float(self.b)
+        except (TypeError, ValueError):
+            return None
+
+    @property
+    def age(self):
+        """Seconds since this quote was updated locally."""
+        return time.time() - self.updated_at if self.updated_at else None
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return (
+            f'Quote({self.symbol!r}, {self.timeframe!r}, c={self.c}, a={self.a}, b={self.b}, '
+            f'version={self.version}{", stale" if self.stale else ""})'
+        )
+
+
+class QuoteStore:
+    """
+    Copy-on-write store of the latest Quote per key and per symbol.
+
+    Updates come from one thread (the client's receive thread). Reads are
+    lock-free dict lookups. Waiters are only woken when someone is waiting
+    on that symbol, so the store costs no lock traffic otherwise.
+    """
+
+    def __init__(self):
+        self.version = 0  # Total updates applied
+        self._quotes = {}  # key -> Quote
+        self._by_symbol = {}  # SYMBOL -> Quote (latest across timeframes)
+        self._cond = threading.Condition()
+        self._waiters = {}  # SYMBOL -> number of blocking waiters
+        self._futures = {}  # SYMBOL -> [(loop, future)] for async waiters
+
+    # ============================================
+    # Updates
+    # ============================================
+
+    def on_message(self, data):
+        """Listener entry point: merge a price frame into the store."""
+        tick = as_tick(data)
+        if tick is None or not tick.symbol:
+            return
+        self.update(tick)
+
+    def update(self, tick):
+        """
+        Merge a PriceTick into the quote for its key.
+
+        Fields the tick does not carry (None) keep their previous value.
+
+        Returns:
+            Quote: The new snapshot
+        """
+        symbol = tick.symbol.upper()
+        key = f"{symbol}_{tick.timeframe}"
+        previous = self._quotes.get(key)
+        self.version += 1
+        if previous is None:
+            quote = Quote(
+                tick.symbol,
+                tick.timeframe,
+                tick.mode,
+                tick.t,
+                tick.o,
+                tick.h,
+                tick.l,
+                tick.c,
+                tick.v,
+                tick.a,
+                tick.b,
+                self.version,
+                time.time(),
+            )
+        else:
+            quote = Quote(
+                tick.symbol,
+                tick.timeframe,
+                tick.mode if tick.mode is not None else previous.mode,
+                tick.t if tick.t is not None else previous.t,
+                tick.o if tick.o is not None else previous.o,
+                tick.h if tick.h is not None else previous.h,
+                tick.l if tick.l is not None else previous.l,
+                tick.c if tick.c is not None else previous.c,
+                tick.v if tick.v is not None else previous.v,
+                tick.a if tick.a is not None else previous.a,
+                tick.b if tick.b is not None else previous.b,
+                self.version,
+                time.time(),
+            )
+        self._quotes[key] = quote
+        self._by_symbol[symbol] = quote
+
+        if symbol in self._waiters:
+            with self._cond:
+                self._cond.notify_all()
+        if symbol in self._futures:
+            self._resolve_futures(symbol, quote)
+        return quote
+
+    def preload(self, quotes):
+        """
+        Seed the store with restored quotes, marked stale.
+
+        Preloaded quotes have version 0, so wait_for_update() still waits
+        for the first live update. Keys that already have a quote are skipped.
+
+        Args:
+            quotes (list): Quote objects or dicts of Quote fields
+        """
+        for quote in quotes:
+            if isinstance(quote, dict):
+                quote = Quote(**{k: v for k, v in quote.items() if k in Quote.__slots__})
+            if not quote.symbol:
+                continue
+            symbol = quote.symbol.upper()
+            key = f"{symbol}_{quote.timeframe}"
+            if key in self._quotes:
+                continue
+            quote = Quote(
+                quote.symbol,
+                quote.timeframe,
+                quote.mode,
+                quote.t,
+                quote.o,
+                quote.h,
+                quote.l,
+                quote.c,
+                quote.v,
+                quote.a,
+                quote.b,
+                0,
+                quote.updated_at,
+                True,
+            )
+            self._quotes[key] = quote
+            current = self._by_symbol.get(symbol)
+            if current is None or (
+                current.stale and (current.updated_at or 0) < (quote.updated_at or 0)
+            ):
+                self._by_symbol[symbol] = quote
+
+    def clear(self):
+        """Drop all quotes."""
+        self._quotes = {}
+        self._by_symbol = {}
+
+    # ============================================
+    # Reads
+    # ============================================
+
+    def get(self, symbol, timeframe):
+        """Quote for a symbol/timeframe, or None."""
+        return self._quotes.get(f"{symbol.upper()}_{timeframe}")
+
+    def latest(self, symbol, timeframe=None):
+        """
+        Most recent quote for a symbol.
+
+        Args:
+            symbol (str): Symbol, e.g. 'BINANCE:BTCUSDT'
+            timeframe (str, optional): Only this timeframe (default: whichever updated last)
+
+        Returns:
+            Quote: Snapshot, or None if nothing received yet
+        """
+        if timeframe is not None:
+            return self.get(symbol, timeframe)
+        return self._by_symbol.get(symbol.upper())
+
+    def snapshot(self):
+        """Dict of key -> Quote for every key (a consistent copy)."""
+        return dict(self._quotes)
+
+    def keys(self):
+        return list(self._quotes)
+
+    def __len__(self):
+        return len(self._quotes)
+
+    # ============================================
+    # Waiting
+    # ============================================
+
+    def wait_for_update(self, symbol, timeout=None, since=None):
+        """
+        Block until the symbol has a quote newer than `since`.
+
+        Args:
+            symbol (str): Symbol to wait for
+            timeout (float, optional): Max seconds to wait
+            since (int, optional): Version to compare against (default: the
+                symbol's current version, i.e. wait for the next update)
+
+        Returns:
+            Quote: The new quote, or None on timeout
+        """
+        symbol = symbol.upper()
+        if since is None:
+            current = self._by_symbol.get(symbol)
+            since = current.version if current is not None else 0
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._cond:
+            self._waiters[symbol] = self._waiters.get(symbol, 0) + 1
+            try:
+                while True:
+                    quote = self._by_symbol.get(symbol)
+                    if quote is not None and quote.version > since:
+                        return quote
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return None
+                    self._cond.wait(remaining)
+            finally:
+                count = self._waiters[symbol] - 1
+                if count:
+                    self._waiters[symbol] = count
+                else:
+                    del self._waiters[symbol]
+
+    async def wait_for_update_async(self, symbol, timeout=None, since=None):
+        """
+        Async version of wait_for_update() for use on an asyncio loop.
+
+        Returns:
+            Quote: The new quote, or None on timeout
+        """
+        symbol = symbol.upper()
+        current = self._by_symbol.get(symbol)
+        if since is None:
+            since = current.version if current is not None else 0
+        elif current is not None and current.version > since:
+            return current
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        entry = (loop, future)
+        with self._cond:
+            self._futures[symbol] = self._futures.get(symbol, []) + [entry]
+        try:
+            current = self._by_symbol.get(symbol)
+            if current is not None and current.version > since:
+                return current  # Updated before the future was registered
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            with self._cond:
+                remaining = [e for e in self._futures.get(symbol, ()) if e is not entry]
+                if remaining:
+                    self._futures[symbol] = remaining
+                else:
+                    self._futures.pop(symbol, None)
+
+    def _resolve_futures(self, symbol, quote):
+        with self._cond:
+            entries = self._futures.pop(symbol, ())
+        for loop, future in entries:
+            loop.call_soon_threadsafe(_set_result, future, quote)
+
+
+def _set_result(future, value):
+    if not future.done():
+        future.set_result(value)
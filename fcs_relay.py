@@ -0,0 +1,387 @@
+"""
+FCS relay gateway
+
+Holds one upstream FCSClient connection and serves local clients over
+WebSocket (TCP or Unix socket) with the same protocol: welcome, ping/pong,
+join_symbol, leave_symbol and remove_all. Downstream interest is reference
+counted, so a symbol wanted by ten local services is subscribed upstream
+once. Upstream frames are forwarded as received, without re-encoding.
+
+Usage:
+    from fcs_relay import FCSRelay
+
+    relay = FCSRelay('YOUR_API_KEY', port=8766)
+    relay.start()
+
+    # Local services connect with the normal client:
+    client = FCSClient('local', 'ws://127.0.0.1:8766')
+
+Command line:
+    python fcs_relay.py --api-key YOUR_API_KEY --port 8766
+    python fcs_relay.py --api-key YOUR_API_KEY --unix /tmp/fcs.sock
+
+Install:
+    pip install websocket-client websockets
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+
+from fcs_client_lib import FCSClient
+from fcs_decoder import PriceTick
+
+try:
+    import websockets
+except ImportError:
+    raise ImportError("Please install websockets: pip install websockets")
+
+
+class _Session:
+    """One downstream connection."""
+
+    def __init__(self, ws, queue_size):
+        self.ws = ws
+        self.keys = {}  # key -> (symbol, timeframe)
+        self.queue = asyncio.Queue(queue_size)
+        self.dropped = 0
+
+
+class FCSRelay:
+    """
+    Subscription-deduplicating relay between one upstream connection and
+    many local clients.
+
+    Attributes:
+        client (FCSClient): Upstream client (configure show_logs, reconnect_* on it)
+        forwarded (int): Frames queued to downstream sessions
+        dropped (int): Frames dropped because a session's queue was full
+    """
+
+    def __init__(
+        self, api_key, url=None, host='127.0.0.1', port=8766, unix_path=None, queue_size=10000
+    ):
+        """
+        Initialize relay.
+
+        Args:
+            api_key (str): Your FCS API key (used upstream only)
+            url (str, optional): Upstream WebSocket server URL
+            host (str): Local interface to listen on
+            port (int): Local port (0 = pick a free port)
+            unix_path (str, optional): Listen on this Unix socket instead of TCP
+            queue_size (int): Max frames buffered per downstream session; a
+                session that falls further behind loses frames instead of
+                slowing down the others
+        """
+        self.client = FCSClient(api_key, url)
+        self.client.reconnect_limit = None
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.queue_size = queue_size
+        self.show_logs = False
+
+        self.forwarded = 0
+        self.dropped = 0
+
+        self._sessions = set()
+        self._by_key = {}  # key -> set of sessions
+        self._refcount = {}  # key -> number of sessions
+        self._last_frame = {}  # key -> last raw price frame
+        self._raw = None  # Raw frame currently being handled on the receive thread
+        self._pending = deque()
+        self._drain_scheduled = False
+
+        self._server = None
+        self._loop = None
+        self._thread = None
+
+        self.client.add_raw_listener(self._on_raw)
+        self.client.add_listener(self._on_message)
+
+    @property
+    def url(self):
+        """Local endpoint URL."""
+        if self.unix_path:
+            return f'unix://{self.unix_path}'
+        return f'ws://{self.host}:{self.port}'
+
+    # ============================================
+    # Lifecycle
+    # ============================================
+
+    def start(self, timeout=10):
+        """
+        Connect upstream and start serving locally. Returns self.
+
+        Args:
+            timeout (float, optional): Max seconds to wait for the upstream welcome
+        """
+        if self._thread and self._thread.is_alive():
+            return self
+
+        self._loop = asyncio.new_event_loop()
+        ready = threading.Event()
+        errors = []
+
+        def run():
+            asyncio.set_event_loop(self._loop)
+            try:
+                self._loop.run_until_complete(self._serve())
+            except Exception as e:
+                errors.append(e)
+                ready.set()
+                return
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name='fcs-relay')
+        self._thread.daemon = True
+        self._thread.start()
+        ready.wait()
+        if errors:
+            raise errors[0]
+
+        self.client.connect()
+        self.client.run_forever(blocking=False)
+        deadline = None if timeout is None else time.time() + timeout
+        while not self.client.is_connected and (deadline is None or time.time() < deadline):
+            time.sleep(0.01)
+        if self.show_logs:
+            print(f'[FCS] Relay listening on {self.url}')
+        return self
+
+    def stop(self, timeout=5):
+        """Close downstream sessions, stop serving and disconnect upstream."""
+        self.client.disconnect()
+        if self._loop is None:
+            return
+        future = asyncio.run_coroutine_threadsafe(self._close(), self._loop)
+        try:
+            future.result(timeout)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout)
+            self._loop = None
+            self._thread = None
+
+    def run_forever(self):
+        """Start and block until interrupted."""
+        self.start()
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    async def _serve(self):
+        if self.unix_path:
+            self._server = await websockets.unix_serve(
+                self._handler, self.unix_path, compression=None, max_size=None
+            )
+        else:
+            self._server = await websockets.serve(
+                self._handler, self.host, self.port, compression=None, max_size=None
+            )
+            self.port = self._server.sockets[0].getsockname()[1]
+
+    async def _close(self):
+        for session in list(self._sessions):
+            await session.ws.close(1001, 'relay stopping')
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    # ============================================
+    # Upstream (receive thread)
+    # ============================================
+
+    def _on_raw(self, message):
+        # Byte-oriented transports deliver bytes; forward text frames downstream
+        self._raw = message if type(message) is str else bytes(message).decode('utf-8')
+
+    def _on_message(self, data):
+        """Queue the raw frame for the sessions interested in its key."""
+        if type(data) is PriceTick:
+            key = data.key
+            self._last_frame[key] = self._raw
+        else:
+            symbol = data.get('symbol')
+            if not symbol:
+                return
+            key = f"{symbol.upper()}_{data.get('timeframe')}"
+            if data.get('type') == 'price':
+                self._last_frame[key] = self._raw
+        if key not in self._refcount:
+            return
+
+        self._pending.append((key, self._raw))
+        if not self._drain_scheduled:
+            self._drain_scheduled = True
+            loop = self._loop
+            if loop is not None:
+                loop.call_soon_threadsafe(self._drain)
+
+    # ============================================
+    # Downstream (event-loop thread)
+    # ============================================
+
+    def _drain(self):
+        """Move queued upstream frames to session queues."""
+        self._drain_scheduled = False
+        pending = self._pending
+        by_key = self._by_key
+        while pending:
+            key, raw = pending.popleft()
+            for session in by_key.get(key, ()):
+                self._enqueue(session, raw)
+
+    def _enqueue(self, session, raw):
+        try:
+            session.queue.put_nowait(raw)
+            self.forwarded += 1
+        except asyncio.QueueFull:
+            session.dropped += 1
+            self.dropped += 1
+
+    async def _handler(self, ws, path=None):
+        session = _Session(ws, self.queue_size)
+        self._sessions.add(session)
+        writer = asyncio.ensure_future(self._writer(session))
+        try:
+            await ws.send(json.dumps({'type': 'welcome', 'message': 'Connected to FCS relay'}))
+            async for raw in ws:
+                try:
+                    data = json.loads(raw)
+                except ValueError:
+                    continue
+                if isinstance(data, dict):
+                    self._handle_request(session, data)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            writer.cancel()
+            self._sessions.discard(session)
+            for key in list(session.keys):
+                self._release(session, key)
+
+    async def _writer(self, session):
+        queue = session.queue
+        send = session.ws.send
+        try:
+            while True:
+                await send(await queue.get())
+        except websockets.exceptions.ConnectionClosed:
+            pass
+
+    def _handle_request(self, session, data):
+        msg_type = data.get('type')
+        if msg_type == 'ping':
+            self._enqueue(session, json.dumps({'type': 'pong', 'timestamp': data.get('timestamp')}))
+        elif msg_type == 'join_symbol':
+            symbol, timeframe = data.get('symbol'), data.get('timeframe')
+            if symbol and timeframe:
+                self._acquire(session, symbol, timeframe)
+        elif msg_type == 'leave_symbol':
+            symbol, timeframe = data.get('symbol'), data.get('timeframe')
+            if symbol and timeframe:
+                self._release(session, f"{symbol.upper()}_{timeframe}")
+        elif msg_type == 'remove_all':
+            for key in list(session.keys):
+                self._release(session, key)
+
+    def _acquire(self, session, symbol, timeframe):
+        """Add a session's interest in a key; joins upstream on the first one."""
+        key = f"{symbol.upper()}_{timeframe}"
+        if key not in session.keys:
+            session.keys[key] = (symbol, timeframe)
+            self._by_key.setdefault(key, set()).add(session)
+            count = self._refcount.get(key, 0) + 1
+            self._refcount[key] = count
+            if count == 1:
+                self.client.join(symbol, timeframe)
+                if self.show_logs:
+                    print(f'[FCS] Relay joined upstream {symbol} {timeframe}')
+                return
+
+        # Already subscribed upstream: confirm and replay the latest price locally
+        if key in self.client.active_subscriptions:
+            self._enqueue(
+                session,
+                json.dumps(
+                    {
+                        'type': 'message',
+                        'short': 'joined_room',
+                        'symbol': symbol,
+                        'timeframe': timeframe,
+                        'message': f'Joined {symbol} {timeframe}',
+                    }
+                ),
+            )
+            last = self._last_frame.get(key)
+            if last is not None:
+                self._enqueue(session, last)
+
+    def _release(self, session, key):
+        """Drop a session's interest in a key; leaves upstream after the last one."""
+        entry = session.keys.pop(key, None)
+        if entry is None:
+            return
+        sessions = self._by_key.get(key)
+        if sessions is not None:
+            sessions.discard(session)
+            if not sessions:
+                del self._by_key[key]
+        count = self._refcount.get(key, 0) - 1
+        if count > 0:
+            self._refcount[key] = count
+            return
+        self._refcount.pop(key, None)
+        self._last_frame.pop(key, None)
+        self.client.leave(*entry)
+        if self.show_logs:
+            print(f'[FCS] Relay left upstream {entry[0]} {entry[1]}')
+
+    # ============================================
+    # Inspection
+    # ============================================
+
+    def stats(self):
+        return {
+            'sessions': len(self._sessions),
+            'upstream_subscriptions': len(self._refcount),
+            'downstream_subscriptions': sum(self._refcount.values()),
+            'forwarded': self.forwarded,
+            'dropped': self.dropped,
+            'upstream_connected': self.client.is_connected,
+        }
+
+    def refcounts(self):
+        """Dict of key -> number of downstream sessions subscribed."""
+        return dict(self._refcount)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='FCS relay gateway')
+    parser.add_argument('--api-key', required=True)
+    parser.add_argument('--url', default=None, help='upstream WebSocket URL')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--unix', default=None, help='listen on a Unix socket path instead of TCP')
+    parser.add_argument('--logs', action='store_true', help='print connection logs')
+    args = parser.parse_args()
+
+    relay = FCSRelay(args.api_key, args.url, host=args.host, port=args.port, unix_path=args.unix)
+    relay.show_logs = relay.client.show_logs = args.logs
+    relay.run_forever()
+
+
+if __name__ == '__main__':
+    main()
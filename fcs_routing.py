@@ -0,0 +1,149 @@
+"""
+FCS message routing
+
+Registry that maps a message to the handlers registered for its type, symbol
+and timeframe, so applications don't need an if/elif chain in on_message.
+
+Usage:
+    from fcs_client_lib import FCSClient
+
+    client = FCSClient('YOUR_API_KEY')
+
+    @client.on_price('BINANCE:BTCUSDT', '1D')   # exact symbol + timeframe
+    def btc_daily(data): ...
+
+    @client.on_price('FX:EURUSD')               # any timeframe
+    def eurusd(data): ...
+
+    @client.on_price('BINANCE:*')               # every symbol of an exchange
+    def binance(data): ...
+
+    @client.on_type('message')                  # server messages (joined_room, ...)
+    def server_message(data): ...
+
+Lookups are dict hits: the handler list for a symbol/timeframe pair is
+computed once and cached until routes change.
+"""
+
+ANY = '*'
+
+
+def _split_exchange(symbol):
+    """'BINANCE:BTCUSDT' -> 'BINANCE:*', or None without an exchange prefix."""
+    exchange, sep, _ = symbol.partition(':')
+    return exchange + ':' + ANY if sep else None
+
+
+class Router:
+    """
+    Handler registry keyed by message type and price symbol/timeframe.
+
+    Price handlers for a frame run from most to least specific: exact symbol
+    and timeframe, symbol on any timeframe, exchange prefix, then '*', each
+    group in registration order, after on_type('price') handlers.
+    """
+
+    def __init__(self):
+        self.routes = 0  # Number of registered handlers (0 = routing skipped)
+        self._types = {}  # message type -> tuple of handlers
+        self._prices = {}  # (PATTERN, timeframe or None) -> tuple of handlers
+        self._cache = {}  # (symbol, timeframe) as received -> tuple of handlers
+
+    # ============================================
+    # Registration
+    # ============================================
+
+    def add_price(self, func, symbol=ANY, timeframe=None):
+        """
+        Route price frames to func.
+
+        Args:
+            func (callable): Handler, called with the message
+            symbol (str): 'EXCHANGE:SYMBOL', 'EXCHANGE:*' or '*' for every symbol
+            timeframe (str, optional): Only this timeframe (None = any)
+        """
+        key = (symbol.upper(), None if timeframe is None else str(timeframe))
+        prices = dict(self._prices)
+        prices[key] = prices.get(key, ()) + (func,)
+        self._prices = prices
+        self._changed()
+        return func
+
+    def add_type(self, func, msg_type):
+        """
+        Route every message of a type ('price', 'message', 'pong', ...) to func.
+        """
+        types = dict(self._types)
+        types[msg_type] = types.get(msg_type, ()) + (func,)
+        self._types = types
+        self._changed()
+        return func
+
+    def remove(self, func):
+        """Remove func from every route it was registered on."""
+        self._types = {
+            k: v
+            for k, v in ((k, tuple(f for f in v if f != func)) for k, v in self._types.items())
+            if v
+        }
+        self._prices = {
+            k: v
+            for k, v in ((k, tuple(f for f in v if f != func)) for k, v in self._prices.items())
+            if v
+        }
+        self._changed()
+
+    def clear(self):
+        """Remove all routes."""
+        self._types = {}
+        self._prices = {}
+        self._changed()
+
+    def _changed(self):
+        self.routes = sum(len(v) for v in self._types.values()) + sum(
+            len(v) for v in self._prices.values()
+        )
+        self._cache = {}
+
+    # ============================================
+    # Lookup
+    # ============================================
+
+    def handlers(self, data):
+        """
+        Handlers for a message (dict or PriceTick), in call order.
+
+        Returns:
+            tuple: Handlers (empty if none match)
+        """
+        msg_type = data.get('type')
+        if msg_type != 'price':
+            return self._types.get(msg_type, ())
+
+        symbol = data.get('symbol')
+        timeframe = data.get('timeframe')
+        cache = self._cache
+        handlers = cache.get((symbol, timeframe))
+        if handlers is None:
+            handlers = cache[(symbol, timeframe)] = self._resolve(symbol, timeframe)
+        return handlers
+
+    def _resolve(self, symbol, timeframe):
+        """Build the handler tuple for one symbol/timeframe pair."""
+        prices = self._prices
+        handlers = self._types.get('price', ())
+        timeframe = None if timeframe is None else str(timeframe)
+        patterns = []
+        if symbol:
+            symbol = symbol.upper()
+            patterns.append(symbol)
+            exchange = _split_exchange(symbol)
+            if exchange:
+                patterns.append(exchange)
+        patterns.append(ANY)
+
+        for pattern in patterns:
+            if timeframe is not None:
+                handlers += prices.get((pattern, timeframe), ())
+            handlers += prices.get((pattern, None), ())
+        return handlers
@@ -0,0 +1,286 @@
+"""
+FCS shared timer scheduler
+
+One process-wide timer thread backed by a heap. Clients register their
+heartbeats and other periodic work here instead of starting a thread each.
+
+Usage:
+    from fcs_scheduler import get_scheduler
+
+    handle = get_scheduler().call_every(25, send_ping)
+    ...
+    handle.cancel()
+
+Callbacks run on the scheduler thread and must return quickly; anything slow
+delays every other timer in the process. Callbacks that do blocking I/O
+(socket sends, file writes, fsync) pass a Worker, which runs them on its
+own thread instead:
+
+    worker = Worker('fcs-client-io')
+    handle = get_scheduler().call_every(25, send_ping, worker=worker)
+"""
+
+import heapq
+import itertools
+import queue
+import random
+import sys
+import threading
+import time
+
+
+class TimerHandle:
+    """Handle for a scheduled call; cancel() stops it from (re)running."""
+
+    __slots__ = ('when', 'interval', 'func', 'args', 'cancelled', 'worker', 'queued')
+
+    def __init__(self, when, interval, func, args, worker=None):
+        self.when = when
+        self.interval = interval
+        self.func = func
+        self.args = args
+        self.cancelled = False
+        self.worker = worker
+        self.queued = False  # Handed to the worker and not finished yet
+
+    def cancel(self):
+        """Cancel the call. Safe to call from any thread, more than once."""
+        self.cancelled = True
+
+    def __repr__(self):
+        state = 'cancelled' if self.cancelled else 'active'
+        return f'TimerHandle({getattr(self.func, "__name__", self.func)!r}, {state})'
+
+
+class Scheduler:
+    """
+    Heap-based timer scheduler running on a single daemon thread.
+
+    Times use time.monotonic(). Cancelled handles are discarded lazily when
+    they reach the top of the heap.
+    """
+
+    def __init__(self, name='fcs-scheduler'):
+        """
+        Initialize scheduler. The thread starts with the first scheduled call.
+
+        Args:
+            name (str): Thread name
+        """
+        self.name = name
+        # Called with (exception, handle) when a callback raises; logged to
+        # stderr if unset. Errors in calls run on a Worker go to the worker's.
+        self.on_error = None
+        self.errors = 0  # Callbacks that raised
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+
+    @property
+    def pending(self):
+        """Number of scheduled entries, including cancelled ones not yet discarded."""
+        return len(self._heap)
+
+    def call_later(self, delay, func, *args, worker=None):
+        """
+        Run func(*args) once after delay seconds.
+
+        Args:
+            delay (float): Seconds before the call
+            func (callable): Callback
+            worker (Worker, optional): Run func on this worker's thread instead
+
+        Returns:
+            TimerHandle: Handle to cancel the call
+        """
+        handle = TimerHandle(time.monotonic() + delay, None, func, args, worker)
+        self._push(handle)
+        return handle
+
+    def call_every(self, interval, func, *args, delay=None, worker=None):
+        """
+        Run func(*args) every interval seconds.
+
+        Args:
+            interval (float): Seconds between runs
+            func (callable): Callback
+            delay (float, optional): Seconds before the first run (default: interval)
+            worker (Worker, optional): Run func on this worker's thread instead; a
+                run that is due while the previous one is still queued or running
+                is skipped
+
+        Returns:
+            TimerHandle: Handle to cancel the repetition
+        """
+        if interval <= 0:
+            raise ValueError('interval must be > 0')
+        first = interval if delay is None else delay
+        handle = TimerHandle(time.monotonic() + first, interval, func, args, worker)
+        self._push(handle)
+        return handle
+
+    def _push(self, handle):
+        with self._cond:
+            heapq.heappush(self._heap, (handle.when, next(self._seq), handle))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name)
+                self._thread.daemon = True
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self):
+        """Timer loop: sleep until the earliest entry is due, then run it."""
+        while True:
+            with self._cond:
+                while True:
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    when, _, handle = self._heap[0]
+                    if handle.cancelled:
+                        heapq.heappop(self._heap)
+                        continue
+                    delay = when - time.monotonic()
+                    if delay > 0:
+                        self._cond.wait(delay)
+                        continue
+                    heapq.heappop(self._heap)
+                    break
+
+            if handle.worker is not None:
+                if not handle.queued:
+                    handle.queued = True
+                    handle.worker.submit(self._call, handle)
+            else:
+                self._call(handle)
+
+            if handle.interval is not None and not handle.cancelled:
+                # Keep a fixed cadence; skip missed beats instead of bursting
+                now = time.monotonic()
+                handle.when += handle.interval
+                if handle.when <= now:
+                    handle.when = now + handle.interval
+                self._push(handle)
+
+    def _call(self, handle):
+        try:
+            if not handle.cancelled:
+                handle.func(*handle.args)
+        except Exception as e:
+            if handle.worker is not None:
+                handle.worker.report(e)
+            else:
+                self.errors += 1
+                if callable(self.on_error):
+                    self.on_error(e, handle)
+                else:
+                    _log_error(f'timer {handle!r}', e)
+        finally:
+            handle.queued = False
+
+
+class Worker:
+    """
+    Runs submitted calls one at a time, in order, on a daemon thread.
+
+    Gives timer callbacks that block (sends, file writes) a thread of their
+    own, so a stalled connection or disk only delays its owner's work. The
+    thread starts on the first submit() and exits after `idle` seconds
+    without work.
+    """
+
+    def __init__(self, name='fcs-worker', idle=30.0):
+        """
+        Initialize worker.
+
+        Args:
+            name (str): Thread name
+            idle (float): Seconds without work before the thread exits
+        """
+        self.name = name
+        self.idle = idle
+        self.on_error = None  # Called with the exception when a call raises (default: stderr)
+        self.errors = 0  # Calls that raised
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, func, *args):
+        """Queue func(*args) to run on the worker thread."""
+        with self._lock:
+            self._queue.put((func, args))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name)
+                self._thread.daemon = True
+                self._thread.start()
+
+    def _run(self):
+        get = self._queue.get
+        while True:
+            try:
+                func, args = get(timeout=self.idle)
+            except queue.Empty:
+                with self._lock:
+                    if self._queue.empty():
+                        self._thread = None
+                        return
+                continue
+            try:
+                func(*args)
+            except Exception as e:
+                self.report(e)
+
+    def report(self, error):
+        """Count a failed call and pass it to on_error (logged to stderr if unset)."""
+        self.errors += 1
+        if callable(self.on_error):
+            self.on_error(error)
+        else:
+            _log_error(f'worker {self.name!r}', error)
+
+
+def _log_error(source, error):
+    """Last-resort report for callback errors nobody handles."""
+    print(f'[FCS] Error in {source}: {error!r}', file=sys.stderr)
+
+
+def backoff_delay(attempt, first_delay, delay, max_delay, jitter):
+    """
+    Reconnect delay shared by FCSClient and AsyncFCSClient.
+
+    The first retry waits first_delay; later ones wait delay * 2^(attempt - 2),
+    capped at max_delay, minus up to `jitter` of that at random.
+
+    Args:
+        attempt (int): Reconnect attempt number (1-based)
+        first_delay (float): Seconds before the first retry
+        delay (float): Base backoff in seconds
+        max_delay (float): Backoff cap in seconds
+        jitter (float): Random reduction of each delay, 0-1
+
+    Returns:
+        float: Seconds to wait
+    """
+    if attempt <= 1:
+        return first_delay
+    delay = min(max_delay, delay * (2 ** (attempt - 2)))
+    return delay * (1 - jitter * random.random())
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """
+    Process-wide shared scheduler.
+
+    Returns:
+        Scheduler: The shared instance (created on first use)
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = Scheduler()
+        return _scheduler
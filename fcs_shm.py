@@ -0,0 +1,396 @@
+"""
+FCS shared-memory fan-out
+
+One process owns the WebSocket connection and publishes every price frame
+into a shared-memory ring buffer; any number of local processes attach a
+reader and consume the same ticks, without their own connection or
+subscriptions.
+
+Usage (publisher process):
+    from fcs_client_lib import FCSClient
+
+    client = FCSClient('YOUR_API_KEY')
+    publisher = client.enable_shm_publisher(name='fcs_ticks', capacity=65536)
+    client.connect()
+    client.join('BINANCE:BTCUSDT', '1D')
+    client.run_forever()
+
+Usage (worker processes):
+    from fcs_shm import ShmReader
+
+    reader = ShmReader('fcs_ticks')
+    for tick in reader:              # PriceTick objects, blocks while idle
+        print(tick.symbol, tick.c)
+
+Layout (little-endian):
+    header   64 bytes: magic, layout version, capacity, record size,
+             write sequence, key count, max keys
+    keys     max_keys x 64 bytes: symbol (48) + timeframe (16), UTF-8
+    records  capacity x 88 bytes: slot sequence, key id, mode, then
+             t, o, h, l, c, v, a, b, published_at as float64 (NaN = missing)
+
+Each slot carries its own sequence number (seqlock): odd while being
+written, 2 * (seq + 1) once complete. A reader checks it before and after
+copying a record, so torn or lapped records are detected and counted in
+`lost` instead of being returned. There is a single writer; readers never
+block it. A reader that falls more than `capacity` records behind skips
+ahead and counts the gap as lost.
+"""
+
+import math
+import struct
+import sys
+import time
+
+from fcs_decoder import PriceTick, as_tick
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    raise ImportError("Shared-memory fan-out requires Python 3.8+")
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+MAGIC = b'FCSR'
+LAYOUT_VERSION = 1
+HEADER_SIZE = 64
+KEY_SIZE = 64
+SYMBOL_SIZE = 48
+
+MODES = (None, 'initial', 'candle', 'askbid')
+_MODE_CODES = {mode: code for code, mode in enumerate(MODES)}
+FIELDS = ('t', 'o', 'h', 'l', 'c', 'v', 'a', 'b')
+
+_HEADER = struct.Struct('<4sIII')  # magic, version, capacity, record size
+_U64 = struct.Struct('<Q')
+_U32 = struct.Struct('<I')
+_RECORD = struct.Struct('<QIB3x9d')  # slot seq, key id, mode, 8 price fields, published_at
+_BODY = struct.Struct('<IB3x9d')  # record without the slot sequence
+_KEY = struct.Struct(f'<{SYMBOL_SIZE}s{KEY_SIZE - SYMBOL_SIZE}s')
+
+_WRITE_SEQ_OFFSET = 16
+_KEY_COUNT_OFFSET = 24
+_MAX_KEYS_OFFSET = 28
+_NAN = float('nan')
+
+
+def _to_float(value):
+    if value is None:
+        return _NAN
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return _NAN
+
+
+# Segments created by a publisher in this process (inherited by forked children,
+# which share the parent's resource tracker)
+_created = set()
+
+
+def _attach(name):
+    """Attach to an existing segment without the resource tracker unlinking it at exit."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    shm = shared_memory.SharedMemory(name=name)
+    if shm.name in _created:
+        return shm
+    try:
+        from multiprocessing import resource_tracker
+
+        resource_tracker.unregister(shm._name, 'shared_memory')
+    except Exception:
+        pass
+    return shm
+
+
+class ShmPublisher:
+    """
+    Single-writer ring of price ticks in shared memory.
+
+    Attributes:
+        name (str): Shared memory name readers attach to
+        published (int): Ticks written
+        dropped (int): Ticks dropped because the key table was full
+    """
+
+    def __init__(self, name=None, capacity=65536, max_keys=4096):
+        """
+        Create the shared-memory segment.
+
+        Args:
+            name (str, optional): Segment name (default: generated, see .name)
+            capacity (int): Records in the ring; readers may lag this far behind
+            max_keys (int): Max distinct symbol/timeframe keys
+        """
+        if capacity < 1 or max_keys < 1:
+            raise ValueError('capacity and max_keys must be >= 1')
+        self.capacity = capacity
+        self.max_keys = max_keys
+        self.published = 0
+        self.dropped = 0
+
+        self._data_offset = HEADER_SIZE + max_keys * KEY_SIZE
+        size = self._data_offset + capacity * _RECORD.size
+        self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self.name = self._shm.name
+        self._buf = self._shm.buf
+        self._keys = {}  # key -> id
+        _created.add(self.name)
+
+        _HEADER.pack_into(self._buf, 0, MAGIC, LAYOUT_VERSION, capacity, _RECORD.size)
+        _U64.pack_into(self._buf, _WRITE_SEQ_OFFSET, 0)
+        _U32.pack_into(self._buf, _KEY_COUNT_OFFSET, 0)
+        _U32.pack_into(self._buf, _MAX_KEYS_OFFSET, max_keys)
+
+    def on_message(self, data):
+        """Listener entry point: publish price frames."""
+        tick = as_tick(data)
+        if tick is not None and tick.symbol:
+            self.publish(tick)
+
+    def publish(self, tick):
+        """
+        Write one PriceTick into the ring.
+
+        Returns:
+            bool: False if the tick was dropped (key table full or closed)
+        """
+        buf = self._buf
+        if buf is None:
+            return False
+        key = (tick.symbol, tick.timeframe)
+        key_id = self._keys.get(key)
+        if key_id is None:
+            key_id = self._add_key(tick.symbol, tick.timeframe)
+            if key_id is None:
+                self.dropped += 1
+                return False
+
+        seq = self.published
+        offset = self._data_offset + (seq % self.capacity) * _RECORD.size
+        _U64.pack_into(buf, offset, 2 * seq + 1)  # Writing
+        _BODY.pack_into(
+            buf,
+            offset + 8,
+            key_id,
+            _MODE_CODES.get(tick.mode, 0),
+            _to_float(tick.t),
+            _to_float(tick.o),
+            _to_float(tick.h),
+            _to_float(tick.l),
+            _to_float(tick.c),
+            _to_float(tick.v),
+            _to_float(tick.a),
+            _to_float(tick.b),
+            time.time(),
+        )
+        _U64.pack_into(buf, offset, 2 * seq + 2)  # Complete
+        self.published = seq + 1
+        _U64.pack_into(buf, _WRITE_SEQ_OFFSET, seq + 1)
+        return True
+
+    def _add_key(self, symbol, timeframe):
+        key_id = len(self._keys)
+        if key_id >= self.max_keys:
+            return None
+        _KEY.pack_into(
+            self._buf,
+            HEADER_SIZE + key_id * KEY_SIZE,
+            str(symbol).encode('utf-8')[:SYMBOL_SIZE],
+            str(timeframe).encode('utf-8')[: KEY_SIZE - SYMBOL_SIZE],
+        )
+        self._keys[(symbol, timeframe)] = key_id
+        _U32.pack_into(self._buf, _KEY_COUNT_OFFSET, key_id + 1)
+        return key_id
+
+    def stats(self):
+        return {
+            'name': self.name,
+            'published': self.published,
+            'dropped': self.dropped,
+            'keys': len(self._keys),
+            'capacity': self.capacity,
+        }
+
+    def close(self, unlink=True):
+        """
+        Detach from the segment.
+
+        Args:
+            unlink (bool): Also remove the segment (readers keep their mapping until they close)
+        """
+        if self._buf is None:
+            return
+        self._buf.release()
+        self._buf = None
+        self._shm.close()
+        if unlink:
+            self._shm.unlink()
+            _created.discard(self.name)
+
+
+class ShmReader:
+    """
+    Reader attached to a publisher's ring, usable from any local process.
+
+    Records are read straight out of the shared mapping; nothing is sent
+    through a pipe or socket. Iterating yields PriceTick objects and blocks
+    (sleep-polling) while no new ticks are available.
+
+    Attributes:
+        lost (int): Records skipped because the reader fell behind or hit a torn write
+        received (int): Records returned
+    """
+
+    def __init__(self, name, start='latest', idle_sleep=0.0005):
+        """
+        Attach to a publisher.
+
+        Args:
+            name (str): Segment name (ShmPublisher.name)
+            start (str): 'latest' (only new ticks) or 'oldest' (everything still in the ring)
+            idle_sleep (float): Seconds to sleep between polls while idle
+        """
+        self._shm = _attach(name)
+        self._buf = self._shm.buf
+        magic, version, capacity, record_size = _HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC or version != LAYOUT_VERSION or record_size != _RECORD.size:
+            self.close()
+            raise ValueError(f'Not an FCS tick ring: {name}')
+        self.name = name
+        self.capacity = capacity
+        self.max_keys = _U32.unpack_from(self._buf, _MAX_KEYS_OFFSET)[0]
+        self.idle_sleep = idle_sleep
+        self.lost = 0
+        self.received = 0
+
+        self._data_offset = HEADER_SIZE + self.max_keys * KEY_SIZE
+        self._keys = []  # id -> (symbol, timeframe)
+        write_seq = self._write_seq()
+        self._next = write_seq if start == 'latest' else max(0, write_seq - capacity)
+
+    def _write_seq(self):
+        return _U64.unpack_from(self._buf, _WRITE_SEQ_OFFSET)[0]
+
+    def _load_keys(self):
+        """Read key table entries added since the last call."""
+        keys = self._keys
+        count = _U32.unpack_from(self._buf, _KEY_COUNT_OFFSET)[0]
+        for i in range(len(keys), count):
+            symbol, timeframe = _KEY.unpack_from(self._buf, HEADER_SIZE + i * KEY_SIZE)
+            keys.append(
+                (symbol.rstrip(b'\0').decode('utf-8'), timeframe.rstrip(b'\0').decode('utf-8'))
+            )
+
+    def _key(self, key_id):
+        if key_id >= len(self._keys):
+            self._load_keys()
+        return self._keys[key_id] if key_id < len(self._keys) else (None, None)
+
+    @property
+    def lag(self):
+        """Records published but not yet read."""
+        return self._write_seq() - self._next
+
+    def poll(self, max_items=None):
+        """
+        Read available ticks without blocking.
+
+        Args:
+            max_items (int, optional): Max ticks to return
+
+        Returns:
+            list: PriceTick objects, oldest first
+        """
+        buf = self._buf
+        write_seq = self._write_seq()
+        seq = self._next
+        if write_seq - seq > self.capacity:
+            # Fell behind by more than the ring holds
+            self.lost += write_seq - self.capacity - seq
+            seq = write_seq - self.capacity
+        end = write_seq if max_items is None else min(write_seq, seq + max_items)
+
+        ticks = []
+        capacity = self.capacity
+        data_offset = self._data_offset
+        size = _RECORD.size
+        unpack_from = _RECORD.unpack_from
+        u64 = _U64.unpack_from
+        while seq < end:
+            offset = data_offset + (seq % capacity) * size
+            record = unpack_from(buf, offset)
+            expected = 2 * seq + 2
+            if record[0] != expected or u64(buf, offset)[0] != expected:
+                # Overwritten by a newer lap while we were reading
+                self.lost += 1
+                seq += 1
+                continue
+            ticks.append(self._tick(record))
+            seq += 1
+        self._next = seq
+        self.received += len(ticks)
+        return ticks
+
+    def _tick(self, record):
+        symbol, timeframe = self._key(record[1])
+        values = [None if math.isnan(v) else v for v in record[3:11]]
+        return PriceTick(
+            symbol, timeframe, MODES[record[2]] if record[2] < len(MODES) else None, *values
+        )
+
+    def __iter__(self):
+        while self._buf is not None:
+            ticks = self.poll(1024)
+            if not ticks:
+                time.sleep(self.idle_sleep)
+                continue
+            yield from ticks
+
+    def run(self, callback, stop=None):
+        """
+        Call callback(tick) for every tick until stop (a threading/multiprocessing Event) is set.
+        """
+        while self._buf is not None and not (stop is not None and stop.is_set()):
+            ticks = self.poll(1024)
+            if not ticks:
+                time.sleep(self.idle_sleep)
+                continue
+            for tick in ticks:
+                callback(tick)
+
+    def records(self):
+        """
+        Zero-copy NumPy structured view of the whole ring (requires numpy).
+
+        Fields: seq, key, mode, t, o, h, l, c, v, a, b, published_at. Slot i
+        holds sequence number seq // 2 - 1; check seq before trusting a slot.
+        Delete the array before close(), which cannot release a buffer still
+        in use.
+        """
+        if numpy is None:
+            raise ImportError("Please install numpy: pip install numpy")
+        dtype = numpy.dtype(
+            [('seq', '<u8'), ('key', '<u4'), ('mode', 'u1'), ('_pad', 'V3')]
+            + [(name, '<f8') for name in FIELDS + ('published_at',)]
+        )
+        return numpy.ndarray(
+            (self.capacity,), dtype=dtype, buffer=self._buf, offset=self._data_offset
+        )
+
+    def key_names(self):
+        """List of (symbol, timeframe) by key id (matches records()['key'])."""
+        self._load_keys()
+        return list(self._keys)
+
+    def close(self):
+        """Detach from the segment (never unlinks it)."""
+        if self._buf is None:
+            return
+        self._buf.release()
+        self._buf = None
+        self._shm.close()
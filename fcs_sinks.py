@@ -0,0 +1,479 @@
+"""
+FCS persistence sinks
+
+Write price frames to SQLite, CSV or Parquet without blocking the receive
+thread. Frames are copied into a bounded in-memory buffer as rows; a
+background thread writes everything buffered in one batch every
+`flush_interval` seconds, or sooner once `batch_size` rows are waiting.
+
+Usage:
+    from fcs_client_lib import FCSClient
+    from fcs_sinks import SQLiteSink, CSVSink, ParquetSink
+
+    client = FCSClient('YOUR_API_KEY')
+    client.add_sink(SQLiteSink('ticks.db'))
+    client.add_sink(CSVSink('csv/', rotate_interval=3600))
+    client.add_sink(ParquetSink('parquet/'))  # requires pyarrow
+
+    print(client.sinks[0].stats())  # written, rows_per_sec, lag, dropped, ...
+
+Every row has the columns in COLUMNS: local receive time, then symbol,
+timeframe, mode and the t/o/h/l/c/v/a/b price fields (None when absent).
+
+Install (optional, for ParquetSink):
+    pip install pyarrow
+"""
+
+import csv
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+
+from fcs_batching import to_row
+from fcs_decoder import PriceTick
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+COLUMNS = ('received', 'symbol', 'timeframe', 'mode', 't', 'o', 'h', 'l', 'c', 'v', 'a', 'b')
+
+# Columns stored as numbers
+NUMERIC = ('received', 't', 'o', 'h', 'l', 'c', 'v', 'a', 'b')
+
+
+def _to_float(value):
+    """Convert a price field to float; returns None for missing or invalid values."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class Sink:
+    """
+    Bounded row buffer plus a background writer thread.
+
+    Subclasses implement open(), write(rows) and close(); all three run on
+    the writer thread. When the buffer is full the oldest rows are dropped
+    (and counted) rather than blocking the receive thread.
+
+    Attributes:
+        received (int): Price frames buffered
+        written (int): Rows written
+        dropped (int): Rows dropped because the buffer was full
+        errors (int): Failed writes (their rows are dropped)
+        lag (float): Seconds between receiving and writing the oldest row of the last batch
+    """
+
+    name = 'sink'
+
+    def __init__(self, flush_interval=1.0, batch_size=5000, max_buffer=100000, on_error=None):
+        """
+        Initialize sink.
+
+        Args:
+            flush_interval (float): Write buffered rows at least this often (seconds)
+            batch_size (int): Write early once this many rows are buffered
+            max_buffer (int): Max rows held in memory
+            on_error (callable, optional): Called with exceptions raised while writing
+        """
+        if max_buffer < 1:
+            raise ValueError('max_buffer must be >= 1')
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_buffer = max_buffer
+        self.on_error = on_error
+
+        # Counters
+        self.received = 0
+        self.written = 0
+        self.dropped = 0
+        self.errors = 0
+        self.batches = 0
+        self.lag = 0.0
+        self.last_flush_ms = 0.0
+        self._write_seconds = 0.0
+
+        self._buffer = deque(maxlen=max_buffer)
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    # ============================================
+    # Lifecycle
+    # ============================================
+
+    def start(self):
+        """Start the writer thread. Returns self for chaining."""
+        if self._thread and self._thread.is_alive():
+            return self
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=f'fcs-{self.name}')
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self, flush=True, timeout=None):
+        """
+        Stop the writer thread and close the output.
+
+        Args:
+            flush (bool): Write rows still buffered first
+            timeout (float, optional): Max seconds to wait for the thread
+        """
+        if not flush:
+            self._buffer.clear()
+        self._stop_event.set()
+        self._wake.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    # ============================================
+    # Input (receive thread)
+    # ============================================
+
+    def on_message(self, data):
+        """Listener entry point: buffer a price frame as a row."""
+        if type(data) is not PriceTick:
+            if not isinstance(data, dict) or data.get('type') != 'price':
+                return
+        buffer = self._buffer
+        if len(buffer) == self.max_buffer:
+            self.dropped += 1
+        buffer.append((time.time(),) + to_row(data))
+        self.received += 1
+        if len(buffer) == self.batch_size:
+            self._wake.set()
+
+    # ============================================
+    # Writer thread
+    # ============================================
+
+    def _run(self):
+        try:
+            self.open()
+        except Exception as e:
+            self._report(e)
+            return
+        try:
+            while not self._stop_event.is_set():
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+                self.flush()
+            self.flush()
+        finally:
+            try:
+                self.close()
+            except Exception as e:
+                self._report(e)
+
+    def flush(self):
+        """Write everything buffered (writer thread only)."""
+        buffer = self._buffer
+        count = len(buffer)
+        if not count:
+            self.idle()
+            return
+        popleft = buffer.popleft
+        rows = [popleft() for _ in range(count)]
+        started = time.perf_counter()
+        try:
+            self.write(rows)
+        except Exception as e:
+            self.errors += 1
+            self._report(e)
+            return
+        elapsed = time.perf_counter() - started
+        self._write_seconds += elapsed
+        self.last_flush_ms = elapsed * 1000
+        self.lag = time.time() - rows[0][0]
+        self.written += count
+        self.batches += 1
+
+    def _report(self, error):
+        if callable(self.on_error):
+            self.on_error(error)
+
+    # ============================================
+    # Output (subclasses)
+    # ============================================
+
+    def open(self):
+        """Open the output (writer thread)."""
+
+    def write(self, rows):
+        """Write a batch of rows (writer thread)."""
+        raise NotImplementedError
+
+    def idle(self):
+        """Called by the writer thread on a flush with nothing to write."""
+
+    def close(self):
+        """Close the output (writer thread)."""
+
+    # ============================================
+    # Inspection
+    # ============================================
+
+    @property
+    def pending(self):
+        """Rows buffered and not yet written."""
+        return len(self._buffer)
+
+    def stats(self):
+        """Snapshot of counters as a dict."""
+        return {
+            'received': self.received,
+            'written': self.written,
+            'pending': self.pending,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'batches': self.batches,
+            'rows_per_sec': self.written / self._write_seconds if self._write_seconds else 0.0,
+            'last_flush_ms': self.last_flush_ms,
+            'lag': self.lag,
+        }
+
+
+class SQLiteSink(Sink):
+    """
+    Append rows to a SQLite table with executemany, one transaction per batch.
+
+    The database is opened in WAL mode so readers can query it while ticks
+    are being written.
+    """
+
+    name = 'sqlite-sink'
+
+    def __init__(self, path, table='ticks', **kwargs):
+        """
+        Initialize SQLite sink.
+
+        Args:
+            path (str): Database file
+            table (str): Table name (created if missing)
+            **kwargs: Sink options (flush_interval, batch_size, max_buffer, on_error)
+        """
+        if not table.replace('_', '').isalnum():
+            raise ValueError(f'Invalid table name: {table}')
+        super().__init__(**kwargs)
+        self.path = path
+        self.table = table
+        self._db = None
+        self._insert = (
+            f'INSERT INTO {table} ({", ".join(COLUMNS)}) '
+            f'VALUES ({", ".join("?" * len(COLUMNS))})'
+        )
+
+    def open(self):
+        db = sqlite3.connect(self.path)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=NORMAL')
+        columns = ', '.join(f'{name} {"REAL" if name in NUMERIC else "TEXT"}' for name in COLUMNS)
+        db.execute(f'CREATE TABLE IF NOT EXISTS {self.table} ({columns})')
+        db.commit()
+        self._db = db
+
+    def write(self, rows):
+        with self._db:
+            self._db.executemany(self._insert, rows)
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+class _RotatingSink(Sink):
+    """Sink writing to a sequence of timestamped files in a directory."""
+
+    extension = ''
+
+    def __init__(self, directory, prefix='ticks', rotate_interval=3600, rotate_rows=None, **kwargs):
+        """
+        Initialize rotating sink.
+
+        Args:
+            directory (str): Output directory (created if missing)
+            prefix (str): File name prefix
+            rotate_interval (float, optional): Start a new file after this many seconds
+            rotate_rows (int, optional): Start a new file after this many rows
+            **kwargs: Sink options (flush_interval, batch_size, max_buffer, on_error)
+        """
+        super().__init__(**kwargs)
+        self.directory = directory
+        self.prefix = prefix
+        self.rotate_interval = rotate_interval
+        self.rotate_rows = rotate_rows
+        self.files = []  # Paths written, oldest first
+        self._opened_at = None
+        self._file_rows = 0
+
+    @property
+    def path(self):
+        """File currently being written, or None."""
+        return self.files[-1] if self._opened_at is not None else None
+
+    def open(self):
+        os.makedirs(self.directory, exist_ok=True)
+
+    def write(self, rows):
+        if self._opened_at is not None and self._due():
+            self._rotate()
+        if self._opened_at is None:
+            self._start_file()
+        self.write_rows(rows)
+        self._file_rows += len(rows)
+
+    def idle(self):
+        if self._opened_at is not None and self._due():
+            self._rotate()
+
+    def close(self):
+        if self._opened_at is not None:
+            self._rotate()
+
+    def _due(self):
+        if self.rotate_rows and self._file_rows >= self.rotate_rows:
+            return True
+        return bool(self.rotate_interval) and time.time() - self._opened_at >= self.rotate_interval
+
+    def _start_file(self):
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        path = os.path.join(self.directory, f'{self.prefix}-{stamp}{self.extension}')
+        n = 1
+        while os.path.exists(path) or path in self.files:
+            path = os.path.join(self.directory, f'{self.prefix}-{stamp}-{n}{self.extension}')
+            n += 1
+        self.open_file(path)
+        self.files.append(path)
+        self._opened_at = time.time()
+        self._file_rows = 0
+
+    def _rotate(self):
+        self.close_file()
+        self._opened_at = None
+
+    def open_file(self, path):
+        raise NotImplementedError
+
+    def write_rows(self, rows):
+        raise NotImplementedError
+
+    def close_file(self):
+        raise NotImplementedError
+
+
+class CSVSink(_RotatingSink):
+    """
+    Append rows to CSV files, starting a new file every rotate_interval
+    seconds or rotate_rows rows.
+    """
+
+    name = 'csv-sink'
+    extension = '.csv'
+
+    def __init__(
+        self,
+        directory,
+        prefix='ticks',
+        rotate_interval=3600,
+        rotate_rows=None,
+        header=True,
+        **kwargs,
+    ):
+        """
+        Initialize CSV sink.
+
+        Args:
+            directory (str): Output directory (created if missing)
+            prefix (str): File name prefix ('ticks-20250101-120000.csv')
+            rotate_interval (float, optional): Start a new file after this many seconds
+            rotate_rows (int, optional): Start a new file after this many rows
+            header (bool): Write a header line to each file
+            **kwargs: Sink options (flush_interval, batch_size, max_buffer, on_error)
+        """
+        super().__init__(directory, prefix, rotate_interval, rotate_rows, **kwargs)
+        self.header = header
+        self._file = None
+        self._writer = None
+
+    def open_file(self, path):
+        self._file = open(path, 'w', newline='')
+        self._writer = csv.writer(self._file)
+        if self.header:
+            self._writer.writerow(COLUMNS)
+
+    def write_rows(self, rows):
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def close_file(self):
+        self._file.close()
+        self._file = None
+        self._writer = None
+
+
+class ParquetSink(_RotatingSink):
+    """
+    Write rows to Parquet files, one row group per batch. A file is only
+    readable once it is rotated or the sink is stopped.
+    """
+
+    name = 'parquet-sink'
+    extension = '.parquet'
+
+    def __init__(
+        self,
+        directory,
+        prefix='ticks',
+        rotate_interval=3600,
+        rotate_rows=None,
+        compression='snappy',
+        **kwargs,
+    ):
+        """
+        Initialize Parquet sink.
+
+        Args:
+            directory (str): Output directory (created if missing)
+            prefix (str): File name prefix ('ticks-20250101-120000.parquet')
+            rotate_interval (float, optional): Start a new file after this many seconds
+            rotate_rows (int, optional): Start a new file after this many rows
+            compression (str): Parquet compression codec
+            **kwargs: Sink options (flush_interval, batch_size, max_buffer, on_error)
+        """
+        if pyarrow is None:
+            raise ImportError("Please install pyarrow: pip install pyarrow")
+        super().__init__(directory, prefix, rotate_interval, rotate_rows, **kwargs)
+        self.compression = compression
+        self.schema = pyarrow.schema(
+            [(name, pyarrow.float64() if name in NUMERIC else pyarrow.string()) for name in COLUMNS]
+        )
+        self._writer = None
+
+    def open_file(self, path):
+        self._writer = pyarrow.parquet.ParquetWriter(
+            path, self.schema, compression=self.compression
+        )
+
+    def write_rows(self, rows):
+        arrays = []
+        for index, (name, values) in enumerate(zip(COLUMNS, zip(*rows))):
+            if name in NUMERIC:
+                values = [_to_float(v) for v in values]
+            arrays.append(pyarrow.array(values, type=self.schema.field(index).type))
+        self._writer.write_table(pyarrow.Table.from_arrays(arrays, schema=self.schema))
+
+    def close_file(self):
+        self._writer.close()
+        self._writer = None
@@ -0,0 +1,241 @@
+"""
+FCS warm-start state
+
+Saves the subscription list and the latest quote per key to a file at
+intervals, and restores both when the process starts again: quotes are
+served by client.latest() immediately (marked stale) and every saved
+subscription is rejoined as soon as the server's welcome arrives.
+
+The file is JSON, written to a temporary file in the same directory and
+moved into place with os.replace(), so a crash mid-write never leaves a
+truncated state file behind.
+
+Usage:
+    from fcs_client_lib import FCSClient
+
+    client = FCSClient('YOUR_API_KEY')
+    client.enable_state('fcs_state.json', interval=5)   # restores, then saves every 5 s
+    client.connect()
+    client.run_forever(blocking=False)
+
+    quote = client.latest('BINANCE:BTCUSDT')   # available before the first tick
+    quote.stale                                # True until a live update arrives
+"""
+
+import json
+import os
+import tempfile
+import time
+
+from fcs_scheduler import get_scheduler
+from fcs_subscriptions import CONFIRMED, PENDING, TIMED_OUT
+
+FORMAT_VERSION = 1
+
+
+def read_state(path):
+    """
+    Read a state file.
+
+    Returns:
+        dict: {'saved_at', 'subscriptions': [[symbol, timeframe], ...], 'quotes': [{...}]},
+            or None if the file is missing or unreadable
+    """
+    try:
+        with open(path, 'rb') as f:
+            state = json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get('version') != FORMAT_VERSION:
+        return None
+    return state
+
+
+def write_state(path, subscriptions, quotes):
+    """
+    Atomically replace the state file.
+
+    Args:
+        path (str): State file path
+        subscriptions (list): (symbol, timeframe) pairs
+        quotes (list): Quote objects
+    """
+    state = {
+        'version': FORMAT_VERSION,
+        'saved_at': time.time(),
+        'subscriptions': [list(pair) for pair in subscriptions],
+        'quotes': [quote.to_dict() for quote in quotes],
+    }
+    data = json.dumps(state, separators=(',', ':')).encode('utf-8')
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix='.fcs-state-', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return len(data)
+
+
+class WarmStart:
+    """
+    Periodic state snapshots for one client, plus restore on startup.
+
+    Attributes:
+        restored_subscriptions (int): Subscriptions rejoined from the file
+        restored_quotes (int): Quotes preloaded from the file
+        saves (int): Snapshots written
+        last_save_ms (float): Time spent writing the last snapshot
+    """
+
+    def __init__(self, client, path, interval=5.0, max_age=None):
+        """
+        Initialize warm start.
+
+        Args:
+            client (FCSClient): Client to snapshot and restore
+            path (str): State file path
+            interval (float): Seconds between snapshots (0 = only on save()/stop())
+            max_age (float, optional): Ignore a state file saved longer ago than this
+        """
+        self.client = client
+        self.path = path
+        self.interval = interval
+        self.max_age = max_age
+
+        self.restored_subscriptions = 0
+        self.restored_quotes = 0
+        self.saves = 0
+        self.last_save_ms = 0.0
+        self.last_size = 0
+
+        self._saved_version = None
+        self._saved_keys = None
+        self._timer = None
+
+    # ============================================
+    # Restore
+    # ============================================
+
+    def restore(self):
+        """
+        Load the state file: preload quotes (stale) and queue joins for the
+        saved subscriptions, which are sent after the next welcome.
+
+        Returns:
+            bool: True if a usable state file was found
+        """
+        state = read_state(self.path)
+        if state is None:
+            return False
+        client = self.client
+        age = time.time() - (state.get('saved_at') or 0)
+        if self.max_age is not None and age > self.max_age:
+            if client.show_logs:
+                print(f'[FCS] State file is {age:.0f}s old, not restoring')
+            return False
+
+        quotes = state.get('quotes') or []
+        if quotes:
+            client.enable_quotes().preload(quotes)
+            self.restored_quotes = len(quotes)
+
+        count = 0
+        for pair in state.get('subscriptions') or []:
+            if len(pair) == 2 and client.join(pair[0], pair[1]) is not None:
+                count += 1
+        self.restored_subscriptions = count
+
+        if client.show_logs:
+            print(
+                f'[FCS] Restored {count} subscriptions and {len(quotes)} quotes '
+                f'from {self.path} ({age:.1f}s old)'
+            )
+        return True
+
+    # ============================================
+    # Snapshots
+    # ============================================
+
+    def start(self):
+        """Start periodic snapshots. Returns self for chaining."""
+        if self.interval and self._timer is None:
+            # save() writes and fsyncs, so it runs on the client's io worker
+            self._timer = get_scheduler().call_every(
+                self.interval, self.save, delay=self.interval, worker=self.client.io_worker
+            )
+        return self
+
+    def stop(self, save=True):
+        """
+        Stop periodic snapshots.
+
+        Args:
+            save (bool): Write a final snapshot
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if save:
+            self.save()
+
+    def subscriptions(self):
+        """(symbol, timeframe) pairs the client wants: confirmed, pending or awaiting retry."""
+        client = self.client
+        wanted = {}
+        for key, entry in list(client.active_subscriptions.items()):
+            wanted[key] = (entry['symbol'], entry['timeframe'])
+        for state in (CONFIRMED, PENDING, TIMED_OUT):
+            for sub in client.subscriptions.by_state(state):
+                wanted.setdefault(sub.key, (sub.symbol, sub.timeframe))
+        return list(wanted.values())
+
+    def save(self, force=False):
+        """
+        Write a snapshot if subscriptions or quotes changed since the last one.
+
+        Args:
+            force (bool): Write even if nothing changed
+
+        Returns:
+            bool: True if the file was written
+        """
+        client = self.client
+        subscriptions = self.subscriptions()
+        keys = frozenset(subscriptions)
+        quotes = client.quotes
+        version = quotes.version if quotes is not None else None
+        if not force and keys == self._saved_keys and version == self._saved_version:
+            return False
+
+        started = time.perf_counter()
+        try:
+            snapshot = quotes.snapshot() if quotes is not None else {}
+            self.last_size = write_state(self.path, subscriptions, snapshot.values())
+        except Exception as e:
+            if client.show_logs:
+                print(f'[FCS] State save failed: {e}')
+            client._handle_callback_error(e)
+            return False
+        self.last_save_ms = (time.perf_counter() - started) * 1000
+        self.saves += 1
+        self._saved_keys = keys
+        self._saved_version = version
+        return True
+
+    def stats(self):
+        return {
+            'path': self.path,
+            'restored_subscriptions': self.restored_subscriptions,
+            'restored_quotes': self.restored_quotes,
+            'saves': self.saves,
+            'last_save_ms': self.last_save_ms,
+            'last_size': self.last_size,
+        }
@@ -0,0 +1,418 @@
+"""
+FCS subscription manager
+
+Tracks every join/leave intent per subscription key, queues intents made
+while offline, sends them in paced batches once the server's welcome has
+arrived, and records how long each join took to be confirmed.
+
+Usage:
+    from fcs_client_lib import FCSClient
+
+    client = FCSClient('YOUR_API_KEY')
+    client.subscriptions.batch_size = 100      # joins per batch
+    client.subscriptions.batch_interval = 0.1  # seconds between batches
+
+    client.join('BINANCE:BTCUSDT', '1D')   # queued until connected
+    client.connect()
+    client.run_forever(blocking=False)
+
+    client.subscriptions.wait(timeout=10)
+    print(client.subscriptions.stats())
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from fcs_scheduler import get_scheduler
+from fcs_wire import encode_join, encode_leave
+
+# Subscription states
+PENDING = 'pending'
+CONFIRMED = 'confirmed'
+FAILED = 'failed'
+TIMED_OUT = 'timed_out'
+LEAVING = 'leaving'
+
+STATES = (PENDING, CONFIRMED, FAILED, TIMED_OUT, LEAVING)
+
+
+class Subscription:
+    """State of one symbol/timeframe subscription."""
+
+    __slots__ = (
+        'symbol',
+        'timeframe',
+        'state',
+        'requested_at',
+        'sent_at',
+        'confirmed_at',
+        'attempts',
+        'error',
+        '_previous_state',
+    )
+
+    def __init__(self, symbol, timeframe):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.state = PENDING
+        self.requested_at = time.time()
+        self.sent_at = None
+        self.confirmed_at = None
+        self.attempts = 0
+        self.error = None
+        self._previous_state = None
+
+    @property
+    def key(self):
+        return f"{self.symbol.upper()}_{self.timeframe}"
+
+    @property
+    def latency(self):
+        """Seconds from the last join being sent to its confirmation, or None."""
+        if self.sent_at is None or self.confirmed_at is None:
+            return None
+        return self.confirmed_at - self.sent_at
+
+    def to_dict(self):
+        return {
+            'symbol': self.symbol,
+            'timeframe': self.timeframe,
+            'state': self.state,
+            'requested_at': self.requested_at,
+            'sent_at': self.sent_at,
+            'confirmed_at': self.confirmed_at,
+            'latency': self.latency,
+            'attempts': self.attempts,
+            'error': self.error,
+        }
+
+    def __repr__(self):
+        return f'Subscription({self.symbol!r}, {self.timeframe!r}, state={self.state!r})'
+
+
+class SubscriptionManager:
+    """
+    Join/leave intent queue with paced sending and per-key state tracking.
+
+    Intents are keyed by 'SYMBOL_TIMEFRAME'. A join followed by a leave for
+    the same key before the join was sent cancels out and nothing goes on
+    the wire. On every welcome (first connect or reconnect) all wanted keys
+    are re-queued and sent again in batches.
+    """
+
+    def __init__(self, client, batch_size=100, batch_interval=0.1, confirm_timeout=10):
+        """
+        Initialize subscription manager.
+
+        Args:
+            client (FCSClient): Client used to send requests
+            batch_size (int): Max join/leave requests sent per batch
+            batch_interval (float): Seconds between batches
+            confirm_timeout (float): Seconds before an unconfirmed join is marked timed_out
+        """
+        self.client = client
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.confirm_timeout = confirm_timeout
+
+        self._subscriptions = {}  # key -> Subscription
+        self._queue = OrderedDict()  # key -> ('join' | 'leave', symbol, timeframe)
+        self._lock = threading.RLock()
+        self._settled = threading.Condition(self._lock)
+        self._online = False
+        self._flush_timer = None
+        self._timeout_timer = None
+
+    # ============================================
+    # Intents (called by FCSClient.join/leave/remove_all)
+    # ============================================
+
+    def join(self, symbol, timeframe):
+        """
+        Record a join intent and send it when possible.
+
+        Returns:
+            Subscription: State record for the key
+        """
+        key = f"{symbol.upper()}_{timeframe}"
+        with self._lock:
+            sub = self._subscriptions.get(key)
+            queued = self._queue.get(key)
+
+            if sub is not None and sub.state == LEAVING and queued and queued[0] == 'leave':
+                # Leave not sent yet: cancel it and keep the existing subscription
+                del self._queue[key]
+                sub.state = sub._previous_state
+                return sub
+
+            if sub is not None and sub.state in (PENDING, CONFIRMED):
+                return sub
+
+            sub = Subscription(symbol, timeframe)
+            self._subscriptions[key] = sub
+            self._queue[key] = ('join', symbol, timeframe)
+        self._schedule_flush(0)
+        return sub
+
+    def leave(self, symbol, timeframe):
+        """Record a leave intent; cancels a join that has not been sent yet."""
+        key = f"{symbol.upper()}_{timeframe}"
+        with self._lock:
+            sub = self._subscriptions.get(key)
+            queued = self._queue.get(key)
+
+            if queued and queued[0] == 'join':
+                # Join never reached the server: drop both
+                del self._queue[key]
+                self._subscriptions.pop(key, None)
+                self._settled.notify_all()
+                return
+
+            if sub is None or sub.state == LEAVING:
+                return
+            if not self._online:
+                # Nothing to undo on the server; the next welcome starts clean
+                self._subscriptions.pop(key, None)
+                self._settled.notify_all()
+                return
+
+            sub._previous_state = sub.state
+            sub.state = LEAVING
+            self._queue[key] = ('leave', symbol, timeframe)
+        self._schedule_flush(0)
+
+    def remove_all(self):
+        """Drop all intents and state."""
+        with self._lock:
+            self._queue.clear()
+            self._subscriptions.clear()
+            self._settled.notify_all()
+
+    # ============================================
+    # Connection events (called by FCSClient)
+    # ============================================
+
+    def on_welcome(self):
+        """Server is ready: queue a join for every wanted key and start sending."""
+        with self._lock:
+            self._online = True
+            self._queue.clear()
+            for key, sub in list(self._subscriptions.items()):
+                if sub.state == LEAVING:
+                    del self._subscriptions[key]
+                    continue
+                sub.state = PENDING
+                sub.sent_at = None
+                sub.confirmed_at = None
+                sub.error = None
+                self._queue[key] = ('join', sub.symbol, sub.timeframe)
+        self._schedule_flush(0)
+
+    def on_disconnect(self):
+        """Connection lost: stop sending; wanted keys are re-queued on the next welcome."""
+        with self._lock:
+            self._online = False
+            self._cancel_timers()
+
+    def on_confirmed(self, symbol, timeframe):
+        """Handle a joined_room confirmation."""
+        key = f"{symbol.upper()}_{timeframe}"
+        with self._lock:
+            sub = self._subscriptions.get(key)
+            if sub is None:
+                # Joined outside the manager (e.g. by another tool on this connection)
+                sub = Subscription(symbol, timeframe)
+                self._subscriptions[key] = sub
+            if sub.state == LEAVING:
+                return sub
+            sub.state = CONFIRMED
+            sub.confirmed_at = time.time()
+            sub.error = None
+            self._settled.notify_all()
+        if self.client.show_logs and sub.latency is not None:
+            print(f'[FCS] Confirmed {symbol} {timeframe} in {sub.latency * 1000:.0f} ms')
+        return sub
+
+    def on_failed(self, symbol, timeframe, error=None):
+        """Mark a pending join as failed (server rejected it)."""
+        key = f"{symbol.upper()}_{timeframe}"
+        with self._lock:
+            sub = self._subscriptions.get(key)
+            if sub is None or sub.state != PENDING:
+                return
+            sub.state = FAILED
+            sub.error = error
+            self._settled.notify_all()
+
+    # ============================================
+    # Inspection
+    # ============================================
+
+    def get(self, symbol, timeframe):
+        """Subscription record for a symbol/timeframe, or None."""
+        return self._subscriptions.get(f"{symbol.upper()}_{timeframe}")
+
+    def by_state(self, state):
+        """List of Subscription records in a given state."""
+        with self._lock:
+            return [sub for sub in self._subscriptions.values() if sub.state == state]
+
+    @property
+    def queued(self):
+        """Number of requests waiting to be sent."""
+        return len(self._queue)
+
+    def stats(self):
+        """Counts per state plus confirmation latency summary."""
+        with self._lock:
+            subs = list(self._subscriptions.values())
+            queued = len(self._queue)
+        counts = dict.fromkeys(STATES, 0)
+        latencies = []
+        for sub in subs:
+            counts[sub.state] += 1
+            if sub.latency is not None:
+                latencies.append(sub.latency)
+        counts['queued'] = queued
+        counts['total'] = len(subs)
+        counts['latency_avg'] = sum(latencies) / len(latencies) if latencies else None
+        counts['latency_max'] = max(latencies) if latencies else None
+        return counts
+
+    def wait(self, timeout=None):
+        """
+        Block until no subscription is pending or leaving.
+
+        Returns:
+            bool: True if everything settled, False on timeout
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        with self._lock:
+            while self._queue or any(
+                s.state in (PENDING, LEAVING) for s in self._subscriptions.values()
+            ):
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._settled.wait(remaining)
+            return True
+
+    def resubscribe(self, symbol, timeframe):
+        """
+        Send leave_symbol + join_symbol for one key now, bypassing the queue.
+
+        Used to restart a single stream that stopped without a disconnect.
+
+        Returns:
+            bool: False if offline (the next welcome rejoins everything anyway)
+        """
+        key = f"{symbol.upper()}_{timeframe}"
+        with self._lock:
+            if not self._online:
+                return False
+            self._queue.pop(key, None)
+            sub = self._subscriptions.get(key)
+            if sub is None:
+                sub = self._subscriptions[key] = Subscription(symbol, timeframe)
+            sub.state = PENDING
+            sub.sent_at = time.time()
+            sub.confirmed_at = None
+            sub.attempts += 1
+        self.client._send(encode_leave(symbol, timeframe))
+        self.client._send(encode_join(symbol, timeframe))
+        self._schedule_timeout_check()
+        return True
+
+    def retry_failed(self):
+        """Re-queue joins that failed or timed out."""
+        with self._lock:
+            for key, sub in self._subscriptions.items():
+                if sub.state in (FAILED, TIMED_OUT):
+                    sub.state = PENDING
+                    sub.error = None
+                    self._queue[key] = ('join', sub.symbol, sub.timeframe)
+        self._schedule_flush(0)
+
+    # ============================================
+    # Sending
+    # ============================================
+
+    def flush(self):
+        """Send the next batch of queued requests; schedules the following batch."""
+        # The batch is taken under the lock but sent without it, so a slow
+        # send never holds up on_confirmed()/on_failed() on the receive thread
+        with self._lock:
+            self._flush_timer = None
+            if not self._online or not self._queue:
+                return 0
+
+            batch = []
+            while self._queue and len(batch) < self.batch_size:
+                key, (op, symbol, timeframe) = self._queue.popitem(last=False)
+                if op == 'join':
+                    sub = self._subscriptions.get(key)
+                else:
+                    sub = self._subscriptions.pop(key, None)
+                batch.append((op, symbol, timeframe, sub))
+
+        now = time.time()
+        for op, symbol, timeframe, sub in batch:
+            if op == 'join':
+                self.client._send(encode_join(symbol, timeframe))
+            else:
+                self.client._send(encode_leave(symbol, timeframe))
+
+        with self._lock:
+            for op, _, _, sub in batch:
+                if op == 'join' and sub is not None:
+                    sub.sent_at = now
+                    sub.attempts += 1
+            self._settled.notify_all()
+            more = bool(self._queue)
+
+        if more:
+            self._schedule_flush(self.batch_interval)
+        self._schedule_timeout_check()
+        return len(batch)
+
+    def check_timeouts(self):
+        """Mark joins unconfirmed for longer than confirm_timeout as timed_out."""
+        with self._lock:
+            self._timeout_timer = None
+            cutoff = time.time() - self.confirm_timeout
+            waiting = False
+            for sub in self._subscriptions.values():
+                if sub.state != PENDING or sub.sent_at is None:
+                    continue
+                if sub.sent_at <= cutoff:
+                    sub.state = TIMED_OUT
+                    self._settled.notify_all()
+                else:
+                    waiting = True
+        if waiting:
+            self._schedule_timeout_check()
+
+    def _schedule_flush(self, delay):
+        with self._lock:
+            if not self._online or self._flush_timer is not None:
+                return
+            # flush() sends, so it runs on the client's io worker
+            self._flush_timer = get_scheduler().call_later(
+                delay, self.flush, worker=self.client.io_worker
+            )
+
+    def _schedule_timeout_check(self):
+        with self._lock:
+            if not self._online or self._timeout_timer is not None:
+                return
+            self._timeout_timer = get_scheduler().call_later(
+                self.confirm_timeout, self.check_timeouts
+            )
+
+    def _cancel_timers(self):
+        for timer in (self._flush_timer, self._timeout_timer):
+            if timer is not None:
+                timer.cancel()
+        self._flush_timer = None
+        self._timeout_timer = None
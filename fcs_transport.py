@@ -0,0 +1,435 @@
+"""
+FCS transports
+
+The connection layer under FCSClient. A transport is created per client
+with the URL and four callbacks, and must provide:
+
+    run()         Connect and read until the connection closes (blocking);
+                  may be called again to reconnect
+    send(text)    Send one text frame
+    close()       Close the connection from any thread
+
+and call on_open(transport), on_message(transport, message),
+on_error(transport, error) and on_close(transport, code, reason), the same
+signatures websocket-client's WebSocketApp uses. `message` may be str or
+bytes; every decoder backend accepts both.
+
+Backends:
+    'websocket-client'  WebSocketClientTransport (default)
+    'websockets'        WebsocketsTransport - websockets' sync client
+                        (websockets >= 12); hands frames to the decoder as
+                        bytes without a UTF-8 decode (>= 13) and can
+                        negotiate permessage-deflate
+    LoopbackServer      In-memory server and transport for tests and
+                        benchmarks, no sockets involved
+
+Usage:
+    from functools import partial
+    from fcs_client_lib import FCSClient
+    from fcs_transport import LoopbackServer, WebsocketsTransport
+
+    client = FCSClient('YOUR_API_KEY', transport='websockets')
+    deflate = partial(WebsocketsTransport, compression='deflate')
+    client = FCSClient('YOUR_API_KEY', transport=deflate)
+
+    server = LoopbackServer()
+    client = FCSClient('test', transport=server.transport)
+    client.connect()
+    client.run_forever(blocking=False)
+    server.push_price('BINANCE:BTCUSDT', '1D', c=50000)
+
+Install:
+    pip install websocket-client            # default backend
+    pip install -U websockets               # optional, 'websockets' backend (>= 12)
+"""
+
+import inspect
+import json
+import queue
+import ssl
+import threading
+import time
+from collections import deque
+from functools import partial
+
+try:
+    import websocket
+except ImportError:
+    raise ImportError("Please install websocket-client: pip install websocket-client")
+
+try:
+    from websockets.exceptions import ConnectionClosed
+    from websockets.sync.client import connect as websockets_connect
+    from websockets.sync.connection import Connection as _WebsocketsConnection
+except ImportError:
+    websockets_connect = None
+    _RECV_BYTES = False
+else:
+    # recv(decode=False) needs websockets >= 13; 12 only returns str for text frames
+    try:
+        _RECV_BYTES = 'decode' in inspect.signature(_WebsocketsConnection.recv).parameters
+    except (TypeError, ValueError):
+        _RECV_BYTES = False
+
+
+class WebSocketClientTransport:
+    """Transport backed by websocket-client's WebSocketApp (frames arrive as str)."""
+
+    name = 'websocket-client'
+
+    def __init__(self, url, on_open=None, on_message=None, on_error=None, on_close=None):
+        """
+        Initialize transport.
+
+        Args:
+            url (str): WebSocket URL including the access key
+            on_open, on_message, on_error, on_close (callable): Connection callbacks
+        """
+        self.url = url
+        self.app = websocket.WebSocketApp(
+            url,
+            on_open=lambda ws: on_open(self),
+            on_message=lambda ws, message: on_message(self, message),
+            on_error=lambda ws, error: on_error(self, error),
+            on_close=lambda ws, code, reason: on_close(self, code, reason),
+        )
+
+    def run(self):
+        self.app.run_forever(sslopt={"cert_reqs": ssl.CERT_NONE})
+
+    def send(self, text):
+        self.app.send(text)
+
+    def close(self):
+        self.app.close()
+
+
+class WebsocketsTransport:
+    """
+    Transport backed by the websockets sync client.
+
+    Requires websockets >= 12 (the sync client). On 13 and later text frames
+    are received with decode=False, so the decoder parses the UTF-8 bytes
+    directly instead of a str built from them first; on 12 they arrive as str.
+    """
+
+    name = 'websockets'
+
+    def __init__(
+        self,
+        url,
+        on_open=None,
+        on_message=None,
+        on_error=None,
+        on_close=None,
+        compression=None,
+        open_timeout=10,
+    ):
+        """
+        Initialize transport.
+
+        Args:
+            url (str): WebSocket URL including the access key
+            on_open, on_message, on_error, on_close (callable): Connection callbacks
+            compression (str, optional): 'deflate' to negotiate permessage-deflate
+            open_timeout (float): Max seconds for the opening handshake
+        """
+        if websockets_connect is None:
+            raise ImportError("Please install websockets>=12: pip install -U websockets")
+        self.url = url
+        self.compression = compression
+        self.open_timeout = open_timeout
+        self.connection = None
+        self._on_open = on_open
+        self._on_message = on_message
+        self._on_error = on_error
+        self._on_close = on_close
+        self._closing = False
+
+    def run(self):
+        self._closing = False
+        options = {}
+        if self.url.startswith('wss:'):
+            context = ssl.create_default_context()
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+            options['ssl'] = context
+        try:
+            connection = websockets_connect(
+                self.url,
+                compression=self.compression,
+                max_size=None,
+                open_timeout=self.open_timeout,
+                **options,
+            )
+        except Exception as e:
+            self._callback(self._on_error, e)
+            self._callback(self._on_close, None, None)
+            return
+
+        # Entered as a context manager (closed on exit); websockets >= 17.1
+        # warns when a sync connection is used without one
+        code = reason = None
+        with connection:
+            self.connection = connection
+            if self._closing:
+                connection.close()
+            self._callback(self._on_open)
+            try:
+                recv = partial(connection.recv, decode=False) if _RECV_BYTES else connection.recv
+                on_message = self._on_message
+                while True:
+                    message = recv()
+                    try:
+                        on_message(self, message)
+                    except Exception as e:
+                        self._callback(self._on_error, e)
+            except ConnectionClosed as e:
+                if e.rcvd is not None:
+                    code, reason = e.rcvd.code, e.rcvd.reason
+            except Exception as e:
+                self._callback(self._on_error, e)
+            finally:
+                self.connection = None
+        self._callback(self._on_close, code, reason)
+
+    def send(self, text):
+        connection = self.connection
+        if connection is None:
+            raise ConnectionError('Not connected')
+        connection.send(text)
+
+    def close(self):
+        self._closing = True
+        connection = self.connection
+        if connection is not None:
+            connection.close()
+
+    def _callback(self, func, *args):
+        if func is None:
+            return
+        try:
+            func(self, *args)
+        except Exception as e:
+            if func is not self._on_error and self._on_error is not None:
+                self._on_error(self, e)
+
+
+# ============================================
+# In-memory loopback
+# ============================================
+
+_CLOSE = object()
+
+
+class LoopbackTransport:
+    """One client connection to a LoopbackServer; frames are delivered on the run() thread."""
+
+    name = 'loopback'
+
+    def __init__(self, server, url, on_open=None, on_message=None, on_error=None, on_close=None):
+        self.server = server
+        self.url = url
+        self.subscriptions = {}  # key -> (symbol, timeframe)
+        self._on_open = on_open
+        self._on_message = on_message
+        self._on_error = on_error
+        self._on_close = on_close
+        self._inbox = None
+
+    @property
+    def connected(self):
+        return self._inbox is not None
+
+    def run(self):
+        inbox = self._inbox = queue.SimpleQueue()
+        self.subscriptions = {}
+        self.server._attach(self)
+        code, reason = 1000, ''
+        try:
+            self._on_open(self)
+            on_message = self._on_message
+            get = inbox.get
+            while True:
+                item = get()
+                if item is _CLOSE:
+                    code, reason = get(), get()
+                    break
+                try:
+                    on_message(self, item)
+                except Exception as e:
+                    self._on_error(self, e)
+        finally:
+            self.server._detach(self)
+            self._inbox = None
+        self._on_close(self, code, reason)
+
+    def send(self, text):
+        if self._inbox is None:
+            raise ConnectionError('Not connected')
+        self.server._receive(self, text)
+
+    def close(self, code=1000, reason=''):
+        inbox = self._inbox
+        if inbox is not None:
+            inbox.put(_CLOSE)
+            inbox.put(code)
+            inbox.put(reason)
+
+    def deliver(self, message):
+        """Queue a frame (str or bytes) for this connection."""
+        inbox = self._inbox
+        if inbox is not None:
+            inbox.put(message)
+
+
+class LoopbackServer:
+    """
+    In-memory stand-in for the FCS server.
+
+    Speaks the same protocol as the real server: welcome on connect,
+    pong for ping, joined_room for join_symbol, and tracks leave_symbol /
+    remove_all. Frames pushed with push() or push_price() go to every
+    connection subscribed to the frame's symbol/timeframe.
+
+    Attributes:
+        connections (list): Open LoopbackTransports
+        received (deque): Last frames sent by clients, decoded
+    """
+
+    def __init__(self, welcome=True, keep=1000):
+        """
+        Initialize loopback server.
+
+        Args:
+            welcome (bool): Send a welcome message on connect
+            keep (int): Client frames kept in `received`
+        """
+        self.welcome = welcome
+        self.connections = []
+        self.received = deque(maxlen=keep)
+        self.frames_pushed = 0
+        self._lock = threading.Lock()
+
+    def transport(self, url, on_open=None, on_message=None, on_error=None, on_close=None):
+        """Transport factory for FCSClient(transport=server.transport)."""
+        return LoopbackTransport(self, url, on_open, on_message, on_error, on_close)
+
+    # ============================================
+    # Server -> client
+    # ============================================
+
+    def push(self, frame, symbol=None, timeframe=None):
+        """
+        Send a frame to connected clients.
+
+        Args:
+            frame (dict, str or bytes): Frame to send (dicts are JSON-encoded once)
+            symbol, timeframe (str, optional): Only to connections subscribed to this key
+                (taken from a dict frame when omitted; other frames go to everyone)
+
+        Returns:
+            int: Number of connections the frame was queued for
+        """
+        if isinstance(frame, dict):
+            symbol = symbol or frame.get('symbol')
+            timeframe = timeframe or frame.get('timeframe')
+            frame = json.dumps(frame, separators=(',', ':'))
+        key = f"{symbol.upper()}_{timeframe}" if symbol else None
+        count = 0
+        for connection in self.connections:
+            if key is None or key in connection.subscriptions:
+                connection.deliver(frame)
+                count += 1
+        self.frames_pushed += count
+        return count
+
+    def push_price(self, symbol, timeframe, mode='candle', **prices):
+        """
+        Send a price frame, e.g. push_price('FX:EURUSD', '1', c=1.1, a=1.1001, b=1.0999).
+
+        Returns:
+            int: Number of connections the frame was queued for
+        """
+        prices.setdefault('t', int(time.time()))
+        prices['mode'] = mode
+        return self.push(
+            {'type': 'price', 'symbol': symbol, 'timeframe': timeframe, 'prices': prices}
+        )
+
+    def drop(self, code=1006, reason='loopback drop'):
+        """Close every connection as if the network failed."""
+        for connection in list(self.connections):
+            connection.close(code, reason)
+
+    # ============================================
+    # Client -> server
+    # ============================================
+
+    def _attach(self, connection):
+        with self._lock:
+            self.connections = self.connections + [connection]
+        if self.welcome:
+            connection.deliver('{"type":"welcome","message":"Connected to loopback"}')
+
+    def _detach(self, connection):
+        with self._lock:
+            self.connections = [c for c in self.connections if c is not connection]
+
+    def _receive(self, connection, text):
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return
+        self.received.append(data)
+        msg_type = data.get('type')
+        if msg_type == 'ping':
+            connection.deliver(json.dumps({'type': 'pong', 'timestamp': data.get('timestamp')}))
+        elif msg_type == 'join_symbol':
+            symbol, timeframe = data.get('symbol'), data.get('timeframe')
+            if symbol and timeframe:
+                connection.subscriptions[f"{symbol.upper()}_{timeframe}"] = (symbol, timeframe)
+                connection.deliver(
+                    json.dumps(
+                        {
+                            'type': 'message',
+                            'short': 'joined_room',
+                            'symbol': symbol,
+                            'timeframe': timeframe,
+                            'message': f'Joined {symbol} {timeframe}',
+                        }
+                    )
+                )
+        elif msg_type == 'leave_symbol':
+            key = f"{str(data.get('symbol')).upper()}_{data.get('timeframe')}"
+            connection.subscriptions.pop(key, None)
+        elif msg_type == 'remove_all':
+            connection.subscriptions.clear()
+
+
+TRANSPORTS = {
+    'websocket-client': WebSocketClientTransport,
+    'websockets': WebsocketsTransport,
+}
+
+
+def get_transport(transport=None):
+    """
+    Resolve a transport name or factory.
+
+    Args:
+        transport (str or callable, optional): 'websocket-client' (default),
+            'websockets', or a callable taking (url, on_open=, on_message=,
+            on_error=, on_close=) such as LoopbackServer.transport
+
+    Returns:
+        callable: Transport factory
+    """
+    if transport is None:
+        return WebSocketClientTransport
+    if callable(transport):
+        return transport
+    try:
+        return TRANSPORTS[transport]
+    except KeyError:
+        raise ValueError(f'Unknown transport: {transport}')
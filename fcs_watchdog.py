@@ -0,0 +1,292 @@
+"""
+FCS stream watchdog
+
+Detects subscriptions whose price stream stopped while the connection
+stayed up, restarts just those streams, and drops byte-identical repeated
+price frames before they reach listeners and handlers.
+
+Each key's expected cadence is learned from its own inter-arrival times
+(or, until it has enough samples, from its market: the exchange prefix,
+e.g. 'BINANCE' or 'FX'). A key is stale once it has been silent for
+`multiplier` x its cadence, clamped to [min_timeout, max_timeout]. Stale
+keys get a leave_symbol + join_symbol; if `escalate_ratio` of all keys are
+stale at once the connection is restarted instead.
+
+Usage:
+    from fcs_client_lib import FCSClient
+
+    client = FCSClient('YOUR_API_KEY')
+    watchdog = client.enable_watchdog(multiplier=5, min_timeout=10)
+
+    @watchdog.on_stale
+    def stale(key, silent_for, action):   # action: 'resubscribe' or 'reconnect'
+        print(f'{key} silent for {silent_for:.0f}s -> {action}')
+
+    watchdog.stats()    # resubscribes, reconnects, duplicates, stale keys
+"""
+
+import threading
+import time
+
+from fcs_decoder import PriceTick
+from fcs_scheduler import get_scheduler
+
+
+def _market(key):
+    """'BINANCE:BTCUSDT_1D' -> 'BINANCE'."""
+    return key.partition(':')[0]
+
+
+class Watchdog:
+    """
+    Per-subscription staleness detection plus duplicate price-frame filter.
+
+    on_frame() runs on the receive thread for every price frame; check()
+    runs every check_interval seconds on the client's io worker thread.
+
+    Attributes:
+        duplicates (int): Byte-identical price frames dropped
+        resubscribes (int): Targeted leave/join cycles issued
+        reconnects (int): Escalations to a full reconnect
+    """
+
+    def __init__(
+        self,
+        client,
+        check_interval=1.0,
+        multiplier=5.0,
+        min_timeout=10.0,
+        max_timeout=600.0,
+        default_timeout=60.0,
+        escalate_ratio=0.5,
+        escalate_min=3,
+        dedup=True,
+        min_samples=5,
+    ):
+        """
+        Initialize watchdog.
+
+        Args:
+            client (FCSClient): Client whose subscriptions are watched
+            check_interval (float): Seconds between staleness checks
+            multiplier (float): Silent for this many expected intervals = stale
+            min_timeout (float): Never call a key stale before this many seconds
+            max_timeout (float): Upper bound for the stale timeout (also caps backoff)
+            default_timeout (float): Timeout for keys of a market with no cadence yet
+            escalate_ratio (float): Reconnect when this fraction of keys is stale at once
+            escalate_min (int): ...and at least this many keys
+            dedup (bool): Drop price frames identical to the key's previous frame
+            min_samples (int): Intervals needed before a key's own cadence is used
+        """
+        self.client = client
+        self.check_interval = check_interval
+        self.multiplier = multiplier
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.default_timeout = default_timeout
+        self.escalate_ratio = escalate_ratio
+        self.escalate_min = escalate_min
+        self.dedup = dedup
+        self.min_samples = min_samples
+
+        # Counters
+        self.duplicates = 0
+        self.resubscribes = 0
+        self.reconnects = 0
+
+        self._last = {}  # key -> monotonic time of the last price frame
+        self._raw = {}  # key -> last raw price frame
+        self._cadence = {}  # key -> [EWMA interval, samples]
+        self._markets = {}  # market -> EWMA interval
+        self._strikes = {}  # key -> consecutive resubscribes without a tick
+        self._was_connected = False
+        self._onstale = None
+        self._lock = threading.RLock()  # on_stale callbacks may call stats()
+        # check() may send or reconnect, so it runs on the client's io worker
+        self._timer = get_scheduler().call_every(
+            check_interval, self.check, worker=client.io_worker
+        )
+
+    def on_stale(self, func):
+        """Decorator: func(key, silent_for, action) is called for each stale key."""
+        self._onstale = func
+        return func
+
+    # ============================================
+    # Receive thread
+    # ============================================
+
+    def on_frame(self, data, message):
+        """
+        Record a price frame; returns True if it repeats the key's previous frame.
+
+        Args:
+            data (dict or PriceTick): Decoded frame
+            message (str or bytes): Frame as received
+        """
+        if type(data) is PriceTick:
+            key = data.key
+        else:
+            if data.get('type') != 'price':
+                return False
+            symbol = data.get('symbol')
+            if not symbol:
+                return False
+            key = f"{symbol.upper()}_{data.get('timeframe')}"
+
+        now = time.monotonic()
+        last = self._last.get(key)
+        self._last[key] = now
+        if last is not None:
+            self._learn(key, now - last)
+        if self._strikes:
+            self._strikes.pop(key, None)
+
+        if self.dedup:
+            if self._raw.get(key) == message:
+                self.duplicates += 1
+                return True
+            self._raw[key] = message
+        return False
+
+    def _learn(self, key, interval):
+        cadence = self._cadence.get(key)
+        if cadence is None:
+            self._cadence[key] = [interval, 1]
+        else:
+            cadence[0] += 0.1 * (interval - cadence[0])
+            cadence[1] += 1
+        market = _market(key)
+        average = self._markets.get(market)
+        self._markets[market] = (
+            interval if average is None else average + 0.05 * (interval - average)
+        )
+
+    # ============================================
+    # Checks (io worker thread)
+    # ============================================
+
+    def timeout(self, key):
+        """Seconds of silence after which a key counts as stale (before backoff)."""
+        cadence = self._cadence.get(key)
+        if cadence is not None and cadence[1] >= self.min_samples:
+            expected = cadence[0]
+        else:
+            expected = self._markets.get(_market(key))
+        if expected is None:
+            return self.default_timeout
+        return min(max(expected * self.multiplier, self.min_timeout), self.max_timeout)
+
+    def stale(self):
+        """
+        Dict of key -> seconds silent, for keys currently past their timeout.
+
+        Read-only: keys not seen yet and clocks not yet reset after a
+        reconnect count as fresh until the next check() starts their clocks.
+        """
+        with self._lock:
+            if not self.client.is_connected or not self._was_connected:
+                return {}
+            return self._find_stale(time.monotonic())
+
+    def _find_stale(self, now):
+        result = {}
+        for key in list(self.client.active_subscriptions):
+            last = self._last.get(key)
+            if last is None:
+                continue
+            limit = min(self.timeout(key) * 2 ** self._strikes.get(key, 0), self.max_timeout)
+            if now - last > limit:
+                result[key] = now - last
+        return result
+
+    def _update_clocks(self, now):
+        """Start clocks for new keys, and restart all of them after a (re)connect."""
+        client = self.client
+        if not client.is_connected:
+            self._was_connected = False
+            return False
+        if not self._was_connected:
+            self._was_connected = True
+            for key in self._last:
+                self._last[key] = now
+        for key in list(client.active_subscriptions):
+            if key not in self._last:
+                self._last[key] = now
+        return True
+
+    def check(self):
+        """Resubscribe stale keys, or reconnect if too many are stale."""
+        with self._lock:
+            now = time.monotonic()
+            stale = self._find_stale(now) if self._update_clocks(now) else {}
+            self._forget_removed()
+            if not stale:
+                return
+            client = self.client
+            total = len(client.active_subscriptions)
+            if len(stale) >= max(self.escalate_min, self.escalate_ratio * total):
+                self.reconnects += 1
+                if client.show_logs:
+                    print(f'[FCS] Watchdog: {len(stale)}/{total} subscriptions stale, reconnecting')
+                now = time.monotonic()
+                for key in stale:
+                    self._last[key] = now
+                    self._strikes[key] = self._strikes.get(key, 0) + 1
+                self._notify(stale, 'reconnect')
+                client.reconnect()
+                return
+
+            now = time.monotonic()
+            for key in stale:
+                entry = client.active_subscriptions.get(key)
+                if entry is None:
+                    continue
+                if client.subscriptions.resubscribe(entry['symbol'], entry['timeframe']):
+                    self.resubscribes += 1
+                    self._last[key] = now
+                    self._strikes[key] = self._strikes.get(key, 0) + 1
+                    if client.show_logs:
+                        print(f'[FCS] Watchdog: {key} silent for {stale[key]:.1f}s, resubscribing')
+            self._notify(stale, 'resubscribe')
+
+    def _notify(self, stale, action):
+        func = self._onstale
+        if func is None:
+            return
+        for key, silent_for in stale.items():
+            try:
+                func(key, silent_for, action)
+            except Exception as e:
+                self.client._handle_callback_error(e)
+
+    def _forget_removed(self):
+        """Drop tracking state for keys no longer subscribed."""
+        active = self.client.active_subscriptions
+        if len(self._last) <= len(active):
+            return
+        for key in [k for k in self._last if k not in active]:
+            self._last.pop(key, None)
+            self._raw.pop(key, None)
+            self._cadence.pop(key, None)
+            self._strikes.pop(key, None)
+
+    # ============================================
+    # Inspection
+    # ============================================
+
+    def stats(self):
+        return {
+            'watched': len(self.client.active_subscriptions),
+            'stale': len(self.stale()),
+            'duplicates': self.duplicates,
+            'resubscribes': self.resubscribes,
+            'reconnects': self.reconnects,
+            'markets': {market: round(interval, 3) for market, interval in self._markets.items()},
+        }
+
+    def stop(self):
+        """Stop periodic checks."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
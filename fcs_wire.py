@@ -0,0 +1,105 @@
+"""
+FCS wire helpers
+
+Pre-encoded outbound control messages and byte counters for comparing
+on-wire size with decoded size.
+
+The fixed messages (ping, pong, remove_all) are built from string templates
+instead of json.dumps, and join/leave frames are encoded once per
+symbol/timeframe and cached.
+
+Usage:
+    from fcs_wire import encode_ping, encode_join
+
+    socket.send(encode_ping(int(time.time() * 1000)))
+    socket.send(encode_join('BINANCE:BTCUSDT', '1D'))
+"""
+
+import json
+from functools import lru_cache
+
+REMOVE_ALL = '{"type":"remove_all"}'
+
+_PING = '{"type":"ping","timestamp":%d}'
+_PONG = '{"type":"pong","timestamp":%d}'
+
+
+def encode_ping(timestamp):
+    """Heartbeat ping with a millisecond timestamp."""
+    return _PING % timestamp
+
+
+def encode_pong(timestamp):
+    """Answer to a server ping."""
+    return _PONG % timestamp
+
+
+@lru_cache(maxsize=8192)
+def encode_join(symbol, timeframe):
+    """join_symbol frame (cached per symbol/timeframe)."""
+    return json.dumps(
+        {'type': 'join_symbol', 'symbol': symbol, 'timeframe': timeframe}, separators=(',', ':')
+    )
+
+
+@lru_cache(maxsize=8192)
+def encode_leave(symbol, timeframe):
+    """leave_symbol frame (cached per symbol/timeframe)."""
+    return json.dumps(
+        {'type': 'leave_symbol', 'symbol': symbol, 'timeframe': timeframe}, separators=(',', ':')
+    )
+
+
+def encode(data):
+    """Encode an outbound message; pre-encoded strings pass through unchanged."""
+    if type(data) is str:
+        return data
+    return json.dumps(data, separators=(',', ':'))
+
+
+class WireCounter:
+    """
+    Byte counters for one connection.
+
+    Attributes:
+        wire_received (int): Bytes read from the socket (WebSocket frames, after TLS)
+        payload_received (int): Length of message payloads after decompression
+        frames_received (int): Messages received
+        payload_sent (int): Bytes of message payload sent (before compression)
+        frames_sent (int): Messages sent
+    """
+
+    __slots__ = (
+        'wire_received',
+        'payload_received',
+        'frames_received',
+        'payload_sent',
+        'frames_sent',
+    )
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.wire_received = 0
+        self.payload_received = 0
+        self.frames_received = 0
+        self.payload_sent = 0
+        self.frames_sent = 0
+
+    @property
+    def ratio(self):
+        """On-wire / decoded bytes for received data (None before any data)."""
+        if not self.payload_received:
+            return None
+        return self.wire_received / self.payload_received
+
+    def stats(self):
+        return {
+            'wire_received': self.wire_received,
+            'payload_received': self.payload_received,
+            'frames_received': self.frames_received,
+            'payload_sent': self.payload_sent,
+            'frames_sent': self.frames_sent,
+            'ratio': self.ratio,
+        }
@@ -0,0 +1,68 @@
+"""Shared fixtures: in-memory and mock FCS servers and clients connected to them."""
+
+import time
+
+import pytest
+
+from fcs_client_lib import FCSClient
+from fcs_transport import LoopbackServer
+
+
+def wait_until(predicate, timeout=3.0, interval=0.005):
+    """Poll predicate() until it is true; returns its last value."""
+    deadline = time.monotonic() + timeout
+    while True:
+        result = predicate()
+        if result or time.monotonic() >= deadline:
+            return result
+        time.sleep(interval)
+
+
+def price(symbol='BINANCE:BTCUSDT', timeframe='1', **prices):
+    """Decoded price frame dict."""
+    return {'type': 'price', 'symbol': symbol, 'timeframe': timeframe, 'prices': prices}
+
+
+@pytest.fixture
+def server():
+    server = LoopbackServer()
+    yield server
+    server.drop(1000, 'test done')
+
+
+@pytest.fixture
+def make_client(server):
+    """Factory for clients on the loopback server; all are disconnected afterwards."""
+    clients = []
+
+    def make(connect=True, **attrs):
+        client = FCSClient('test', transport=server.transport)
+        client.reconnect_limit = None
+        for name, value in attrs.items():
+            setattr(client, name, value)
+        clients.append(client)
+        if connect:
+            client.connect()
+            client.run_forever(blocking=False)
+            assert wait_until(lambda: client.is_connected)
+        return client
+
+    yield make
+    for client in clients:
+        client.disconnect()
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client()
+
+
+@pytest.fixture
+def mock_server():
+    """MockFCSServer on a free local port (tests using it need websockets)."""
+    pytest.importorskip('websockets')
+    from fcs_mock_server import MockFCSServer
+
+    server = MockFCSServer(rate=200, ping_interval=60).start()
+    yield server
+    server.stop()
@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip('websockets')
+
+from fcs_async_client import AsyncFCSClient  # noqa: E402
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 10))
+
+
+def test_stream_yields_prices_and_ends_on_disconnect(mock_server):
+    async def main():
+        client = AsyncFCSClient('test', url=mock_server.url)
+        await client.connect(timeout=5)
+        prices = []
+
+        async def consume():
+            async for data in client.stream():
+                if data.get('type') == 'price':
+                    prices.append(data)
+            return 'ended'
+
+        consumer = asyncio.ensure_future(consume())
+        await client.join('BINANCE:BTCUSDT', '1')
+        while len(prices) < 5:
+            await asyncio.sleep(0.01)
+        await client.disconnect()
+        assert await asyncio.wait_for(consumer, 2) == 'ended'
+        assert prices[0]['symbol'] == 'BINANCE:BTCUSDT'
+
+    run(main())
+
+
+def test_stream_after_stop_returns_immediately(mock_server):
+    async def main():
+        client = AsyncFCSClient('test', url=mock_server.url)
+        await client.connect(timeout=5)
+        await client.disconnect()
+        return [data async for data in client.stream()]
+
+    assert run(main()) == []
+
+
+def test_stream_ends_when_run_task_is_cancelled(mock_server):
+    async def main():
+        client = AsyncFCSClient('test', url=mock_server.url)
+        await client.connect(timeout=5)
+
+        async def consume():
+            return [data async for data in client.stream()]
+
+        consumer = asyncio.ensure_future(consume())
+        await asyncio.sleep(0.05)
+        client._run_task.cancel()
+        await asyncio.wait_for(consumer, 2)
+
+    run(main())
+
+
+def test_bounded_stream_drops_oldest(mock_server):
+    async def main():
+        client = AsyncFCSClient('test', url=mock_server.url)
+        await client.connect(timeout=5)
+        stream = client.stream(maxsize=2)
+        first = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0)
+        await client.join('BINANCE:BTCUSDT', '1')
+        await first
+        await asyncio.sleep(0.2)  # many frames arrive while nobody reads
+        queue = client._streams[0]
+        assert queue.qsize() == 2
+        await stream.aclose()
+        await client.disconnect()
+
+    run(main())
+
+
+def test_unlimited_reconnects_with_backoff(mock_server):
+    async def main():
+        client = AsyncFCSClient('test', url=mock_server.url)
+        client.reconnect_limit = None
+        client.reconnect_delay = 0.01
+        reconnected = asyncio.Event()
+        client.on_reconnect(reconnected.set)
+        await client.connect(timeout=5)
+        mock_server.drop_connections()
+        await asyncio.wait_for(reconnected.wait(), 5)
+        assert client.count_reconnects == 0  # reset by the welcome
+        assert not client._run_task.done()
+        await client.disconnect()
+
+    run(main())
@@ -0,0 +1,173 @@
+import threading
+import time
+
+import pytest
+
+from conftest import price, wait_until
+from fcs_batching import COLUMNS, Batcher, to_columns, to_row
+from fcs_decoder import PriceTick
+
+
+def test_delivers_when_size_is_reached():
+    batches = []
+    batcher = Batcher(batches.append, size=3, interval=10).start()
+    for i in range(7):
+        batcher.submit(i)
+    assert batches == [[0, 1, 2], [3, 4, 5]]
+    assert batcher.pending == 1
+    batcher.stop(flush=True)
+    assert batches[-1] == [6]
+
+
+def test_delivers_when_the_window_closes():
+    batches = []
+    batcher = Batcher(batches.append, size=1000, interval=0.05).start()
+    started = time.monotonic()
+    batcher.submit('a')
+    batcher.submit('b')
+    assert wait_until(lambda: batches)
+    assert batches == [['a', 'b']]
+    assert time.monotonic() - started >= 0.04
+    batcher.stop()
+
+
+def test_max_latency_bounds_count_only_batches():
+    batches = []
+    batcher = Batcher(batches.append, size=1000, interval=None, max_latency=0.05).start()
+    batcher.submit('a')
+    assert wait_until(lambda: batches, timeout=1)
+    batcher.stop()
+
+
+def test_stop_without_flush_discards_open_batch():
+    batches = []
+    batcher = Batcher(batches.append, size=10, interval=10).start()
+    batcher.submit('a')
+    batcher.stop(flush=False)
+    assert batches == []
+    assert batcher.pending == 0
+
+
+def test_batches_stay_in_order_across_threads():
+    batches = []
+    batcher = Batcher(lambda b: batches.append(list(b)), size=7, interval=0.001).start()
+    lock = threading.Lock()
+    counter = iter(range(4000))
+
+    def produce():
+        for _ in range(1000):
+            with lock:
+                batcher.submit(next(counter))
+
+    threads = [threading.Thread(target=produce) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.stop(flush=True)
+    flat = [item for batch in batches for item in batch]
+    assert flat == list(range(4000))
+    assert batcher.delivered == 4000
+
+
+def test_errors_are_reported_and_batching_continues():
+    errors = []
+    calls = []
+
+    def deliver(batch):
+        calls.append(batch)
+        raise RuntimeError('boom')
+
+    batcher = Batcher(deliver, size=1, on_error=errors.append)
+    batcher.submit(1)
+    batcher.submit(2)
+    assert calls == [[1], [2]]
+    assert len(errors) == 2
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        Batcher(print, size=0)
+    with pytest.raises(ValueError):
+        Batcher(print, interval=0, max_latency=-1)
+
+
+def test_rows_and_columns_for_dicts_and_ticks():
+    frame = price('X', '1', mode='candle', c=2, v=3)
+    tick = PriceTick('Y', '5', mode='askbid', a=1.1, b=1.0)
+    assert to_row(frame) == ('X', '1', 'candle', None, None, None, None, 2, 3, None, None)
+    columns = to_columns([frame, tick])
+    assert list(columns) == list(COLUMNS)
+    assert columns['symbol'] == ['X', 'Y']
+    assert columns['a'] == [None, 1.1]
+    assert to_columns([]) == {name: [] for name in COLUMNS}
+
+
+def test_client_on_batch_receives_price_frames(server, client):
+    batches = []
+    other = []
+    client.enable_batching(size=3, interval=5)
+    client.on_batch(batches.append)
+    client.onmessage = other.append
+    client.join('FX:EURUSD', '1')
+    assert client.subscriptions.wait(timeout=2)
+    for i in range(3):
+        server.push_price('FX:EURUSD', '1', c=i)
+    assert wait_until(lambda: batches)
+    assert [frame['prices']['c'] for frame in batches[0]] == [0, 1, 2]
+    assert all(data.get('type') != 'price' for data in other)
+
+
+def test_client_columnar_without_handler_falls_back_to_on_message(server, client):
+    got = []
+    client.onmessage = lambda data: data.get('type') == 'price' and got.append(data)
+    client.enable_batching(size=2, interval=5, columnar=True)
+    client.join('FX:EURUSD', '1')
+    assert client.subscriptions.wait(timeout=2)
+    server.push_price('FX:EURUSD', '1', c=1)
+    server.push_price('FX:EURUSD', '1', c=2)
+    assert wait_until(lambda: len(got) == 2)
+    assert [frame['prices']['c'] for frame in got] == [1, 2]
+
+    columns = []
+    client.on_batch(columns.append)
+    server.push_price('FX:EURUSD', '1', c=3)
+    server.push_price('FX:EURUSD', '1', c=4)
+    assert wait_until(lambda: columns)
+    assert columns[0]['c'] == [3, 4]
+
+
+def test_submit_does_not_wait_on_a_slow_delivery():
+    release = threading.Event()
+    batches = []
+
+    def deliver(batch):
+        if not batches:
+            release.wait(2)
+        batches.append(batch)
+
+    batcher = Batcher(deliver, size=1000, interval=0.01).start()
+    batcher.submit('a')
+    assert wait_until(lambda: batcher.stats()['batches'] == 1)  # timer thread is delivering
+    started = time.monotonic()
+    for item in 'bcd':
+        batcher.submit(item)  # the condition is free while the timer thread delivers
+    assert time.monotonic() - started < 0.5
+    release.set()
+    assert wait_until(lambda: len(batches) == 2)
+    assert batches == [['a'], ['b', 'c', 'd']]
+    batcher.stop()
+
+
+def test_client_batches_go_through_the_dispatch_workers(server, client):
+    threads = []
+    client.enable_dispatch(workers=1)
+    client.enable_batching(size=2, interval=5)
+    client.on_batch(lambda batch: threads.append((threading.current_thread().name, len(batch))))
+    client.join('FX:EURUSD', '1')
+    assert client.subscriptions.wait(timeout=2)
+    for i in range(4):
+        server.push_price('FX:EURUSD', '1', c=i)
+    assert wait_until(lambda: len(threads) == 2)
+    assert all(name.startswith('fcs-dispatch') and size == 2 for name, size in threads)
+    assert client.dispatcher.stats()['delivered'] >= 2
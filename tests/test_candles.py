@@ -0,0 +1,140 @@
+import threading
+
+import pytest
+
+from conftest import price, wait_until
+from fcs_candles import CandleAggregator, bar_start, timeframe_seconds
+from fcs_scheduler import Worker
+
+MONDAY = 1704067200  # 2024-01-01 00:00 UTC
+
+
+def aggregator(**options):
+    options.setdefault('close_on_time', False)
+    return CandleAggregator(**options)
+
+
+def test_timeframes_and_bucketing():
+    assert [timeframe_seconds(tf) for tf in ('1', '15', '1H', '4h', '1D', '1W')] == [
+        60,
+        900,
+        3600,
+        14400,
+        86400,
+        604800,
+    ]
+    for bad in ('0', 'H', '1M', '5X'):
+        with pytest.raises(ValueError):
+            timeframe_seconds(bad)
+    assert bar_start(MONDAY + 7 * 60 + 5, 300) == MONDAY + 300
+    assert bar_start(MONDAY + 3 * 86400, 604800) == MONDAY  # weeks start on Monday
+    with pytest.raises(ValueError):
+        CandleAggregator(['5', '7'], source='5', close_on_time=False)
+
+
+def test_candle_frames_build_larger_bars_with_volume():
+    candles = aggregator(timeframes=('1', '5'))
+    # Source bar at :00 restated twice (cumulative v), then the :01 bar
+    candles.on_message(price('fx:eurusd', '1', mode='candle', t=MONDAY, o=1, h=2, l=1, c=2, v=5))
+    candles.on_message(price('FX:EURUSD', '1', mode='candle', t=MONDAY, o=1, h=3, l=0.5, c=2, v=8))
+    candles.on_message(price('FX:EURUSD', '1', mode='candle', t=MONDAY + 60, c=2.5, v=1))
+    five = candles.current('FX:EURUSD', '5')
+    assert (five.t, five.o, five.h, five.l, five.c, five.v) == (MONDAY, 1, 3, 0.5, 2.5, 9)
+    assert five.ticks == 3
+    minute = candles.bars('FX:EURUSD', '1')
+    assert [(bar.t, bar.h, bar.v) for bar in minute] == [(MONDAY, 3, 8)]
+    assert minute[0].closed
+
+
+def test_askbid_uses_the_configured_price_and_ignores_other_timeframes():
+    candles = aggregator(timeframes=('1',), price='bid')
+    candles.on_message(price('X:Y', '1', mode='askbid', t=MONDAY * 1000, a=1.2, b=1.0))
+    candles.on_message(price('X:Y', '5', mode='askbid', t=MONDAY, a=9, b=9))
+    bar = candles.current('X:Y', '1')
+    assert (bar.t, bar.c, bar.v) == (MONDAY, 1.0, 0.0)
+    assert candles.stats()['received'] == 1
+    mid = aggregator(timeframes=('1',))
+    mid.on_message(price('X:Y', '1', mode='askbid', t=MONDAY, a=1.2, b=1.0))
+    assert mid.current('X:Y', '1').c == pytest.approx(1.1)
+
+
+def test_next_bar_closes_the_previous_and_late_frames_are_counted():
+    candles = aggregator(timeframes=('1',))
+    closed = []
+    candles.on_bar_close(closed.append)
+    candles.update('X', MONDAY + 10, 1, 1, 1, 1)
+    candles.update('X', MONDAY + 70, 2, 2, 2, 2)
+    candles.update('X', MONDAY + 20, 3, 3, 3, 3)
+    assert [bar.t for bar in closed] == [MONDAY]
+    assert candles.stats()['late'] == 1
+    assert candles.current('X', '1').t == MONDAY + 60
+
+
+def test_close_due_closes_quiet_bars_after_grace():
+    candles = aggregator(timeframes=('1', '5'), grace=2)
+    closed = []
+    candles.on_bar_close(closed.append)
+    candles.update('X', MONDAY + 10, 1, 1, 1, 1)
+    candles.close_due(now=MONDAY + 61)
+    assert closed == []
+    candles.close_due(now=MONDAY + 62)
+    assert [(bar.timeframe, bar.t) for bar in closed] == [('1', MONDAY)]
+    candles.update('X', MONDAY + 30, 1, 1, 1, 1)  # its bar already closed by time
+    assert candles.current('X', '1') is None
+    assert candles.stats()['late'] == 1
+
+
+def test_handler_errors_go_to_on_error_and_do_not_stop_other_bars():
+    errors = []
+    candles = aggregator(timeframes=('1', '5'), on_error=errors.append)
+    closed = []
+
+    @candles.on_bar_close
+    def on_bar(bar):
+        closed.append(bar.timeframe)
+        raise RuntimeError(bar.timeframe)
+
+    candles.update('X', MONDAY, 1, 1, 1, 1)
+    candles.close_due(now=MONDAY + 3600)
+    assert sorted(closed) == ['1', '5']
+    assert len(errors) == 2
+
+    raising = aggregator(timeframes=('1', '5'))
+    raising.on_bar_close(on_bar)
+    raising.update('X', MONDAY, 1, 1, 1, 1)
+    with pytest.raises(RuntimeError):
+        raising.close_due(now=MONDAY + 3600)
+    assert raising.stats()['bars_closed'] == 2
+
+
+def test_time_closes_run_on_the_worker():
+    worker = Worker('test-candles')
+    candles = CandleAggregator(timeframes=('1',), grace=0, worker=worker)
+    threads = []
+    candles.on_bar_close(lambda bar: threads.append(threading.current_thread().name))
+    candles.update('X', 0, 1, 1, 1, 1)
+    try:
+        assert wait_until(lambda: threads)
+    finally:
+        candles.stop()
+    assert threads == ['test-candles']
+
+
+def test_client_candles_use_io_worker_and_on_error(server, client):
+    errors = []
+    client.on_error(errors.append)
+    candles = client.enable_candles(['1'], source='1')
+    threads = []
+
+    @candles.on_bar_close
+    def on_bar(bar):
+        threads.append(threading.current_thread().name)
+        raise RuntimeError('bad handler')
+
+    client.join('FX:EURUSD', '1')
+    assert client.subscriptions.wait(timeout=2)
+    server.push_price('FX:EURUSD', '1', t=60, c=1.1)  # long over: closes on the next check
+    assert wait_until(lambda: errors, timeout=3)
+    assert threads == ['fcs-client-io']
+    assert str(errors[0]) == 'bad handler'
+    assert [bar.c for bar in candles.bars('FX:EURUSD', '1')] == [1.1]
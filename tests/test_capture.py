@@ -0,0 +1,109 @@
+import os
+import time
+
+import pytest
+
+from conftest import wait_until
+from fcs_capture import MAGIC, CaptureReader, CaptureWriter, list_segments
+from fcs_client_lib import FCSClient
+
+
+def test_capture_and_replay_round_trip(tmp_path, server, make_client):
+    path = str(tmp_path / 'capture')
+    client = make_client(connect=False)
+    live = []
+    client.on_message(live.append)
+    capture = client.start_capture(path, flush_interval=None)
+    client.connect()
+    client.run_forever(blocking=False)
+    client.join('FX:EURUSD', '1')
+    assert client.subscriptions.wait(timeout=2)
+    for c in (1.1, 1.11, 1.12, 1.13, 1.14):
+        server.push_price('FX:EURUSD', '1', c=c)
+    assert wait_until(lambda: sum(1 for data in live if data.get('type') == 'price') == 5)
+    client.stop_capture()
+
+    replayed = []
+    replay_client = FCSClient('replay')
+    replay_client.on_message(replayed.append)
+    replayer = replay_client.replay(path, speed=None)
+    prices = [data['prices']['c'] for data in replayed if data.get('type') == 'price']
+    assert prices == [1.1, 1.11, 1.12, 1.13, 1.14]
+    assert replayer.frames == capture.frames
+    assert 'FX:EURUSD_1' in replay_client.active_subscriptions
+    assert not replay_client.is_connected
+
+
+def test_segments_roll_and_continue(tmp_path):
+    path = str(tmp_path)
+    writer = CaptureWriter(path, segment_size=110, flush_interval=None)
+    for i in range(6):
+        writer.write(f'{{"n":{i},"pad":"{"x" * 20}"}}', received_at=1000.0 + i)
+    writer.close()
+    assert writer.segments == 3
+    writer.write('ignored after close')
+
+    again = CaptureWriter(path, flush_interval=None)
+    again.write('{"n":6}', received_at=1006.0)
+    again.close()
+
+    segments = list_segments(path)
+    assert [os.path.basename(s) for s in segments][-1] == 'segment-000004.fcap'
+    with open(segments[0], 'rb') as f:
+        assert f.read(len(MAGIC)) == MAGIC
+    reader = CaptureReader(path)
+    assert [t for t, _ in reader] == [1000.0 + i for i in range(7)]
+    assert reader.count() == 7
+    assert reader.time_range() == (1000.0, 1006.0)
+
+
+def test_truncated_record_is_ignored(tmp_path):
+    writer = CaptureWriter(str(tmp_path), flush_interval=None)
+    writer.write('{"a":1}', received_at=1.0)
+    writer.write('{"a":2}', received_at=2.0)
+    writer.close()
+    segment = list_segments(str(tmp_path))[0]
+    with open(segment, 'r+b') as f:
+        f.truncate(os.path.getsize(segment) - 3)
+    assert [bytes(payload) for _, payload in CaptureReader(segment)] == [b'{"a":1}']
+
+
+def test_foreign_files_are_rejected(tmp_path):
+    path = tmp_path / 'segment-000001.fcap'
+    path.write_bytes(b'NOTACAP\n' + b'\0' * 16)
+    with pytest.raises(ValueError):
+        list(CaptureReader(str(path)))
+
+
+def test_replay_pace_and_time_window(tmp_path):
+    path = str(tmp_path)
+    writer = CaptureWriter(path, flush_interval=None)
+    for i in range(5):
+        writer.write(f'{{"type":"message","n":{i}}}', received_at=100.0 + i * 0.1)
+    writer.close()
+
+    client = FCSClient('replay')
+    seen = []
+    client.on_message(lambda data: seen.append(data['n']))
+    started = time.perf_counter()
+    client.replay(path, speed=2)
+    assert 0.18 < time.perf_counter() - started < 1.0  # 0.4 s recorded at 2x
+    assert seen == [0, 1, 2, 3, 4]
+
+    seen.clear()
+    client.replay(path, speed=None, start=100.1, end=100.3)
+    assert seen == [1, 2, 3]
+
+
+def test_background_replay_can_be_stopped(tmp_path):
+    path = str(tmp_path)
+    writer = CaptureWriter(path, flush_interval=None)
+    for i in range(3):
+        writer.write('{"type":"message"}', received_at=100.0 + i * 10)
+    writer.close()
+    replayer = FCSClient('replay').replay(path, speed=1, blocking=False)
+    assert wait_until(lambda: replayer.frames == 1)
+    replayer.stop()
+    replayer.thread.join(2)
+    assert not replayer.thread.is_alive()
+    assert replayer.frames == 1
@@ -0,0 +1,71 @@
+import copy
+
+from fcs_conflation import Conflator
+from fcs_decoder import PriceTick
+
+from conftest import price
+
+
+def test_merges_fields_per_key():
+    out = []
+    conflator = Conflator(out.append, rate=1)
+    conflator.submit('X_1', price('X', '1', mode='candle', o=1, c=2, v=10))
+    conflator.submit('X_1', price('X', '1', mode='askbid', a=2.1, b=1.9))
+    conflator.submit('Y_1', price('Y', '1', c=5))
+    conflator.flush()
+
+    assert len(out) == 2
+    merged = {frame['symbol']: frame['prices'] for frame in out}
+    assert merged['X'] == {'mode': 'askbid', 'o': 1, 'c': 2, 'v': 10, 'a': 2.1, 'b': 1.9}
+    assert merged['Y'] == {'c': 5}
+    assert conflator.received == 3
+    assert conflator.conflated == 1
+    assert conflator.flushed == 2
+
+
+def test_submitted_dicts_are_never_modified():
+    out = []
+    conflator = Conflator(out.append, rate=1)
+    first = price('X', '1', mode='candle', c=2)
+    second = price('X', '1', mode='askbid', a=2.1)
+    originals = copy.deepcopy([first, second])
+    conflator.submit('X_1', first)
+    conflator.submit('X_1', second)
+    conflator.flush()
+
+    assert [first, second] == originals
+    assert out[0] is not first
+    assert out[0]['prices'] is not first['prices']
+
+
+def test_submitted_ticks_are_never_modified():
+    out = []
+    conflator = Conflator(out.append, rate=1)
+    first = PriceTick('X', '1', mode='candle', c=2)
+    second = PriceTick('X', '1', mode='askbid', a=2.1)
+    conflator.submit('X_1', first)
+    conflator.submit('X_1', second)
+    conflator.flush()
+
+    assert first == PriceTick('X', '1', mode='candle', c=2)
+    assert out == [PriceTick('X', '1', mode='askbid', c=2, a=2.1)]
+
+
+def test_non_dict_prices_replace_the_slot():
+    out = []
+    conflator = Conflator(out.append, rate=1)
+    conflator.submit('X_1', price('X', '1', c=1))
+    replacement = {'type': 'price', 'symbol': 'X', 'timeframe': '1', 'prices': None}
+    conflator.submit('X_1', replacement)
+    conflator.flush()
+    assert out == [replacement]
+
+
+def test_flusher_thread_delivers_at_rate():
+    out = []
+    conflator = Conflator(out.append, rate=50).start()
+    for i in range(100):
+        conflator.submit('X_1', price('X', '1', c=i))
+    conflator.stop(flush=True, timeout=2)
+    assert 1 <= len(out) <= 3
+    assert out[-1]['prices']['c'] == 99
@@ -0,0 +1,79 @@
+import pytest
+
+from fcs_decoder import Decoder, PriceTick, as_tick, msgspec, orjson
+
+BACKENDS = ['json']
+if orjson is not None:
+    BACKENDS.append('orjson')
+if msgspec is not None:
+    BACKENDS.append('msgspec')
+
+PRICE = (
+    b'{"type":"price","symbol":"BINANCE:BTCUSDT","timeframe":"1",'
+    b'"prices":{"mode":"candle","t":1700000000,"o":"100.5","h":101,"l":99.5,'
+    b'"c":100.25,"v":12}}'
+)
+OTHER = b'{"type":"message","short":"joined_room","symbol":"FX:EURUSD","timeframe":"1"}'
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('message', [PRICE, PRICE.decode(), OTHER])
+def test_backends_decode_identically(backend, message):
+    assert Decoder(backend).decode(message) == Decoder('json').decode(message)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_typed_backends_agree_on_values_and_types(backend):
+    reference = Decoder('json', typed=True).decode(PRICE)
+    tick = Decoder(backend, typed=True).decode(PRICE)
+    assert type(tick) is PriceTick
+    assert tick == reference
+    for name in PriceTick.__slots__:
+        assert type(getattr(tick, name)) is type(getattr(reference, name)), name
+    assert type(tick.t) is int and type(tick.o) is str
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_typed_decoder_passes_other_frames_through(backend):
+    assert Decoder(backend, typed=True).decode(OTHER)['short'] == 'joined_room'
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_malformed_frames_raise_decoder_errors(backend):
+    decoder = Decoder(backend, typed=True)
+    with pytest.raises(decoder.errors):
+        decoder.decode(b'{"type":"price",')
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        Decoder('yaml')
+
+
+def test_price_tick_dict_compatibility():
+    tick = Decoder('json', typed=True).decode(PRICE)
+    assert tick.get('type') == 'price'
+    assert tick['symbol'] == 'BINANCE:BTCUSDT'
+    assert tick['prices']['c'] == 100.25
+    assert 'a' not in tick.prices
+    assert tick.key == 'BINANCE:BTCUSDT_1'
+    assert as_tick(tick.to_dict()) == tick
+    with pytest.raises(KeyError):
+        tick['c']
+
+
+def test_price_tick_is_unhashable_and_copyable():
+    tick = PriceTick('X', '1', c=1)
+    with pytest.raises(TypeError):
+        hash(tick)
+    clone = tick.copy()
+    clone.merge(PriceTick('X', '1', a=2))
+    assert clone == PriceTick('X', '1', c=1, a=2)
+    assert tick.a is None
+
+
+def test_auto_backend_prefers_msgspec_when_typed():
+    if msgspec is not None:
+        assert Decoder('auto', typed=True).backend == 'msgspec'
+    if orjson is not None:
+        assert Decoder('auto').backend == 'orjson'
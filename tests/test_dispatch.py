@@ -0,0 +1,114 @@
+import threading
+
+import pytest
+
+from conftest import wait_until
+from fcs_dispatch import Dispatcher
+
+
+def blocked_dispatcher(policy, maxsize=3):
+    """Dispatcher whose single worker is held inside the handler until released."""
+    release = threading.Event()
+    started = threading.Event()
+    handled = []
+
+    def handler(item):
+        started.set()
+        release.wait(5)
+        handled.append(item)
+
+    dispatcher = Dispatcher(handler, workers=1, maxsize=maxsize, policy=policy).start()
+    dispatcher.submit('busy')
+    assert started.wait(2)
+    return dispatcher, release, handled
+
+
+def test_drop_oldest_keeps_newest_items():
+    dispatcher, release, handled = blocked_dispatcher('drop_oldest')
+    for i in range(5):
+        assert dispatcher.submit(i) is True
+    assert dispatcher.dropped == 2
+    assert dispatcher.depth == 3
+    release.set()
+    dispatcher.stop(drain=True, timeout=2)
+    assert handled == ['busy', 2, 3, 4]
+
+
+def test_drop_newest_rejects_when_full():
+    dispatcher, release, handled = blocked_dispatcher('drop_newest')
+    results = [dispatcher.submit(i) for i in range(5)]
+    assert results == [True, True, True, False, False]
+    assert dispatcher.dropped == 2
+    release.set()
+    dispatcher.stop(drain=True, timeout=2)
+    assert handled == ['busy', 0, 1, 2]
+
+
+def test_block_waits_for_room():
+    dispatcher, release, handled = blocked_dispatcher('block', maxsize=1)
+    dispatcher.submit(0)
+    done = threading.Event()
+
+    def producer():
+        dispatcher.submit(1)
+        done.set()
+
+    threading.Thread(target=producer, daemon=True).start()
+    assert not done.wait(0.1)
+    release.set()
+    assert done.wait(2)
+    dispatcher.stop(drain=True, timeout=2)
+    assert handled == ['busy', 0, 1]
+    assert dispatcher.dropped == 0
+
+
+def test_stop_without_drain_counts_discarded_items():
+    dispatcher, release, handled = blocked_dispatcher('block', maxsize=10)
+    for i in range(4):
+        dispatcher.submit(i)
+    stopper = threading.Thread(target=dispatcher.stop, kwargs={'drain': False, 'timeout': 2})
+    stopper.start()
+    assert wait_until(lambda: dispatcher.depth == 0)
+    release.set()
+    stopper.join(2)
+    assert handled == ['busy']
+    assert dispatcher.dropped == 4
+    assert dispatcher.submit('late') is False
+
+
+def test_handler_errors_are_reported():
+    errors = []
+
+    def handler(item):
+        raise RuntimeError(item)
+
+    dispatcher = Dispatcher(handler, on_error=errors.append).start()
+    dispatcher.submit('boom')
+    dispatcher.stop(drain=True, timeout=2)
+    assert [str(e) for e in errors] == ['boom']
+    assert dispatcher.delivered == 1
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        Dispatcher(print, policy='drop_random')
+    with pytest.raises(ValueError):
+        Dispatcher(print, maxsize=0)
+
+
+def test_client_dispatch_delivers_off_the_receive_thread(server, client):
+    threads = []
+    got = threading.Event()
+
+    @client.on_message
+    def handle(data):
+        if data.get('type') == 'price':
+            threads.append(threading.current_thread().name)
+            got.set()
+
+    client.enable_dispatch(workers=2, maxsize=100, policy='drop_oldest')
+    client.join('FX:EURUSD', '1')
+    assert wait_until(lambda: 'FX:EURUSD_1' in client.active_subscriptions)
+    server.push_price('FX:EURUSD', '1', c=1.1)
+    assert got.wait(2)
+    assert threads[0].startswith('fcs-dispatch-')
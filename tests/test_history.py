@@ -0,0 +1,84 @@
+import math
+
+import pytest
+
+from fcs_decoder import PriceTick
+from fcs_history import TickHistory, TickRing
+
+
+def tick(c=None, symbol='X', timeframe='1', **fields):
+    return PriceTick(symbol, timeframe, c=c, **fields)
+
+
+def test_ring_returns_last_values_oldest_first():
+    ring = TickRing(4)
+    for i in range(3):
+        ring.append(tick(c=i))
+    assert list(ring.last()) == [0, 1, 2]
+    assert list(ring.last(2)) == [1, 2]
+
+
+def test_ring_wraps_and_stays_contiguous():
+    ring = TickRing(4)
+    for i in range(10):
+        ring.append(tick(c=i))
+    assert ring.count == 4
+    assert list(ring.last()) == [6, 7, 8, 9]
+    assert list(ring.last(100)) == [6, 7, 8, 9]
+
+
+def test_missing_fields_carry_forward():
+    ring = TickRing(4)
+    ring.append(tick(c=1.5, o=1.0))
+    ring.append(tick(a=1.6, b=1.4))
+    assert list(ring.last(column='c')) == [1.5, 1.5]
+    assert list(ring.last(column='o')) == [1.0, 1.0]
+    a = list(ring.last(column='a'))
+    assert math.isnan(a[0]) and a[1] == 1.6
+
+
+def test_ring_view_is_read_only():
+    ring = TickRing(2)
+    ring.append(tick(c=1))
+    view = ring.last()
+    with pytest.raises((ValueError, TypeError)):
+        view[0] = 5
+
+
+def test_unknown_column_and_capacity():
+    with pytest.raises(ValueError):
+        TickRing(0)
+    with pytest.raises(KeyError):
+        TickRing(2).last(column='x')
+
+
+def test_history_evicts_least_recently_updated_key():
+    history = TickHistory(capacity=2, max_keys=2)
+    history.append(tick(1, symbol='A'))
+    history.append(tick(1, symbol='B'))
+    history.append(tick(2, symbol='A'))
+    history.append(tick(1, symbol='C'))
+    assert history.keys() == ['A_1', 'C_1']
+    assert history.evicted == 1
+    assert history.last('b', '1') is None
+    assert list(history.last('a', '1')) == [1, 2]
+
+
+def test_history_listener_accepts_dicts_and_ignores_other_frames():
+    history = TickHistory(capacity=4)
+    history.on_message(
+        {'type': 'price', 'symbol': 'fx:eurusd', 'timeframe': '1', 'prices': {'c': '1.1'}}
+    )
+    history.on_message({'type': 'pong'})
+    assert 'FX:EURUSD_1' in history
+    assert len(history) == 1
+    assert list(history.last('FX:EURUSD', '1')) == [1.1]
+
+
+def test_evict_idle():
+    history = TickHistory(capacity=2)
+    history.append(tick(1, symbol='A'))
+    history.ring('A', '1').updated -= 100
+    history.append(tick(1, symbol='B'))
+    assert history.evict_idle(50) == 1
+    assert history.keys() == ['B_1']
@@ -0,0 +1,124 @@
+import threading
+
+import pytest
+
+from conftest import price, wait_until
+from fcs_decoder import PriceTick
+from fcs_scheduler import Worker
+
+numpy = pytest.importorskip('numpy')
+
+from fcs_indicators import IndicatorEngine, default_pip_size  # noqa: E402
+
+
+def engine(**options):
+    options.setdefault('interval', 0)
+    return IndicatorEngine(**options)
+
+
+def reference_ema(values, period):
+    alpha = 2.0 / (period + 1)
+    ema = values[0]
+    for value in values[1:]:
+        ema = alpha * value + (1 - alpha) * ema
+    return ema
+
+
+@pytest.mark.parametrize('batch_size', [1, 7, 1000])
+def test_ema_and_return_match_a_per_tick_reference(batch_size):
+    prices = {'A': [1.0, 1.5, 1.2, 1.8, 2.0, 1.9, 2.2, 2.1, 2.5, 2.4], 'B': [10.0, 9.0, 11.0, 12.0]}
+    indicators = engine(ema_periods=(3, 5), batch_size=batch_size)
+    for i in range(10):  # interleave the symbols inside each batch
+        for symbol, values in prices.items():
+            if i < len(values):
+                indicators.on_message(price(symbol, '1', c=values[i]))
+    indicators.flush()
+    for symbol, values in prices.items():
+        values_ = indicators.get(symbol, '1')
+        assert values_['ema3'] == pytest.approx(reference_ema(values, 3))
+        assert values_['ema5'] == pytest.approx(reference_ema(values, 5))
+        assert values_['ret'] == pytest.approx(values[-1] / values[-2] - 1)
+        assert values_['price'] == values[-1]
+        assert values_['count'] == len(values)
+    assert indicators.stats()['ticks'] == 14
+
+
+def test_spread_uses_mid_and_pip_size():
+    indicators = engine()
+    indicators.on_message(price('FX:USDJPY', '1', mode='askbid', a=150.25, b=150.20))
+    indicators.on_message(PriceTick('FX:EURUSD', '1', 'askbid', b=1.1000, a=1.1003))
+    indicators.flush()
+    jpy = indicators.get('FX:USDJPY', '1')
+    assert jpy['price'] == pytest.approx(150.225)
+    assert jpy['spread_pips'] == pytest.approx(5)
+    assert indicators.get('FX:EURUSD', '1')['spread_pips'] == pytest.approx(3)
+    assert (default_pip_size('fx:gbpjpy'), default_pip_size('FX:EURUSD')) == (0.01, 0.0001)
+
+
+def test_vwap_weights_by_traded_volume_over_the_window():
+    indicators = engine(vwap_window=3)
+    # Same candle restated (cumulative v 10 -> 15), then new candles
+    rows = [(0, 1.0, 10), (0, 2.0, 15), (60, 3.0, 5), (120, 4.0, 10), (180, 5.0, 10)]
+    for t, c, v in rows:
+        indicators.on_message(price('X', '1', t=t, c=c, v=v))
+        indicators.flush()
+    result = indicators.get('X', '1')
+    # Last three traded chunks: 5 @ 3.0, 10 @ 4.0, 10 @ 5.0
+    assert result['vwap'] == pytest.approx((5 * 3 + 10 * 4 + 10 * 5) / 25)
+    assert result['volume'] == 40
+
+
+def test_batch_size_flushes_and_arrays_grow():
+    indicators = engine(batch_size=4, capacity=2)
+    updates = []
+    indicators.on_update(lambda engine, slots: updates.append(list(slots)))
+    for i in range(4):
+        indicators.on_message(price(f'S{i}', '1', c=i + 1))
+    assert updates == [[0, 1, 2, 3]]
+    assert indicators.capacity == 4
+    assert list(indicators.view('price')) == [1, 2, 3, 4]
+    with pytest.raises(ValueError):
+        indicators.view('price')[0] = 0
+
+
+def test_handler_errors_go_to_on_error():
+    errors = []
+    indicators = engine(on_error=errors.append)
+    indicators.on_update(lambda engine, slots: 1 / 0)
+    indicators.on_message(price('X', '1', c=1))
+    indicators.flush()
+    assert isinstance(errors[0], ZeroDivisionError)
+
+
+def test_interval_flushes_run_on_the_worker():
+    worker = Worker('test-indicators')
+    indicators = IndicatorEngine(interval=0.01, worker=worker)
+    threads = []
+    indicators.on_update(lambda engine, slots: threads.append(threading.current_thread().name))
+    indicators.on_message(price('X', '1', c=1))
+    try:
+        assert wait_until(lambda: threads)
+    finally:
+        indicators.stop()
+    assert threads == ['test-indicators']
+
+
+def test_client_indicators_use_io_worker_and_on_error(server, client):
+    errors = []
+    client.on_error(errors.append)
+    indicators = client.enable_indicators(interval=0.01)
+    threads = []
+
+    @indicators.on_update
+    def updated(engine, slots):
+        threads.append(threading.current_thread().name)
+        raise RuntimeError('bad handler')
+
+    client.join('FX:EURUSD', '1')
+    assert client.subscriptions.wait(timeout=2)
+    server.push_price('FX:EURUSD', '1', mode='askbid', a=1.1002, b=1.1)
+    assert wait_until(lambda: errors)
+    assert threads[0] == 'fcs-client-io'
+    assert str(errors[0]) == 'bad handler'
+    assert indicators.get('FX:EURUSD', '1')['spread_pips'] == pytest.approx(2)
+    client.disable_indicators()
@@ -0,0 +1,101 @@
+import time
+
+import pytest
+
+from conftest import price, wait_until
+from fcs_metrics import ClientMetrics, Histogram, frame_size
+
+
+@pytest.fixture
+def metrics():
+    metrics = ClientMetrics(rate_window=0.2)
+    yield metrics
+    metrics.close()
+
+
+def test_frames_and_ticks_are_counted(metrics):
+    metrics.observe_frame(price('fx:eurusd', '1', c=1), 50, 0.00001)
+    metrics.observe_frame({'type': 'pong'}, 20, 0.00001)
+    snapshot = metrics.snapshot()
+    assert snapshot['frames_received_total'] == {'price': 1, 'pong': 1}
+    assert snapshot['bytes_received_total'] == {'price': 50, 'pong': 20}
+    assert snapshot['subscription_ticks_total'] == {'FX:EURUSD_1': 1}
+
+
+def test_tick_rate_is_not_reset_by_reads(metrics):
+    for _ in range(10):
+        for _ in range(20):
+            metrics.ticks.inc(1, 'X_1')
+        time.sleep(0.02)
+        metrics.snapshot()
+        metrics.to_prometheus()
+    rate = metrics.snapshot()['subscription_tick_rate']['X_1']
+    # 20 ticks per ~20 ms; a per-read window would see ~0 after the second read
+    assert 400 < rate < 1500
+    assert metrics.snapshot()['subscription_tick_rate']['X_1'] == pytest.approx(rate, rel=0.2)
+
+
+def test_feed_latency_only_for_askbid(metrics):
+    now = time.time()
+    metrics.observe_frame(price('X', '1', mode='candle', t=now - 60), 10, 0)
+    metrics.observe_frame(price('X', '1', mode='askbid', t=(now - 0.5) * 1000), 10, 0)
+    latency = metrics.snapshot()['feed_latency_seconds']
+    assert latency['count'] == 1
+    assert 0.4 < latency['sum'] < 1.0
+
+
+def test_prometheus_text(metrics):
+    metrics.observe_frame(price('X', '1', c=1), 10, 0.0001)
+    text = metrics.to_prometheus()
+    assert '# TYPE fcs_frames_received_total counter' in text
+    assert 'fcs_frames_received_total{type="price"} 1' in text
+    assert 'fcs_decode_seconds_bucket{le="+Inf"} 1' in text
+
+
+def test_histogram_quantiles():
+    histogram = Histogram('h', buckets=(1, 2, 5))
+    for value in (0.5, 1.5, 1.5, 4):
+        histogram.observe(value)
+    snapshot = histogram.snapshot()
+    assert snapshot['count'] == 4
+    assert snapshot['p50'] == 2
+    assert snapshot['p99'] == 5
+
+
+def test_client_metrics_endpoint(server, client):
+    metrics = client.enable_metrics()
+    client.join('FX:EURUSD', '1')
+    assert client.subscriptions.wait(timeout=2)
+    server.push_price('FX:EURUSD', '1', c=1.1)
+    assert wait_until(lambda: metrics.ticks.get('FX:EURUSD_1') == 1)
+    assert metrics.snapshot()['connected'] == 1
+    client.disable_metrics()
+    assert metrics._rate_timer is None
+
+
+def test_bytes_are_counted_as_utf8_for_str_and_bytes(server, client):
+    metrics = client.enable_metrics()
+    frame = '{"type":"message","message":"Zürich"}'
+    server.push(frame)
+    server.push(frame.encode())
+    size = len(frame.encode())
+    assert wait_until(lambda: metrics.bytes.get('message') == 2 * size)
+    assert frame_size(frame) == size == len(frame) + 1
+
+
+def test_leave_drops_per_key_series(server, client):
+    metrics = client.enable_metrics()
+    for symbol in ('FX:EURUSD', 'FX:GBPUSD'):
+        client.join(symbol, '1')
+    assert client.subscriptions.wait(timeout=2)
+    server.push_price('FX:EURUSD', '1', c=1.1)
+    server.push_price('FX:GBPUSD', '1', c=1.3)
+    assert wait_until(lambda: len(metrics.ticks.values) == 2)
+    metrics.snapshot()
+    client.leave('FX:EURUSD', '1')
+    snapshot = metrics.snapshot()
+    assert list(snapshot['subscription_ticks_total']) == ['FX:GBPUSD_1']
+    assert list(snapshot['subscription_tick_rate']) == ['FX:GBPUSD_1']
+    assert 'FX:EURUSD_1' not in metrics.to_prometheus()
+    client.remove_all()
+    assert metrics.snapshot()['subscription_tick_rate'] == {}
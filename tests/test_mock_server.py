@@ -0,0 +1,101 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+websockets = pytest.importorskip('websockets')
+
+from conftest import wait_until  # noqa: E402
+from fcs_client_lib import FCSClient  # noqa: E402
+from fcs_mock_server import MockFCSServer  # noqa: E402
+
+
+def talk(url, frames, until):
+    """Send frames, then collect server frames until until(received) is true."""
+
+    async def main():
+        received = []
+        async with websockets.connect(url) as ws:
+            received.append(json.loads(await ws.recv()))
+            for frame in frames:
+                await ws.send(json.dumps(frame))
+            while not until(received):
+                received.append(json.loads(await ws.recv()))
+        return received
+
+    return asyncio.run(asyncio.wait_for(main(), 5))
+
+
+def test_protocol_welcome_join_and_pong(mock_server):
+    frames = talk(
+        mock_server.url,
+        [
+            {'type': 'join_symbol', 'symbol': 'MOCK:A', 'timeframe': '1'},
+            {'type': 'ping', 'timestamp': 42},
+        ],
+        lambda received: sum(1 for f in received if f['type'] == 'price') >= 3,
+    )
+    assert frames[0]['type'] == 'welcome'
+    assert frames[1]['short'] == 'joined_room' and frames[1]['symbol'] == 'MOCK:A'
+    assert frames[2]['prices']['mode'] == 'initial'
+    assert {'type': 'pong', 'timestamp': 42} in frames
+    prices = [f for f in frames if f['type'] == 'price']
+    assert {f['symbol'] for f in prices} == {'MOCK:A'}
+    assert all(isinstance(f['prices']['t'], float) for f in prices)
+    assert {f['prices']['mode'] for f in prices[1:]} <= {'candle', 'askbid'}
+
+
+def test_leave_stops_a_key(mock_server):
+    frames = talk(
+        mock_server.url,
+        [
+            {'type': 'join_symbol', 'symbol': 'MOCK:A', 'timeframe': '1'},
+            {'type': 'join_symbol', 'symbol': 'MOCK:B', 'timeframe': '1'},
+            {'type': 'leave_symbol', 'symbol': 'MOCK:A', 'timeframe': '1'},
+        ],
+        lambda received: sum(1 for f in received if f.get('symbol') == 'MOCK:B') >= 10,
+    )
+    assert all(f.get('symbol') == 'MOCK:B' for f in frames[-5:])
+
+
+def test_auto_subscribed_symbols_stream_at_the_configured_rate():
+    server = MockFCSServer(rate=500, symbols=5).start()
+    try:
+        frames = talk(server.url, [], lambda received: len(received) >= 200)
+    finally:
+        server.stop()
+    prices = [f for f in frames if f['type'] == 'price' and f['prices']['mode'] != 'initial']
+    assert {f['symbol'] for f in prices} == {f'MOCK:SYM{i:04d}' for i in range(5)}
+    elapsed = prices[-1]['prices']['t'] - prices[0]['prices']['t']
+    assert 0.5 < len(prices) / elapsed / 500 < 1.5
+    assert server.connections == 1
+
+
+def test_server_pings():
+    server = MockFCSServer(ping_interval=0.05).start()
+    try:
+        frames = talk(server.url, [], lambda received: received[-1]['type'] == 'ping')
+    finally:
+        server.stop()
+    assert isinstance(frames[-1]['timestamp'], int)
+
+
+def test_drop_connections_makes_clients_reconnect(mock_server):
+    client = FCSClient('test', mock_server.url)
+    client.reconnect_limit = None
+    client.reconnect_delay = 0.01
+    reconnected = threading.Event()
+    client.on_reconnect(reconnected.set)
+    client.connect()
+    client.run_forever(blocking=False)
+    try:
+        assert wait_until(lambda: client.is_connected)
+        client.join('MOCK:A', '1')
+        assert client.subscriptions.wait(timeout=2)
+        mock_server.drop_connections()
+        assert reconnected.wait(5)
+        assert client.subscriptions.wait(timeout=2)
+        assert mock_server.connections == 2
+    finally:
+        client.disconnect()
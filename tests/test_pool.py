@@ -0,0 +1,94 @@
+import threading
+
+import pytest
+
+pytest.importorskip('websockets')
+
+from conftest import wait_until  # noqa: E402
+from fcs_pool import FCSPool  # noqa: E402
+
+SYMBOLS = [f'MOCK:SYM{i:02d}' for i in range(24)]
+
+
+@pytest.fixture
+def pool(mock_server):
+    pool = FCSPool('test', url=mock_server.url, connections=3)
+    pool.reconnect_limit = None
+    pool.start(timeout=5)
+    yield pool
+    pool.stop(timeout=5)
+
+
+def test_symbols_spread_over_connections_by_stable_hash(pool):
+    for symbol in SYMBOLS:
+        pool.join(symbol, '1').result(5)
+    homes = {symbol: pool.connection_for(symbol) for symbol in SYMBOLS}
+    assert set(homes.values()) == {0, 1, 2}
+    assert [s['subscriptions'] for s in pool.stats()] == [
+        sum(1 for i in homes.values() if i == index) for index in range(3)
+    ]
+    assert wait_until(lambda: len(pool.active_subscriptions) == len(SYMBOLS))
+    for index, client in enumerate(pool.clients):
+        assert {k.split('_')[0] for k in client.active_subscriptions} == {
+            s for s, i in homes.items() if i == index
+        }
+
+
+def test_lost_connection_moves_only_its_symbols_and_they_move_back(pool):
+    for symbol in SYMBOLS:
+        pool.join(symbol, '1').result(5)
+    homes = {symbol: pool.connection_for(symbol) for symbol in SYMBOLS}
+
+    pool._submit(pool.clients[1].disconnect()).result(5)
+    assert wait_until(lambda: not pool.stats()[1]['alive'])
+    moved = {symbol: pool.connection_for(symbol) for symbol in SYMBOLS}
+    assert 1 not in moved.values()
+    assert all(moved[s] == i for s, i in homes.items() if i != 1)
+    assert pool.stats()[1]['subscriptions'] == 0
+
+    pool._submit(pool.clients[1].connect(timeout=5)).result(5)
+    assert wait_until(lambda: pool.stats()[1]['alive'])
+    assert {symbol: pool.connection_for(symbol) for symbol in SYMBOLS} == homes
+
+
+def test_messages_are_merged_and_leave_unassigns(pool):
+    received = []
+    pool.on_message(received.append)
+    pool.join('MOCK:A', '1').result(5)
+    pool.join('MOCK:B', '1').result(5)
+    assert wait_until(
+        lambda: {d.get('symbol') for d in list(received) if d.get('type') == 'price'}
+        >= {'MOCK:A', 'MOCK:B'}
+    )
+    pool.leave('MOCK:A', '1').result(5)
+    assert sum(s['subscriptions'] for s in pool.stats()) == 1
+
+
+def test_stats_while_the_loop_rebalances(pool):
+    errors = []
+    stop = threading.Event()
+
+    def read():
+        while not stop.is_set():
+            try:
+                pool.stats()
+                pool.active_subscriptions
+            except RuntimeError as e:
+                errors.append(e)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    try:
+        for i in range(200):
+            pool.join(f'MOCK:R{i:03d}', '1')
+        pool.remove_all().result(5)
+    finally:
+        stop.set()
+        reader.join(5)
+    assert errors == []
+
+
+def test_join_before_start_raises():
+    pool = FCSPool('test')
+    with pytest.raises(RuntimeError):
+        pool.join('MOCK:A', '1')
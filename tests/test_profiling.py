@@ -0,0 +1,74 @@
+import time
+
+import pytest
+
+from conftest import wait_until
+from fcs_profiling import STAGES, Profiler, handler_name
+
+
+def test_samples_one_in_n_frames():
+    profiler = Profiler(sample_every=3)
+    assert [profiler.sample() for _ in range(6)] == [False, False, True, False, False, True]
+    with pytest.raises(ValueError):
+        Profiler(sample_every=0)
+
+
+def test_record_updates_stats_and_runs_hooks():
+    profiler = Profiler()
+    seen = []
+    hook = profiler.add_hook('decode', lambda stage, seconds, data: seen.append((stage, data)))
+    profiler.record('decode', 0.002, 'a')
+    profiler.record('decode', 0.004, 'b')
+    profiler.remove_hook('decode', hook)
+    profiler.record('decode', 0.001, 'c')
+    stats = profiler.stats()
+    assert seen == [('decode', 'a'), ('decode', 'b')]
+    assert stats['decode']['count'] == 3
+    assert stats['decode']['max'] == 0.004
+    assert stats['decode']['avg'] == pytest.approx(0.007 / 3)
+    assert stats['receive'] == {'count': 0, 'avg': None, 'max': None}
+    profiler.reset()
+    assert profiler.stats()['decode']['count'] == 0
+    with pytest.raises(ValueError):
+        profiler.add_hook('parse', hook)
+
+
+def test_slow_threshold():
+    profiler = Profiler(slow_threshold=0.01, keep_slow=2)
+    reported = []
+    profiler.on_slow(reported.append)
+    data = {'symbol': 'FX:EURUSD', 'timeframe': '1'}
+    profiler.check_slow(test_slow_threshold, 0.005, data)
+    for seconds in (0.02, 0.03, 0.04):
+        profiler.check_slow(test_slow_threshold, seconds, data)
+    assert [event.seconds for event in reported] == [0.02, 0.03, 0.04]
+    assert [event.seconds for event in profiler.slow_calls] == [0.03, 0.04]
+    assert reported[0].symbol == 'FX:EURUSD'
+    assert reported[0].handler == handler_name(test_slow_threshold)
+    assert handler_name(test_slow_threshold).endswith('test_slow_threshold')
+
+
+def test_client_stages_and_slow_handlers(server, client):
+    profiler = client.enable_profiling(slow_threshold=0.01)
+    slow = []
+    profiler.on_slow(slow.append)
+
+    @client.on_message
+    def handle(data):
+        if data.get('type') == 'price':
+            time.sleep(0.02)
+
+    client.join('FX:EURUSD', '1')
+    assert client.subscriptions.wait(timeout=2)
+    server.push_price('FX:EURUSD', '1', c=1.1)
+    assert wait_until(lambda: slow)
+    assert slow[0].handler.endswith('handle')
+    assert slow[0].symbol == 'FX:EURUSD'
+    stats = profiler.stats()
+    assert all(stats[stage]['count'] > 0 for stage in STAGES)
+    assert stats['callback']['max'] >= 0.02
+
+    client.disable_profiling()
+    server.push_price('FX:EURUSD', '1', c=1.2)
+    time.sleep(0.1)
+    assert profiler.stats()['receive']['count'] == stats['receive']['count']
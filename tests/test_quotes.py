@@ -0,0 +1,92 @@
+import asyncio
+import threading
+
+import pytest
+
+from conftest import price, wait_until
+from fcs_decoder import PriceTick
+from fcs_quotes import Quote, QuoteStore
+
+
+def test_updates_merge_fields_into_new_snapshots():
+    store = QuoteStore()
+    first = store.update(PriceTick('FX:EURUSD', '1', mode='candle', t=1, o=1.0, c=1.1, v=5))
+    second = store.update(PriceTick('FX:EURUSD', '1', mode='askbid', t=2, a=1.12, b=1.1))
+    assert first is not second
+    assert (first.a, first.version) == (None, 1)
+    assert (second.o, second.c, second.v, second.a, second.b) == (1.0, 1.1, 5, 1.12, 1.1)
+    assert (second.mode, second.t, second.version) == ('askbid', 2, 2)
+    assert second.spread == pytest.approx(0.02)
+    assert second.mid == pytest.approx(1.11)
+    assert first.spread is None
+    with pytest.raises(AttributeError):
+        second.extra = 1
+
+
+def test_latest_across_timeframes_and_listener_input():
+    store = QuoteStore()
+    store.on_message(price('fx:eurusd', '1', c=1.1))
+    store.on_message(price('FX:EURUSD', '5', c=1.2))
+    store.on_message({'type': 'pong'})
+    assert store.latest('FX:EURUSD').timeframe == '5'
+    assert store.latest('fx:eurusd', '1').c == 1.1
+    assert store.get('FX:EURUSD', '15') is None
+    assert sorted(store.keys()) == ['FX:EURUSD_1', 'FX:EURUSD_5']
+    assert len(store.snapshot()) == len(store) == 2
+    store.clear()
+    assert store.latest('FX:EURUSD') is None
+
+
+def test_preload_marks_quotes_stale_until_a_live_update():
+    store = QuoteStore()
+    store.update(PriceTick('FX:GBPUSD', '1', c=1.3))
+    store.preload(
+        [
+            {'symbol': 'FX:EURUSD', 'timeframe': '1', 'c': 1.1, 'updated_at': 10, 'junk': 1},
+            Quote('FX:GBPUSD', '1', c=9.9),
+        ]
+    )
+    restored = store.latest('FX:EURUSD')
+    assert restored.stale and restored.version == 0 and restored.c == 1.1
+    assert store.latest('FX:GBPUSD').c == 1.3  # live quote not overwritten
+    live = store.update(PriceTick('FX:EURUSD', '1', a=1.2))
+    assert not live.stale and live.c == 1.1 and live.a == 1.2
+
+
+def test_wait_for_update_blocks_until_the_next_version():
+    store = QuoteStore()
+    store.update(PriceTick('FX:EURUSD', '1', c=1.0))
+    assert store.wait_for_update('FX:EURUSD', timeout=0.05) is None
+    assert store.wait_for_update('FX:EURUSD', since=0).c == 1.0
+    timer = threading.Timer(0.05, store.update, [PriceTick('FX:EURUSD', '1', c=1.1)])
+    timer.start()
+    assert store.wait_for_update('fx:eurusd', timeout=2).c == 1.1
+    assert store._waiters == {}
+
+
+def test_wait_for_update_async():
+    store = QuoteStore()
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.05, store.update, PriceTick('FX:EURUSD', '1', c=1.1))
+        quote = await store.wait_for_update_async('FX:EURUSD', timeout=2)
+        missed = await store.wait_for_update_async('FX:EURUSD', timeout=0.05)
+        return quote, missed
+
+    quote, missed = asyncio.run(main())
+    assert quote.c == 1.1 and missed is None
+    assert store._futures == {}
+
+
+def test_client_quotes(server, client):
+    client.enable_quotes()
+    client.join('FX:EURUSD', '1')
+    assert client.subscriptions.wait(timeout=2)
+    server.push_price('FX:EURUSD', '1', mode='askbid', a=1.2, b=1.1)
+    assert wait_until(lambda: client.latest('FX:EURUSD') is not None)
+    threading.Timer(0.05, server.push_price, ['FX:EURUSD', '1'], {'c': 1.15}).start()
+    quote = client.wait_for_update('FX:EURUSD', timeout=2)
+    assert (quote.c, quote.a, quote.b) == (1.15, 1.2, 1.1)
+    client.disable_quotes()
+    assert client.latest('FX:EURUSD') is None
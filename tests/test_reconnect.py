@@ -0,0 +1,75 @@
+import threading
+
+from conftest import wait_until
+from fcs_client_lib import FCSClient
+
+
+def test_backoff_delays_grow_and_are_capped():
+    client = FCSClient('test')
+    client.reconnect_first_delay = 0
+    client.reconnect_delay = 1
+    client.reconnect_max_delay = 5
+    client.reconnect_jitter = 0
+    assert [client._backoff_delay(n) for n in range(1, 7)] == [0, 1, 2, 4, 5, 5]
+
+
+def test_jitter_only_shortens_the_delay():
+    client = FCSClient('test')
+    client.reconnect_delay = 2
+    client.reconnect_jitter = 0.5
+    delays = [client._backoff_delay(3) for _ in range(200)]
+    assert all(2 <= delay <= 4 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_reconnects_and_rejoins_after_a_drop(server, make_client):
+    client = make_client(reconnect_delay=0.01)
+    reconnected = threading.Event()
+    client.on_reconnect(reconnected.set)
+    client.join('FX:EURUSD', '1')
+    client.join('BINANCE:BTCUSDT', '5')
+    assert client.subscriptions.wait(timeout=2)
+    server.received.clear()
+
+    server.drop()
+    assert reconnected.wait(2)
+    assert client.subscriptions.wait(timeout=2)
+    rejoined = sorted(
+        (f['symbol'], f['timeframe']) for f in server.received if f.get('type') == 'join_symbol'
+    )
+    assert rejoined == [('BINANCE:BTCUSDT', '5'), ('FX:EURUSD', '1')]
+    assert client.is_reconnect
+    assert client.last_recovery['attempts'] == 1
+
+    server.push_price('FX:EURUSD', '1', c=1.1)
+    assert wait_until(lambda: client.last_recovery['first_tick'].get('FX:EURUSD_1') is not None)
+
+
+def test_gives_up_after_reconnect_limit(server, make_client):
+    client = make_client(reconnect_delay=0.01, reconnect_first_delay=0.01)
+    client.reconnect_limit = 2
+    server.welcome = False  # connections open but never become ready
+    for _ in range(3):
+        assert wait_until(lambda: server.connections)
+        server.drop()
+        wait_until(lambda: not server.connections)
+    assert wait_until(lambda: client.count_reconnects == 2)
+    assert not wait_until(lambda: server.connections, timeout=0.2)
+
+
+def test_disconnect_stops_the_supervisor(server, make_client):
+    client = make_client(reconnect_delay=0.01)
+    closed = threading.Event()
+    client.on_close(lambda code, reason: closed.set())
+    client.disconnect()
+    assert closed.wait(2)
+    assert not wait_until(lambda: server.connections, timeout=0.2)
+    assert client.count_reconnects == 0
+
+
+def test_manual_reconnect(server, make_client):
+    client = make_client(reconnect_delay=0.01)
+    first = server.connections[0]
+    client.reconnect()
+    assert wait_until(lambda: server.connections and server.connections[0] is not first)
+    assert wait_until(lambda: client.is_connected)
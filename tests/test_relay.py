@@ -0,0 +1,112 @@
+import threading
+
+import pytest
+
+pytest.importorskip('websockets')
+
+from conftest import wait_until  # noqa: E402
+from fcs_client_lib import FCSClient  # noqa: E402
+from fcs_relay import FCSRelay  # noqa: E402
+
+
+@pytest.fixture
+def relay(server):
+    relay = FCSRelay('test', url='loopback://upstream', port=0)
+    relay.client.transport = server.transport
+    relay.start(timeout=5)
+    yield relay
+    relay.stop()
+
+
+@pytest.fixture
+def downstream(relay):
+    clients = []
+
+    def make():
+        client = FCSClient('local', relay.url)
+        client.reconnect_limit = None
+        client.connect()
+        client.run_forever(blocking=False)
+        assert wait_until(lambda: client.is_connected)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.disconnect()
+
+
+def upstream_frames(server, kind):
+    return [(f['symbol'], f['timeframe']) for f in list(server.received) if f['type'] == kind]
+
+
+def prices(received):
+    return [data['prices']['c'] for data in list(received) if data.get('type') == 'price']
+
+
+def test_shared_interest_is_joined_upstream_once_and_fanned_out(server, relay, downstream):
+    first, second = downstream(), downstream()
+    got_first, got_second = [], []
+    first.on_message(got_first.append)
+    second.on_message(got_second.append)
+
+    first.join('FX:EURUSD', '1')
+    assert first.subscriptions.wait(timeout=2)
+    server.push_price('FX:EURUSD', '1', c=1.1)
+    assert wait_until(lambda: prices(got_first) == [1.1])
+
+    # The second session is confirmed locally and gets the latest price replayed
+    second.join('fx:eurusd', '1')
+    assert second.subscriptions.wait(timeout=2)
+    assert wait_until(lambda: prices(got_second) == [1.1])
+
+    server.push_price('FX:EURUSD', '1', c=1.2)
+    assert wait_until(lambda: prices(got_first) == [1.1, 1.2] and prices(got_second) == [1.1, 1.2])
+    assert upstream_frames(server, 'join_symbol') == [('FX:EURUSD', '1')]
+    assert relay.refcounts() == {'FX:EURUSD_1': 2}
+    stats = relay.stats()
+    assert (stats['sessions'], stats['upstream_subscriptions']) == (2, 1)
+    assert stats['downstream_subscriptions'] == 2 and stats['upstream_connected']
+
+
+def test_upstream_leave_after_the_last_session(server, relay, downstream):
+    first, second = downstream(), downstream()
+    for client in (first, second):
+        client.join('FX:EURUSD', '1')
+        client.join('FX:GBPUSD', '1')
+        assert client.subscriptions.wait(timeout=2)
+    assert wait_until(lambda: relay.refcounts() == {'FX:EURUSD_1': 2, 'FX:GBPUSD_1': 2})
+
+    first.leave('FX:EURUSD', '1')
+    assert wait_until(lambda: relay.refcounts()['FX:EURUSD_1'] == 1)
+    assert upstream_frames(server, 'leave_symbol') == []
+
+    second.leave('FX:EURUSD', '1')
+    assert wait_until(lambda: upstream_frames(server, 'leave_symbol') == [('FX:EURUSD', '1')])
+
+    # A closed session releases everything it held
+    first.disconnect()
+    second.disconnect()
+    assert wait_until(lambda: relay.refcounts() == {})
+    assert ('FX:GBPUSD', '1') in upstream_frames(server, 'leave_symbol')
+
+
+def test_only_interested_sessions_receive_a_key(server, relay, downstream):
+    eur, gbp = downstream(), downstream()
+    got_eur, got_gbp = [], []
+    eur.on_message(got_eur.append)
+    gbp.on_message(got_gbp.append)
+    eur.join('FX:EURUSD', '1')
+    gbp.join('FX:GBPUSD', '1')
+    assert eur.subscriptions.wait(timeout=2) and gbp.subscriptions.wait(timeout=2)
+    server.push_price('FX:EURUSD', '1', c=1.1)
+    server.push_price('FX:GBPUSD', '1', c=1.3)
+    assert wait_until(lambda: prices(got_eur) == [1.1] and prices(got_gbp) == [1.3])
+
+
+def test_downstream_heartbeat(relay, downstream):
+    client = downstream()
+    pong = threading.Event()
+    client.on_message(lambda data: data.get('type') == 'pong' and pong.set())
+    client._send_heartbeat()
+    assert pong.wait(2)
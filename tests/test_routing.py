@@ -0,0 +1,100 @@
+from conftest import price, wait_until
+from fcs_decoder import PriceTick
+from fcs_routing import Router
+
+
+def names(handlers):
+    return [handler.__name__ for handler in handlers]
+
+
+def make(name):
+    def handler(data):
+        pass
+
+    handler.__name__ = name
+    return handler
+
+
+def test_price_handlers_run_from_most_to_least_specific():
+    router = Router()
+    everything = router.add_price(make('everything'))
+    exchange = router.add_price(make('exchange'), 'binance:*')
+    symbol = router.add_price(make('symbol'), 'BINANCE:BTCUSDT')
+    exact = router.add_price(make('exact'), 'BINANCE:BTCUSDT', '1D')
+    by_type = router.add_type(make('by_type'), 'price')
+    assert router.routes == 5
+
+    order = names(router.handlers(price('BINANCE:BTCUSDT', '1D')))
+    assert order == ['by_type', 'exact', 'symbol', 'exchange', 'everything']
+    assert names(router.handlers(price('binance:btcusdt', '1'))) == [
+        'by_type',
+        'symbol',
+        'exchange',
+        'everything',
+    ]
+    assert names(router.handlers(price('BINANCE:ETHUSDT', '1D'))) == [
+        'by_type',
+        'exchange',
+        'everything',
+    ]
+    assert names(router.handlers(price('FX:EURUSD', '1'))) == ['by_type', 'everything']
+    assert router.handlers(PriceTick('BINANCE:BTCUSDT', '1D')) == (
+        by_type,
+        exact,
+        symbol,
+        exchange,
+        everything,
+    )
+
+
+def test_type_routes_and_unrouted_messages():
+    router = Router()
+    joined = router.add_type(make('joined'), 'message')
+    assert router.handlers({'type': 'message', 'short': 'joined_room'}) == (joined,)
+    assert router.handlers({'type': 'pong'}) == ()
+    assert router.handlers(price('FX:EURUSD', '1')) == ()
+
+
+def test_cache_is_invalidated_when_routes_change():
+    router = Router()
+    first = router.add_price(make('first'), 'FX:*')
+    assert router.handlers(price('FX:EURUSD', '1')) == (first,)
+    second = router.add_price(make('second'), 'FX:EURUSD', '1')
+    assert router.handlers(price('FX:EURUSD', '1')) == (second, first)
+    router.remove(first)
+    assert router.handlers(price('FX:EURUSD', '1')) == (second,)
+    assert router.routes == 1
+    router.clear()
+    assert router.handlers(price('FX:EURUSD', '1')) == ()
+    assert router.routes == 0
+
+
+def test_client_routes_after_on_message(server, client):
+    calls = []
+    client.on_message(lambda data: calls.append('on_message'))
+
+    @client.on_price('FX:EURUSD', '1')
+    def eurusd(data):
+        calls.append(('eurusd', data['prices']['c']))
+
+    @client.on_price('BINANCE:*')
+    def binance(data):
+        calls.append(('binance', data['symbol']))
+
+    for symbol in ('FX:EURUSD', 'BINANCE:BTCUSDT', 'FX:GBPUSD'):
+        client.join(symbol, '1')
+    assert client.subscriptions.wait(timeout=2)
+    calls.clear()
+    server.push_price('FX:EURUSD', '1', c=1.1)
+    server.push_price('BINANCE:BTCUSDT', '1', c=100)
+    server.push_price('FX:GBPUSD', '1', c=1.3)
+    assert wait_until(lambda: calls.count('on_message') == 3)
+    routed = [call for call in calls if call != 'on_message']
+    assert routed == [('eurusd', 1.1), ('binance', 'BINANCE:BTCUSDT')]
+    assert calls.index(('eurusd', 1.1)) == calls.index('on_message') + 1
+
+    client.off(eurusd)
+    server.push_price('FX:EURUSD', '1', c=1.2)
+    server.push_price('BINANCE:BTCUSDT', '1', c=101)
+    assert wait_until(lambda: len(calls) == 8)
+    assert ('eurusd', 1.2) not in calls
@@ -0,0 +1,110 @@
+import threading
+import time
+
+from conftest import wait_until
+from fcs_scheduler import Scheduler, Worker, backoff_delay, get_scheduler
+
+
+def test_call_later_and_cancel():
+    scheduler = Scheduler(name='test-scheduler')
+    calls = []
+    scheduler.call_later(0.01, calls.append, 'a')
+    handle = scheduler.call_later(0.01, calls.append, 'b')
+    handle.cancel()
+    assert wait_until(lambda: calls == ['a'])
+    time.sleep(0.05)
+    assert calls == ['a']
+
+
+def test_call_every_repeats_until_cancelled():
+    scheduler = Scheduler(name='test-scheduler')
+    calls = []
+    handle = scheduler.call_every(0.01, calls.append, 1, delay=0)
+    assert wait_until(lambda: len(calls) >= 3)
+    handle.cancel()
+    time.sleep(0.03)
+    count = len(calls)
+    time.sleep(0.05)
+    assert len(calls) == count
+
+
+def test_blocked_worker_does_not_stall_other_timers():
+    scheduler = Scheduler(name='test-scheduler')
+    release = threading.Event()
+    stuck_calls = []
+    ticks = []
+
+    def stuck():
+        stuck_calls.append(threading.current_thread().name)
+        release.wait(5)
+
+    stuck_handle = scheduler.call_every(0.01, stuck, delay=0, worker=Worker('test-io'))
+    tick_handle = scheduler.call_every(0.01, ticks.append, 1, delay=0)
+    assert wait_until(lambda: len(ticks) >= 10)
+    # The stuck call is never queued again while it is still running
+    assert stuck_calls == ['test-io']
+    release.set()
+    assert wait_until(lambda: len(stuck_calls) >= 2)
+    stuck_handle.cancel()
+    tick_handle.cancel()
+
+
+def test_worker_runs_calls_in_order_and_restarts_after_idle():
+    worker = Worker('test-io', idle=0.02)
+    calls = []
+    for i in range(5):
+        worker.submit(calls.append, i)
+    assert wait_until(lambda: calls == [0, 1, 2, 3, 4])
+    assert wait_until(lambda: worker._thread is None)
+    worker.submit(calls.append, 5)
+    assert wait_until(lambda: calls[-1] == 5)
+
+
+def test_callback_errors_go_to_on_error():
+    scheduler = Scheduler(name='test-scheduler')
+    worker = Worker('test-io')
+    errors, worker_errors = [], []
+    scheduler.on_error = lambda error, handle: errors.append(error)
+    worker.on_error = worker_errors.append
+
+    def fail():
+        raise RuntimeError('boom')
+
+    scheduler.call_later(0, fail)
+    scheduler.call_later(0, fail, worker=worker)
+    worker.submit(fail)
+    assert wait_until(lambda: len(errors) == 1 and len(worker_errors) == 2)
+    assert (scheduler.errors, worker.errors) == (1, 2)
+
+
+def test_unhandled_callback_errors_are_logged(capsys):
+    scheduler = Scheduler(name='test-scheduler')
+    worker = Worker('test-io')
+
+    def fail():
+        raise RuntimeError('boom')
+
+    scheduler.call_later(0, fail)
+    scheduler.call_later(0, fail, worker=worker)
+    assert wait_until(lambda: scheduler.errors == 1 and worker.errors == 1)
+    err = capsys.readouterr().err
+    assert "[FCS] Error in timer TimerHandle('fail'" in err
+    assert "[FCS] Error in worker 'test-io': RuntimeError('boom')" in err
+
+
+def test_client_timer_errors_reach_on_error(client):
+    errors = []
+    client.on_error(errors.append)
+
+    def fail():
+        raise RuntimeError('boom')
+
+    get_scheduler().call_later(0, fail, worker=client.io_worker)
+    assert wait_until(lambda: errors)
+    assert str(errors[0]) == 'boom'
+
+
+def test_backoff_delay_policy():
+    assert backoff_delay(1, 0.5, 1, 5, 0) == 0.5
+    assert [backoff_delay(n, 0, 1, 5, 0) for n in range(2, 7)] == [1, 2, 4, 5, 5]
+    assert all(1 <= backoff_delay(3, 0, 1, 5, 0.5) <= 2 for _ in range(100))
@@ -0,0 +1,115 @@
+import math
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from conftest import wait_until
+from fcs_decoder import PriceTick
+from fcs_shm import ShmPublisher, ShmReader, numpy
+
+
+@pytest.fixture
+def publisher():
+    publisher = ShmPublisher(capacity=8, max_keys=2)
+    yield publisher
+    publisher.close()
+
+
+def test_round_trip_keeps_fields_and_missing_values(publisher):
+    reader = ShmReader(publisher.name)
+    publisher.publish(PriceTick('FX:EURUSD', '1', 'askbid', 1700000000, a=1.1, b=1.0))
+    publisher.publish(PriceTick('BINANCE:BTCUSDT', '1D', 'candle', 1, 2, 3, 1, 2.5, '10'))
+    first, second = reader.poll()
+    assert first == PriceTick('FX:EURUSD', '1', 'askbid', 1700000000.0, a=1.1, b=1.0)
+    assert second == PriceTick('BINANCE:BTCUSDT', '1D', 'candle', 1, 2, 3, 1, 2.5, 10.0)
+    assert reader.poll() == []
+    assert (reader.received, reader.lost, reader.lag) == (2, 0, 0)
+    reader.close()
+
+
+def test_start_latest_or_oldest(publisher):
+    publisher.publish(PriceTick('FX:EURUSD', '1', c=1))
+    latest = ShmReader(publisher.name)
+    oldest = ShmReader(publisher.name, start='oldest')
+    publisher.publish(PriceTick('FX:EURUSD', '1', c=2))
+    assert [tick.c for tick in latest.poll()] == [2]
+    assert [tick.c for tick in oldest.poll(max_items=1)] == [1]
+    assert oldest.lag == 1
+    latest.close()
+    oldest.close()
+
+
+def test_lapped_reader_counts_lost_records(publisher):
+    reader = ShmReader(publisher.name)
+    for i in range(20):
+        publisher.publish(PriceTick('FX:EURUSD', '1', c=i))
+    assert [tick.c for tick in reader.poll()] == list(range(12, 20))
+    assert reader.lost == 12
+    reader.close()
+
+
+def test_full_key_table_drops_ticks(publisher):
+    for symbol in ('A:A', 'B:B', 'C:C'):
+        publisher.publish(PriceTick(symbol, '1', c=1))
+    assert publisher.stats()['keys'] == 2
+    assert publisher.dropped == 1
+    publisher.close()
+    assert publisher.publish(PriceTick('A:A', '1', c=1)) is False
+
+
+def test_rejects_foreign_segments():
+    from multiprocessing import shared_memory
+
+    shm = shared_memory.SharedMemory(create=True, size=128)
+    try:
+        with pytest.raises(ValueError):
+            ShmReader(shm.name)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+@pytest.mark.skipif(numpy is None, reason='numpy not installed')
+def test_records_view(publisher):
+    publisher.publish(PriceTick('FX:EURUSD', '1', 'askbid', a=1.1, b=1.0))
+    reader = ShmReader(publisher.name)
+    records = reader.records()
+    assert records['seq'][0] == 2
+    assert records['a'][0] == 1.1 and math.isnan(records['c'][0])
+    assert reader.key_names()[records['key'][0]] == ('FX:EURUSD', '1')
+    del records
+    reader.close()
+
+
+def test_reader_in_another_process(publisher):
+    script = textwrap.dedent(f'''
+        from fcs_shm import ShmReader
+        reader = ShmReader({publisher.name!r}, start='oldest')
+        print(','.join(str(tick.c) for tick in reader.poll()))
+        reader.close()
+        ''')
+    for i in range(3):
+        publisher.publish(PriceTick('FX:EURUSD', '1', c=i))
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run(
+        [sys.executable, '-c', script], cwd=root, capture_output=True, text=True, timeout=30
+    )
+    assert output.stdout.strip() == '0.0,1.0,2.0', output.stderr
+    assert 'leaked' not in output.stderr
+
+
+def test_client_publishes_price_frames(server, client):
+    publisher = client.enable_shm_publisher(capacity=16)
+    reader = ShmReader(publisher.name)
+    client.join('FX:EURUSD', '1')
+    assert client.subscriptions.wait(timeout=2)
+    server.push_price('FX:EURUSD', '1', c=1.1)
+    ticks = []
+    assert wait_until(lambda: ticks.extend(reader.poll()) or ticks)
+    assert (ticks[0].symbol, ticks[0].c) == ('FX:EURUSD', 1.1)
+    reader.close()
+    client.disable_shm_publisher()
+    assert client.shm_publisher is None
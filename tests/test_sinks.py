@@ -0,0 +1,127 @@
+import csv
+import os
+import sqlite3
+
+import pytest
+
+from conftest import price, wait_until
+from fcs_decoder import PriceTick
+from fcs_sinks import COLUMNS, CSVSink, ParquetSink, Sink, SQLiteSink, pyarrow
+
+
+class ListSink(Sink):
+    name = 'list-sink'
+
+    def __init__(self, fail=False, **kwargs):
+        super().__init__(**kwargs)
+        self.rows = []
+        self.fail = fail
+
+    def write(self, rows):
+        if self.fail:
+            raise OSError('disk full')
+        self.rows.extend(rows)
+
+
+def test_buffers_only_price_frames_as_rows():
+    sink = ListSink(flush_interval=0.01).start()
+    sink.on_message(price('FX:EURUSD', '1', mode='askbid', a=1.1, b=1.0))
+    sink.on_message({'type': 'pong'})
+    sink.on_message(PriceTick('FX:EURUSD', '1', c=1.05))
+    sink.stop(flush=True, timeout=2)
+    assert sink.written == 2
+    assert [row[1:] for row in sink.rows] == [
+        ('FX:EURUSD', '1', 'askbid', None, None, None, None, None, None, 1.1, 1.0),
+        ('FX:EURUSD', '1', None, None, None, None, None, 1.05, None, None, None),
+    ]
+    assert isinstance(sink.rows[0][0], float)
+
+
+def test_full_buffer_drops_oldest_rows():
+    sink = ListSink(max_buffer=3)  # not started: rows stay buffered
+    for i in range(5):
+        sink.on_message(price('X', '1', c=i))
+    assert sink.dropped == 2
+    assert sink.pending == 3
+    sink.flush()
+    assert [row[8] for row in sink.rows] == [2, 3, 4]
+
+
+def test_batch_size_wakes_the_writer():
+    sink = ListSink(flush_interval=60, batch_size=10).start()
+    for i in range(10):
+        sink.on_message(price('X', '1', c=i))
+    assert wait_until(lambda: sink.written == 10)
+    sink.stop()
+
+
+def test_write_errors_are_reported_and_counted():
+    errors = []
+    sink = ListSink(fail=True, on_error=errors.append)
+    sink.on_message(price('X', '1', c=1))
+    sink.flush()
+    assert sink.errors == 1
+    assert isinstance(errors[0], OSError)
+    assert sink.pending == 0
+
+
+def test_sqlite_sink(tmp_path):
+    path = str(tmp_path / 'ticks.db')
+    sink = SQLiteSink(path, flush_interval=0.01).start()
+    for i in range(3):
+        sink.on_message(price('BINANCE:BTCUSDT', '1', mode='candle', t=1700000000 + i, c=100 + i))
+    sink.stop(flush=True, timeout=2)
+    db = sqlite3.connect(path)
+    rows = db.execute('SELECT symbol, timeframe, t, c FROM ticks ORDER BY t').fetchall()
+    db.close()
+    assert rows == [('BINANCE:BTCUSDT', '1', 1700000000.0 + i, 100.0 + i) for i in range(3)]
+
+
+def test_sqlite_sink_rejects_bad_table_names(tmp_path):
+    with pytest.raises(ValueError):
+        SQLiteSink(str(tmp_path / 'x.db'), table='ticks; DROP TABLE x')
+
+
+def test_csv_sink_rotates_by_rows(tmp_path):
+    sink = CSVSink(
+        str(tmp_path), rotate_interval=None, rotate_rows=2, batch_size=2, flush_interval=60
+    )
+    sink.open()
+    for i in range(5):
+        sink.on_message(price('FX:EURUSD', '1', c=i))
+        if sink.pending == 2:
+            sink.flush()
+    sink.flush()
+    sink.close()
+    assert len(sink.files) == 3
+    rows = []
+    for path in sink.files:
+        with open(path, newline='') as f:
+            reader = csv.reader(f)
+            assert tuple(next(reader)) == COLUMNS
+            rows.extend(reader)
+    assert [row[COLUMNS.index('c')] for row in rows] == ['0', '1', '2', '3', '4']
+
+
+def test_client_add_and_remove_sink(server, client):
+    sink = client.add_sink(ListSink(flush_interval=0.01))
+    client.join('FX:EURUSD', '1')
+    assert client.subscriptions.wait(timeout=2)
+    server.push_price('FX:EURUSD', '1', c=1.1)
+    assert wait_until(lambda: sink.written == 1)
+    client.remove_sink(sink)
+    assert client.sinks == []
+    server.push_price('FX:EURUSD', '1', c=1.2)
+    assert sink.received == 1
+
+
+@pytest.mark.skipif(pyarrow is None, reason='pyarrow not installed')
+def test_parquet_sink(tmp_path):
+    import pyarrow.parquet
+
+    sink = ParquetSink(str(tmp_path), flush_interval=0.01).start()
+    sink.on_message(price('FX:EURUSD', '1', c=1.1))
+    sink.stop(flush=True, timeout=2)
+    table = pyarrow.parquet.read_table(sink.files[0])
+    assert table.column('c').to_pylist() == [1.1]
+    assert os.path.getsize(sink.files[0]) > 0
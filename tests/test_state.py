@@ -0,0 +1,94 @@
+import json
+import os
+import time
+
+from conftest import wait_until
+from fcs_quotes import Quote
+from fcs_state import FORMAT_VERSION, read_state, write_state
+
+
+def test_write_and_read_round_trip(tmp_path):
+    path = str(tmp_path / 'state.json')
+    quote = Quote(
+        'FX:EURUSD',
+        '1',
+        mode='askbid',
+        t=1700000000,
+        a=1.1,
+        b=1.0,
+        version=7,
+        updated_at=time.time(),
+    )
+    size = write_state(path, [('FX:EURUSD', '1')], [quote])
+    assert size == os.path.getsize(path)
+    state = read_state(path)
+    assert state['subscriptions'] == [['FX:EURUSD', '1']]
+    assert state['quotes'][0]['a'] == 1.1
+    assert state['quotes'][0]['t'] == 1700000000
+    assert [name for name in os.listdir(tmp_path)] == ['state.json']
+
+
+def test_unreadable_or_foreign_files_are_ignored(tmp_path):
+    path = tmp_path / 'state.json'
+    assert read_state(str(path)) is None
+    path.write_text('{"subscriptions": [')
+    assert read_state(str(path)) is None
+    path.write_text(json.dumps({'version': FORMAT_VERSION + 1, 'subscriptions': []}))
+    assert read_state(str(path)) is None
+
+
+def test_client_restores_quotes_and_subscriptions(tmp_path, server, make_client):
+    path = str(tmp_path / 'state.json')
+    first = make_client()
+    first.enable_state(path, interval=0)
+    first.join('FX:EURUSD', '1')
+    assert first.subscriptions.wait(timeout=2)
+    server.push_price('FX:EURUSD', '1', mode='askbid', a=1.1, b=1.0)
+    assert wait_until(lambda: first.latest('FX:EURUSD') is not None)
+    first.disconnect()  # writes the final snapshot
+    assert read_state(path)['subscriptions'] == [['FX:EURUSD', '1']]
+
+    joins_before = sum(1 for f in server.received if f.get('type') == 'join_symbol')
+    second = make_client(connect=False)
+    warm = second.enable_state(path, interval=0)
+    quote = second.latest('FX:EURUSD')
+    assert quote.stale and quote.a == 1.1 and quote.version == 0
+    assert warm.restored_subscriptions == 1 and warm.restored_quotes == 1
+
+    second.connect()
+    second.run_forever(blocking=False)
+    assert second.subscriptions.wait(timeout=2)
+    assert 'FX:EURUSD_1' in second.active_subscriptions
+    joins = sum(1 for f in server.received if f.get('type') == 'join_symbol')
+    assert joins == joins_before + 1
+
+    server.push_price('FX:EURUSD', '1', mode='askbid', a=1.2)
+    assert wait_until(lambda: not second.latest('FX:EURUSD').stale)
+    assert second.latest('FX:EURUSD').b == 1.0
+
+
+def test_max_age_skips_old_files(tmp_path, make_client):
+    path = str(tmp_path / 'state.json')
+    write_state(path, [('FX:EURUSD', '1')], [])
+    client = make_client(connect=False)
+    warm = client.enable_state(path, interval=0, max_age=-1)
+    assert warm.restored_subscriptions == 0
+    assert client.subscriptions.get('FX:EURUSD', '1') is None
+
+
+def test_save_only_when_something_changed(tmp_path, server, client):
+    path = str(tmp_path / 'state.json')
+    warm = client.enable_state(path, interval=0, restore=False)
+    assert warm.save() is True
+    assert warm.save() is False
+    client.join('FX:EURUSD', '1')
+    assert warm.save() is True
+    assert warm.save(force=True) is True
+    assert warm.saves == 3
+
+
+def test_periodic_snapshots(tmp_path, client):
+    path = str(tmp_path / 'state.json')
+    client.enable_state(path, interval=0.05, restore=False)
+    client.join('FX:EURUSD', '1')
+    assert wait_until(lambda: (read_state(path) or {}).get('subscriptions'))
@@ -0,0 +1,163 @@
+import json
+import threading
+import time
+
+from conftest import wait_until
+from fcs_scheduler import Worker
+from fcs_subscriptions import CONFIRMED, LEAVING, PENDING, TIMED_OUT, SubscriptionManager
+
+
+class FakeClient:
+    """Records what the manager sends."""
+
+    show_logs = False
+
+    def __init__(self):
+        self.io_worker = Worker(name='test-io')
+        self.sent = []
+        self.times = []
+        self.lock = threading.Lock()
+
+    def _send(self, text):
+        with self.lock:
+            self.sent.append(json.loads(text))
+            self.times.append(time.monotonic())
+
+    def frames(self, kind):
+        with self.lock:
+            return [(f['symbol'], f['timeframe']) for f in self.sent if f['type'] == kind]
+
+
+def manager(**options):
+    client = FakeClient()
+    return client, SubscriptionManager(client, **options)
+
+
+def test_joins_are_queued_until_welcome():
+    client, subs = manager()
+    subs.join('FX:EURUSD', '1')
+    time.sleep(0.05)
+    assert client.sent == []
+    assert subs.queued == 1
+    subs.on_welcome()
+    assert wait_until(lambda: client.frames('join_symbol') == [('FX:EURUSD', '1')])
+    assert subs.get('fx:eurusd', '1').state == PENDING
+
+
+def test_joins_are_sent_in_paced_batches():
+    client, subs = manager(batch_size=2, batch_interval=0.1)
+    for i in range(5):
+        subs.join(f'FX:S{i}', '1')
+    subs.on_welcome()
+    assert wait_until(lambda: len(client.frames('join_symbol')) == 5)
+    assert [f[0] for f in client.frames('join_symbol')] == [f'FX:S{i}' for i in range(5)]
+    first, third, fifth = client.times[0], client.times[2], client.times[4]
+    assert client.times[1] - first < 0.05
+    assert 0.08 <= third - first < 0.5
+    assert 0.16 <= fifth - first < 1.0
+
+
+def test_leave_cancels_an_unsent_join():
+    client, subs = manager()
+    subs.join('FX:EURUSD', '1')
+    subs.leave('FX:EURUSD', '1')
+    subs.on_welcome()
+    time.sleep(0.1)
+    assert client.sent == []
+    assert subs.get('FX:EURUSD', '1') is None
+
+
+def test_join_cancels_an_unsent_leave():
+    client, subs = manager()
+    subs.on_welcome()
+    subs.join('FX:EURUSD', '1')
+    assert wait_until(lambda: client.frames('join_symbol'))
+    subs.on_confirmed('FX:EURUSD', '1')
+    subs.on_disconnect()  # hold the queue
+    subs._online = True
+    subs.leave('FX:EURUSD', '1')
+    assert subs.get('FX:EURUSD', '1').state == LEAVING
+    subs.join('FX:EURUSD', '1')
+    assert subs.get('FX:EURUSD', '1').state == CONFIRMED
+    assert subs.queued == 0
+
+
+def test_confirmation_and_wait():
+    client, subs = manager()
+    subs.on_welcome()
+    subs.join('FX:EURUSD', '1')
+    assert wait_until(lambda: client.frames('join_symbol'))
+    assert subs.wait(timeout=0.05) is False
+    subs.on_confirmed('FX:EURUSD', '1')
+    assert subs.wait(timeout=1) is True
+    sub = subs.get('FX:EURUSD', '1')
+    assert sub.state == CONFIRMED
+    assert sub.latency is not None
+
+
+def test_unconfirmed_joins_time_out_and_retry():
+    client, subs = manager(confirm_timeout=0.05)
+    subs.on_welcome()
+    subs.join('FX:EURUSD', '1')
+    assert wait_until(lambda: subs.get('FX:EURUSD', '1').state == TIMED_OUT)
+    subs.retry_failed()
+    assert wait_until(lambda: len(client.frames('join_symbol')) == 2)
+
+
+def test_welcome_rejoins_everything_wanted():
+    client, subs = manager()
+    subs.on_welcome()
+    subs.join('A:X', '1')
+    subs.join('B:Y', '5')
+    assert wait_until(lambda: len(client.frames('join_symbol')) == 2)
+    subs.on_disconnect()
+    subs.on_welcome()
+    assert wait_until(lambda: len(client.frames('join_symbol')) == 4)
+    assert sorted(client.frames('join_symbol')[2:]) == [('A:X', '1'), ('B:Y', '5')]
+
+
+def test_resubscribe_sends_leave_then_join_immediately():
+    client, subs = manager()
+    assert subs.resubscribe('FX:EURUSD', '1') is False
+    subs.on_welcome()
+    assert subs.resubscribe('FX:EURUSD', '1') is True
+    assert [f['type'] for f in client.sent] == ['leave_symbol', 'join_symbol']
+
+
+def test_client_join_round_trip(server, client):
+    sub = client.join('FX:EURUSD', '1')
+    assert client.subscriptions.wait(timeout=2)
+    assert sub.state == CONFIRMED
+    assert 'FX:EURUSD_1' in client.active_subscriptions
+    client.leave('FX:EURUSD', '1')
+    assert wait_until(lambda: any(f.get('type') == 'leave_symbol' for f in server.received))
+
+
+def test_slow_send_does_not_hold_the_lock():
+    client, subs = manager()
+    release = threading.Event()
+    sending = threading.Event()
+    send = client._send
+
+    def slow_send(text):
+        sending.set()
+        release.wait(5)
+        send(text)
+
+    client._send = slow_send
+    subs.join('FX:EURUSD', '1')
+    subs.join('FX:GBPUSD', '1')
+    subs.on_welcome()
+    assert sending.wait(2)
+
+    confirm = threading.Thread(target=subs.on_confirmed, args=('FX:EURUSD', '1'))
+    confirm.start()
+    confirm.join(1)
+    assert not confirm.is_alive()
+    assert subs.get('FX:EURUSD', '1').state == CONFIRMED
+    assert subs.stats()['pending'] == 1
+
+    release.set()
+    assert wait_until(lambda: len(client.frames('join_symbol')) == 2)
+    assert wait_until(lambda: subs.get('FX:GBPUSD', '1').attempts == 1)
+    assert subs.get('FX:EURUSD', '1').state == CONFIRMED
@@ -0,0 +1,169 @@
+import json
+import queue
+import threading
+
+import pytest
+
+from conftest import wait_until
+from fcs_client_lib import FCSClient
+from fcs_transport import (
+    LoopbackServer,
+    WebSocketClientTransport,
+    WebsocketsTransport,
+    get_transport,
+)
+
+
+class Connection:
+    """Raw LoopbackTransport running on a thread, with its events in a queue."""
+
+    def __init__(self, server):
+        self.events = queue.Queue()
+        self.transport = server.transport(
+            'loopback://test',
+            on_open=lambda t: self.events.put(('open',)),
+            on_message=lambda t, m: self.events.put(('message', json.loads(m))),
+            on_error=lambda t, e: self.events.put(('error', e)),
+            on_close=lambda t, code, reason: self.events.put(('close', code, reason)),
+        )
+        self.thread = threading.Thread(target=self.transport.run, daemon=True)
+        self.thread.start()
+
+    def next(self):
+        return self.events.get(timeout=2)
+
+    def messages(self):
+        result = []
+        while not self.events.empty():
+            event = self.events.get()
+            if event[0] == 'message':
+                result.append(event[1])
+        return result
+
+    def send(self, **frame):
+        self.transport.send(json.dumps(frame))
+
+
+@pytest.fixture
+def connection(server):
+    connection = Connection(server)
+    assert connection.next() == ('open',)
+    assert connection.next()[1]['type'] == 'welcome'
+    return connection
+
+
+def test_ping_gets_pong_and_join_gets_joined_room(server, connection):
+    connection.send(type='ping', timestamp=42)
+    assert connection.next() == ('message', {'type': 'pong', 'timestamp': 42})
+    connection.send(type='join_symbol', symbol='fx:eurusd', timeframe='1')
+    message = connection.next()[1]
+    assert (message['short'], message['symbol'], message['timeframe']) == (
+        'joined_room',
+        'fx:eurusd',
+        '1',
+    )
+    assert connection.transport.subscriptions == {'FX:EURUSD_1': ('fx:eurusd', '1')}
+    assert [frame['type'] for frame in server.received] == ['ping', 'join_symbol']
+    connection.transport.send('not json')  # ignored
+    assert len(server.received) == 2
+
+
+def test_push_only_reaches_subscribed_connections(server, connection):
+    other = Connection(server)
+    assert wait_until(lambda: len(server.connections) == 2)
+    connection.send(type='join_symbol', symbol='FX:EURUSD', timeframe='1')
+    assert connection.next()[1]['short'] == 'joined_room'
+
+    assert server.push_price('FX:EURUSD', '1', c=1.1) == 1
+    assert server.push_price('FX:EURUSD', '5', c=1.2) == 0
+    assert server.push({'type': 'message', 'message': 'hello'}) == 2
+    assert server.push('{"type":"raw"}', symbol='fx:eurusd', timeframe='1') == 1
+    assert wait_until(lambda: connection.events.qsize() == 3)
+    frames = connection.messages()
+    assert frames[0]['prices']['c'] == 1.1 and frames[0]['prices']['mode'] == 'candle'
+    assert [frame['type'] for frame in frames] == ['price', 'message', 'raw']
+    assert server.frames_pushed == 4
+
+
+def test_leave_and_remove_all_stop_delivery(server, connection):
+    for symbol in ('A', 'B'):
+        connection.send(type='join_symbol', symbol=symbol, timeframe='1')
+        connection.next()
+    connection.send(type='leave_symbol', symbol='a', timeframe='1')
+    assert list(connection.transport.subscriptions) == ['B_1']
+    assert server.push_price('A', '1', c=1) == 0
+    connection.send(type='remove_all')
+    assert connection.transport.subscriptions == {}
+    assert server.push_price('B', '1', c=1) == 0
+
+
+def test_drop_closes_connections_with_code(server, connection):
+    server.drop(4000, 'bye')
+    assert connection.next() == ('close', 4000, 'bye')
+    connection.thread.join(2)
+    assert server.connections == []
+    with pytest.raises(ConnectionError):
+        connection.transport.send('{}')
+
+
+def test_client_reconnects_after_loopback_drop(server, client):
+    client.join('FX:EURUSD', '1')
+    assert client.subscriptions.wait(timeout=2)
+    server.drop()
+    assert wait_until(lambda: not client.is_connected or len(server.connections) == 1)
+    assert wait_until(lambda: client.is_connected and server.connections)
+    assert wait_until(lambda: 'FX:EURUSD_1' in server.connections[0].subscriptions)
+
+
+def test_get_transport():
+    assert get_transport() is WebSocketClientTransport
+    assert get_transport('websockets') is WebsocketsTransport
+    server = LoopbackServer()
+    assert get_transport(server.transport) == server.transport
+    with pytest.raises(ValueError):
+        get_transport('carrier-pigeon')
+
+
+@pytest.mark.parametrize('compression', [None, 'deflate'])
+def test_websockets_transport_against_mock_server(compression):
+    pytest.importorskip('websockets.sync.client')
+    from fcs_mock_server import MockFCSServer
+
+    mock_server = MockFCSServer(rate=200, ping_interval=60, compression=compression).start()
+    transport = (
+        'websockets'
+        if compression is None
+        else lambda url, **callbacks: WebsocketsTransport(url, compression='deflate', **callbacks)
+    )
+    client = FCSClient('test', mock_server.url, transport=transport)
+    prices = []
+    client.onmessage = lambda data: data.get('type') == 'price' and prices.append(data)
+    client.connect()
+    client.run_forever(blocking=False)
+    try:
+        assert wait_until(lambda: client.is_connected)
+        client.join('MOCK:EURUSD', '1')
+        assert wait_until(lambda: len(prices) >= 5)
+        assert prices[0]['symbol'] == 'MOCK:EURUSD'
+        assert isinstance(client.socket, WebsocketsTransport)
+        extensions = client.socket.connection.protocol.extensions
+        assert [ext.name for ext in extensions] == (['permessage-deflate'] if compression else [])
+    finally:
+        client.disconnect()
+        mock_server.stop()
+    assert wait_until(lambda: not client.is_connected)
+
+
+def test_websockets_transport_reports_connect_errors():
+    pytest.importorskip('websockets.sync.client')
+    events = []
+    transport = WebsocketsTransport(
+        'ws://127.0.0.1:9/',  # nothing listens on the discard port
+        on_error=lambda t, e: events.append('error'),
+        on_close=lambda t, code, reason: events.append(('close', code, reason)),
+        open_timeout=1,
+    )
+    transport.run()
+    assert events == ['error', ('close', None, None)]
+    with pytest.raises(ConnectionError):
+        transport.send('{}')
@@ -0,0 +1,156 @@
+import time
+
+import pytest
+
+from conftest import price, wait_until
+from fcs_decoder import PriceTick
+from fcs_scheduler import Worker
+from fcs_watchdog import Watchdog
+
+
+class FakeSubscriptions:
+    def __init__(self):
+        self.resubscribed = []
+
+    def resubscribe(self, symbol, timeframe):
+        self.resubscribed.append((symbol, timeframe))
+        return True
+
+
+class FakeClient:
+    show_logs = False
+
+    def __init__(self, keys):
+        self.is_connected = True
+        self.active_subscriptions = {
+            f'{s.upper()}_{tf}': {'symbol': s, 'timeframe': tf} for s, tf in keys
+        }
+        self.subscriptions = FakeSubscriptions()
+        self.io_worker = Worker(name='test-io')
+        self.reconnects = 0
+        self.errors = []
+
+    def reconnect(self):
+        self.reconnects += 1
+
+    def _handle_callback_error(self, error):
+        self.errors.append(error)
+
+
+@pytest.fixture
+def make_watchdog():
+    watchdogs = []
+
+    def make(keys, **options):
+        options.setdefault('check_interval', 3600)  # checks are driven by the test
+        options.setdefault('min_timeout', 0.05)
+        options.setdefault('default_timeout', 0.05)
+        watchdog = Watchdog(FakeClient(keys), **options)
+        watchdogs.append(watchdog)
+        return watchdog
+
+    yield make
+    for watchdog in watchdogs:
+        watchdog.stop()
+
+
+def test_silent_key_is_resubscribed(make_watchdog):
+    # Live keys are on another market, so their cadence does not raise FX's timeout
+    keys = [('FX:EURUSD', '1'), ('BINANCE:BTCUSDT', '1'), ('BINANCE:ETHUSDT', '1')]
+    watchdog = make_watchdog(keys)
+    events = []
+    watchdog.on_stale(lambda key, silent, action: events.append((key, action)))
+    watchdog.check()  # starts the clocks
+    time.sleep(0.08)
+    watchdog.on_frame(price('BINANCE:BTCUSDT', '1', c=1), 'a')
+    watchdog.on_frame(price('BINANCE:ETHUSDT', '1', c=1), 'b')
+    watchdog.check()
+    assert watchdog.client.subscriptions.resubscribed == [('FX:EURUSD', '1')]
+    assert events == [('FX:EURUSD_1', 'resubscribe')]
+    assert watchdog.resubscribes == 1
+    assert watchdog.client.reconnects == 0
+
+
+def test_backoff_after_repeated_resubscribes(make_watchdog):
+    watchdog = make_watchdog([('FX:EURUSD', '1')], max_timeout=10)
+    watchdog.check()
+    time.sleep(0.07)
+    watchdog.check()
+    assert watchdog.resubscribes == 1
+    time.sleep(0.07)  # past the base timeout, but not twice it
+    watchdog.check()
+    assert watchdog.resubscribes == 1
+    time.sleep(0.05)
+    watchdog.check()
+    assert watchdog.resubscribes == 2
+
+
+def test_escalates_to_reconnect_when_most_keys_are_stale(make_watchdog):
+    keys = [('BINANCE:BTCUSDT', '1')] + [(f'FX:S{i}', '1') for i in range(3)]
+    watchdog = make_watchdog(keys, escalate_ratio=0.5, escalate_min=2)
+    events = []
+    watchdog.on_stale(lambda key, silent, action: events.append(action))
+    watchdog.check()
+    time.sleep(0.08)
+    watchdog.on_frame(price('BINANCE:BTCUSDT', '1', c=1), 'x')
+    watchdog.check()
+    assert watchdog.client.reconnects == 1
+    assert watchdog.reconnects == 1
+    assert watchdog.client.subscriptions.resubscribed == []
+    assert events == ['reconnect'] * 3
+
+
+def test_clocks_restart_after_reconnect(make_watchdog):
+    watchdog = make_watchdog([('FX:EURUSD', '1')])
+    watchdog.check()
+    watchdog.client.is_connected = False
+    time.sleep(0.08)
+    watchdog.check()
+    watchdog.client.is_connected = True
+    watchdog.check()
+    assert watchdog.resubscribes == 0
+
+
+def test_duplicate_frames_are_flagged(make_watchdog):
+    watchdog = make_watchdog([('FX:EURUSD', '1')])
+    frame = price('FX:EURUSD', '1', c=1)
+    assert watchdog.on_frame(frame, '{"c":1}') is False
+    assert watchdog.on_frame(frame, '{"c":1}') is True
+    assert watchdog.on_frame(frame, '{"c":2}') is False
+    tick = PriceTick('FX:EURUSD', '1', c=2)
+    assert watchdog.on_frame(tick, '{"c":2}') is True
+    assert watchdog.duplicates == 2
+    assert watchdog.on_frame({'type': 'pong'}, 'p') is False
+
+
+def test_stats_do_not_change_state(make_watchdog):
+    watchdog = make_watchdog([('FX:EURUSD', '1')])
+    for _ in range(3):
+        assert watchdog.stats()['stale'] == 0
+    assert watchdog._last == {}
+    watchdog.check()
+    time.sleep(0.08)
+    before = dict(watchdog._last)
+    assert watchdog.stats()['stale'] == 1
+    assert watchdog.stale().keys() == {'FX:EURUSD_1'}
+    assert watchdog._last == before
+    assert watchdog.resubscribes == 0
+
+
+def test_client_drops_duplicates_and_resubscribes(server, client):
+    got = []
+    client.onmessage = lambda data: data.get('type') == 'price' and got.append(data)
+    watchdog = client.enable_watchdog(check_interval=0.05, min_timeout=0.2)
+    client.join('FX:EURUSD', '1')
+    assert client.subscriptions.wait(timeout=2)
+    frame = '{"type":"price","symbol":"FX:EURUSD","timeframe":"1","prices":{"c":1}}'
+    server.push(frame, 'FX:EURUSD', '1')
+    server.push(frame, 'FX:EURUSD', '1')
+    assert wait_until(lambda: watchdog.duplicates == 1)
+    assert len(got) == 1
+
+    def joins():
+        return sum(1 for f in server.received if f.get('type') == 'join_symbol')
+
+    assert wait_until(lambda: joins() >= 2, timeout=5)
+    assert watchdog.resubscribes >= 1
@@ -0,0 +1,91 @@
+import asyncio
+import json
+
+import pytest
+
+from conftest import wait_until
+from fcs_wire import (
+    REMOVE_ALL,
+    WireCounter,
+    encode,
+    encode_join,
+    encode_leave,
+    encode_ping,
+    encode_pong,
+)
+
+
+def test_pre_encoded_frames_match_json():
+    assert json.loads(encode_ping(1700000000123)) == {'type': 'ping', 'timestamp': 1700000000123}
+    assert json.loads(encode_pong(5)) == {'type': 'pong', 'timestamp': 5}
+    assert json.loads(REMOVE_ALL) == {'type': 'remove_all'}
+    join = {'type': 'join_symbol', 'symbol': 'BINANCE:BTCUSDT', 'timeframe': '1D'}
+    assert json.loads(encode_join('BINANCE:BTCUSDT', '1D')) == join
+    leave = {'type': 'leave_symbol', 'symbol': 'FX:EURUSD', 'timeframe': '1'}
+    assert json.loads(encode_leave('FX:EURUSD', '1')) == leave
+    assert json.loads(encode_join('X:"quoted"', '1'))['symbol'] == 'X:"quoted"'
+
+
+def test_join_and_leave_are_cached():
+    assert encode_join('FX:EURUSD', '1') is encode_join('FX:EURUSD', '1')
+    assert encode_leave('FX:EURUSD', '1') is encode_leave('FX:EURUSD', '1')
+
+
+def test_encode_passes_strings_through():
+    frame = encode_ping(1)
+    assert encode(frame) is frame
+    assert encode({'type': 'ping', 'timestamp': 1}) == frame
+
+
+def test_wire_counter():
+    wire = WireCounter()
+    assert wire.ratio is None
+    wire.wire_received, wire.payload_received = 30, 120
+    assert wire.stats()['ratio'] == 0.25
+    wire.reset()
+    assert wire.stats() == dict.fromkeys(
+        ('wire_received', 'payload_received', 'frames_received', 'payload_sent', 'frames_sent'),
+        0,
+    ) | {'ratio': None}
+
+
+def test_client_sends_pre_encoded_frames(server, client):
+    client.join('FX:EURUSD', '1')
+    assert client.subscriptions.wait(timeout=2)
+    client.leave('FX:EURUSD', '1')
+    assert wait_until(lambda: any(f['type'] == 'leave_symbol' for f in list(server.received)))
+    client.remove_all()
+    assert wait_until(lambda: list(server.received)[-1] == {'type': 'remove_all'})
+    kinds = [frame['type'] for frame in server.received]
+    assert kinds.index('join_symbol') < kinds.index('leave_symbol') < kinds.index('remove_all')
+    assert 'ping' in kinds
+
+
+@pytest.mark.parametrize('compression', [None, 'deflate'])
+def test_async_client_counts_wire_and_payload_bytes(compression):
+    pytest.importorskip('websockets')
+    from fcs_async_client import AsyncFCSClient
+    from fcs_mock_server import MockFCSServer
+
+    server = MockFCSServer(rate=500, compression=compression).start()
+
+    async def main():
+        client = AsyncFCSClient('test', url=server.url, compression=compression)
+        await client.connect(timeout=5)
+        await client.join('MOCK:A', '1')
+        while client.wire.frames_received < 50:
+            await asyncio.sleep(0.01)
+        await client.disconnect()
+        return client.wire_stats()
+
+    try:
+        stats = asyncio.run(asyncio.wait_for(main(), 10))
+    finally:
+        server.stop()
+    assert stats['frames_sent'] >= 2 and stats['payload_sent'] > 0
+    if compression:
+        assert stats['compression'] == 'permessage-deflate'
+        assert stats['ratio'] < 0.8
+    else:
+        assert stats['compression'] is None
+        assert stats['ratio'] > 1  # WebSocket framing overhead only